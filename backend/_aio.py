@@ -0,0 +1,30 @@
+"""
+Async Helpers
+Runs coroutines from sync code, whether or not an event loop is active
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine
+
+
+def run_sync(coro: Coroutine) -> Any:
+    """
+    Run a coroutine to completion from synchronous code
+    
+    Uses asyncio.run when the calling thread has no running loop. Sync code
+    invoked directly from an async endpoint already sits on a running loop,
+    so there the coroutine is driven on a fresh loop in a worker thread.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
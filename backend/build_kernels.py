@@ -0,0 +1,104 @@
+"""
+Kernel Cache Builder
+Compiles every Numba kernel ahead of time into the on-disk cache so processes start without JIT warmup
+"""
+import os
+import sys
+import time
+import numpy as np
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from _njit import NUMBA_AVAILABLE
+from data._indicators_njit import (
+    ema_njit, sma_njit, rsi_njit, ema_macd_njit, macd_njit,
+    bbands_njit, true_range_njit, atr_njit, sma_last_njit, rsi_last_njit, ema_pair_last_two_njit,
+    macd_last_two_njit, bbands_last_njit, atr_last_njit
+)
+from data._sentiment_njit import news_stats_njit, weighted_stats_njit
+from ml._forest_njit import forest_proba_njit, booster_margin_njit
+from strategies._levels_njit import support_resistance_levels_njit
+
+
+def build_kernels():
+    """
+    Call each kernel once with the argument types used in production
+    
+    The kernels are declared with cache=True, so the first call of each
+    signature writes machine code next to the module (__pycache__) and later
+    processes load it instead of compiling. The cache is keyed on the CPU,
+    so run this where the service runs (e.g. as a Docker build step).
+    
+    Returns:
+        Number of kernel signatures compiled or loaded
+    """
+    prices = np.linspace(100.0, 110.0, 64)
+    high = prices + 1.0
+    low = prices - 1.0
+    period = 14
+    
+    calls = [
+        # Indicator kernels: float64 columns with int periods
+        lambda: ema_njit(prices, period),
+        lambda: sma_njit(prices, period),
+        lambda: rsi_njit(prices, period),
+        lambda: ema_macd_njit(prices, 9, 21, 12, 26, 9),
+        lambda: macd_njit(prices, 12, 26, 9),
+        lambda: bbands_njit(prices, 20, 2.0),
+        lambda: true_range_njit(high, low, prices),
+        lambda: atr_njit(high, low, prices, period),
+        # Strategy kernels: trailing values only
+        lambda: sma_last_njit(prices, period),
+        lambda: rsi_last_njit(prices, period),
+        lambda: ema_pair_last_two_njit(prices, 9, 21),
+        lambda: macd_last_two_njit(prices, 12, 26, 9),
+        lambda: bbands_last_njit(prices, 20, 2.0),
+        lambda: atr_last_njit(high, low, prices, period),
+        lambda: support_resistance_levels_njit(high, low, 0.02),
+        # Sentiment kernels: float32 news columns, float64 source scores
+        lambda: news_stats_njit(
+            np.zeros(8, dtype=np.float32), np.full(8, 20.0, dtype=np.float32)
+        ),
+        lambda: weighted_stats_njit(
+            np.array([0.1, -0.2]), np.array([12.0, 35.0])
+        ),
+        # Forest kernel: float32 feature rows, int64 node arrays (one stump)
+        lambda: forest_proba_njit(
+            np.zeros((1, 2), dtype=np.float32),
+            np.array([0], dtype=np.int64),
+            np.array([1, -1, -1], dtype=np.int64),
+            np.array([2, -1, -1], dtype=np.int64),
+            np.array([0, -2, -2], dtype=np.int64),
+            np.array([0.5, -2.0, -2.0]),
+            np.array([[0.5, 0.5], [1.0, 0.0], [0.0, 1.0]])
+        ),
+        # Booster kernel: float32 rows and thresholds, bool default branches
+        lambda: booster_margin_njit(
+            np.zeros((1, 2), dtype=np.float32),
+            np.array([0], dtype=np.int64),
+            np.array([1, -1, -1], dtype=np.int64),
+            np.array([2, -1, -1], dtype=np.int64),
+            np.array([True, False, False]),
+            np.array([0, 0, 0], dtype=np.int64),
+            np.array([0.5, -0.1, 0.1], dtype=np.float32),
+            np.float32(0.0)
+        )
+    ]
+    
+    for call in calls:
+        call()
+    
+    return len(calls)
+
+
+# Usage example
+if __name__ == "__main__":
+    start = time.perf_counter()
+    count = build_kernels()
+    elapsed = time.perf_counter() - start
+    
+    if NUMBA_AVAILABLE:
+        print(f"Built {count} kernel signatures in {elapsed:.1f}s")
+    else:
+        print("numba not installed; kernels run as plain Python")
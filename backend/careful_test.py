@@ -1,7 +1,7 @@
 import asyncio
 import websockets
-import json
-import requests
+import orjson
+import httpx
 import time
 import pandas as pd
 import numpy as np
@@ -13,6 +13,7 @@ WS_URL = "ws://127.0.0.1:8000/ws/market"
 class MoltBotTester:
     def __init__(self):
         self.results = []
+        self.client = None
 
     def log_test(self, name, status, details=""):
         self.results.append({"name": name, "status": status, "details": details})
@@ -23,8 +24,10 @@ class MoltBotTester:
         print("\n--- Testing REST API Market Data ---")
         try:
             # Test 1h with indicators
-            url = f"{API_BASE}/api/market-data/BTC/1h?limit=100&include_indicators=true"
-            r = requests.get(url, timeout=10)
+            r = await self.client.get(
+                "/api/market-data/BTC/1h",
+                params={"limit": 100, "include_indicators": "true"}
+            )
             if r.status_code == 200:
                 data = r.json()
                 candles = data.get('data', [])
@@ -36,8 +39,7 @@ class MoltBotTester:
                 self.log_test("REST Market Data (1h)", "FAIL", f"Status {r.status_code}")
 
             # Test 1s timeframe
-            url = f"{API_BASE}/api/market-data/BTC/1s?limit=10"
-            r = requests.get(url, timeout=10)
+            r = await self.client.get("/api/market-data/BTC/1s", params={"limit": 10})
             if r.status_code == 200:
                 self.log_test("REST Market Data (1s)", "PASS", "Successfully fetched granular 1s data")
             else:
@@ -51,11 +53,11 @@ class MoltBotTester:
             async with websockets.connect(WS_URL) as websocket:
                 # 1. Test Subscription
                 sub_msg = {"coin": "ETH", "timeframe": "1m"}
-                await websocket.send(json.dumps(sub_msg))
+                await websocket.send(orjson.dumps(sub_msg).decode())
                 
                 # 2. Wait for full_update
                 response = await asyncio.wait_for(websocket.recv(), timeout=15)
-                data = json.loads(response)
+                data = orjson.loads(response)
                 
                 if data.get('type') == 'full_update' and data.get('coin') == 'ETH':
                     details = f"Received live update for {data['coin']} {data['timeframe']}"
@@ -74,8 +76,11 @@ class MoltBotTester:
     async def test_indicator_validity(self):
         print("\n--- Testing Indicator Validity ---")
         try:
-            url = f"{API_BASE}/api/market-data/BTC/1h?limit=100&include_indicators=true"
-            data = requests.get(url).json()['data']
+            r = await self.client.get(
+                "/api/market-data/BTC/1h",
+                params={"limit": 100, "include_indicators": "true"}
+            )
+            data = r.json()['data']
             df = pd.DataFrame(data)
             
             # Check for NaNs in processed data (should be None/null in JSON)
@@ -93,9 +98,14 @@ class MoltBotTester:
 
     async def run_all(self):
         print("Starting MoltBot Careful Verification Suite...")
-        await self.test_rest_api_market_data()
-        await self.test_indicator_validity()
-        await self.test_websocket_stream()
+        # The probes are independent, so run them concurrently over one client
+        async with httpx.AsyncClient(base_url=API_BASE, timeout=10) as client:
+            self.client = client
+            await asyncio.gather(
+                self.test_rest_api_market_data(),
+                self.test_indicator_validity(),
+                self.test_websocket_stream()
+            )
         
         print("\n" + "="*40)
         passed = sum(1 for r in self.results if r['status'] == 'PASS')
@@ -113,5 +123,12 @@ class MoltBotTester:
         print("="*40)
 
 if __name__ == "__main__":
+    # uvloop ships with uvicorn[standard]; fall back to the stock loop without it
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     tester = MoltBotTester()
     asyncio.run(tester.run_all())
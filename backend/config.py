@@ -14,6 +14,13 @@ class Settings(BaseSettings):
     APP_NAME: str = "MoltBot Trading Platform"
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = True
+    # Server processes; each loads its own models, caches and WebSocket
+    # ticker, so raise only where memory and upstream rate limits allow
+    WORKERS: int = 1
+    
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_FILE: str = ""  # Empty logs JSON lines to stdout
     
     # Supported Coins (20 major cryptocurrencies)
     SUPPORTED_COINS: List[str] = [
@@ -76,6 +83,8 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./data_storage/moltbot.db"
+    DATABASE_POOL_SIZE: int = 20  # async engine used by the API endpoints
+    DATABASE_MAX_OVERFLOW: int = 10
     
     # Historical Data Settings
     HISTORICAL_DAYS: int = 180  # 6 months for ML training
@@ -107,6 +116,7 @@ class Settings(BaseSettings):
     
     # Rate Limiting
     API_RATE_LIMIT_SECONDS: int = 1  # Wait 1 second between API calls
+    API_MAX_CONCURRENCY: int = 5  # Max in-flight exchange requests for batch fetches
     
     class Config:
         env_file = ".env"
@@ -116,6 +126,10 @@ class Settings(BaseSettings):
 # Global settings instance
 settings = Settings()
 
+# Membership sets for request validation; the lists above keep display order
+SUPPORTED_COIN_SET = frozenset(settings.SUPPORTED_COINS)
+TIMEFRAME_SET = frozenset(settings.TIMEFRAMES)
+
 
 # Coin display names
 COIN_DISPLAY_NAMES: Dict[str, str] = {
@@ -0,0 +1,428 @@
+"""
+Technical Indicator Kernels
+Numba-compiled single-pass indicator loops over raw float64 arrays
+
+The kernels reproduce the conventions of the indicator helpers they replace:
+EMAs are seeded with the first observation (adjust=False) and stay NaN until
+`period` observations have been seen, RSI uses Wilder smoothing, Bollinger
+Bands use the population standard deviation and ATR is zero-padded over its
+warm-up window. The *_last kernels return only the trailing values the
+strategies read, from the same recurrences, without allocating full columns.
+All kernels release the GIL, so concurrent predictions overlap their math.
+"""
+import numpy as np
+from _njit import njit
+
+
+@njit(cache=True, nogil=True)
+def _ewm_mean(values, alpha, min_periods):
+    """Exponentially weighted mean (adjust=False), skipping leading NaNs"""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    mean = 0.0
+    count = 0
+
+    for i in range(n):
+        x = values[i]
+        if np.isnan(x):
+            if count >= min_periods:
+                out[i] = mean
+            continue
+
+        if count == 0:
+            mean = x
+        else:
+            mean = (1.0 - alpha) * mean + alpha * x
+        count += 1
+
+        if count >= min_periods:
+            out[i] = mean
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def ema_njit(values, period):
+    """Exponential moving average with span=period"""
+    return _ewm_mean(values, 2.0 / (period + 1.0), period)
+
+
+@njit(cache=True, nogil=True)
+def sma_njit(values, period):
+    """Simple moving average over a rolling window of `period` values"""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    window_sum = 0.0
+
+    for i in range(n):
+        window_sum += values[i]
+        if i >= period:
+            window_sum -= values[i - period]
+        if i >= period - 1:
+            out[i] = window_sum / period
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rsi_njit(close, period):
+    """Relative Strength Index with Wilder smoothing (alpha = 1/period)"""
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    alpha = 1.0 / period
+    avg_gain = 0.0
+    avg_loss = 0.0
+
+    for i in range(n):
+        # The first bar has no prior close and contributes a zero move
+        diff = close[i] - close[i - 1] if i > 0 else 0.0
+        gain = diff if diff > 0.0 else 0.0
+        loss = -diff if diff < 0.0 else 0.0
+        avg_gain = (1.0 - alpha) * avg_gain + alpha * gain
+        avg_loss = (1.0 - alpha) * avg_loss + alpha * loss
+
+        if i >= period - 1:
+            if avg_loss == 0.0:
+                out[i] = 100.0
+            else:
+                out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def ema_macd_njit(close, ema_fast_period, ema_slow_period, macd_fast, macd_slow, signal):
+    """
+    EMA pair, MACD line, signal line and histogram from a single scan
+
+    Every recurrence follows `_ewm_mean`; the trend EMA pair and the two MACD
+    legs are advanced together so `close` is read once instead of four times.
+    Returns (ema_fast, ema_slow, macd, macd_signal, macd_hist).
+    """
+    n = close.shape[0]
+    ema_fast = np.full(n, np.nan)
+    ema_slow = np.full(n, np.nan)
+    macd = np.full(n, np.nan)
+    macd_signal = np.full(n, np.nan)
+    macd_hist = np.full(n, np.nan)
+
+    a_ef = 2.0 / (ema_fast_period + 1.0)
+    a_es = 2.0 / (ema_slow_period + 1.0)
+    a_mf = 2.0 / (macd_fast + 1.0)
+    a_ms = 2.0 / (macd_slow + 1.0)
+    a_sig = 2.0 / (signal + 1.0)
+    ef = 0.0
+    es = 0.0
+    mf = 0.0
+    ms = 0.0
+    sig = 0.0
+    count = 0
+    count_signal = 0
+
+    for i in range(n):
+        x = close[i]
+        if not np.isnan(x):
+            if count == 0:
+                ef = x
+                es = x
+                mf = x
+                ms = x
+            else:
+                ef = (1.0 - a_ef) * ef + a_ef * x
+                es = (1.0 - a_es) * es + a_es * x
+                mf = (1.0 - a_mf) * mf + a_mf * x
+                ms = (1.0 - a_ms) * ms + a_ms * x
+            count += 1
+
+        if count >= ema_fast_period:
+            ema_fast[i] = ef
+        if count >= ema_slow_period:
+            ema_slow[i] = es
+
+        # MACD is defined once both legs are past their warm-up
+        if count >= macd_fast and count >= macd_slow:
+            m = mf - ms
+            macd[i] = m
+            if count_signal == 0:
+                sig = m
+            else:
+                sig = (1.0 - a_sig) * sig + a_sig * m
+            count_signal += 1
+
+            if count_signal >= signal:
+                macd_signal[i] = sig
+                macd_hist[i] = m - sig
+
+    return ema_fast, ema_slow, macd, macd_signal, macd_hist
+
+
+@njit(cache=True, nogil=True)
+def macd_njit(close, fast, slow, signal):
+    """MACD line, signal line and histogram"""
+    _, _, macd, macd_signal, macd_hist = ema_macd_njit(
+        close, fast, slow, fast, slow, signal
+    )
+    return macd, macd_signal, macd_hist
+
+
+@njit(cache=True, nogil=True)
+def bbands_njit(close, period, num_std):
+    """Bollinger Bands (lower, middle, upper) using population std"""
+    n = close.shape[0]
+    lower = np.full(n, np.nan)
+    middle = np.full(n, np.nan)
+    upper = np.full(n, np.nan)
+
+    for i in range(period - 1, n):
+        start = i - period + 1
+        mean = 0.0
+        for j in range(start, i + 1):
+            mean += close[j]
+        mean /= period
+
+        var = 0.0
+        for j in range(start, i + 1):
+            dev = close[j] - mean
+            var += dev * dev
+        std = np.sqrt(var / period)
+
+        middle[i] = mean
+        upper[i] = mean + num_std * std
+        lower[i] = mean - num_std * std
+
+    return lower, middle, upper
+
+
+@njit(cache=True, nogil=True)
+def sma_last_njit(values, period):
+    """Last value of sma_njit"""
+    n = values.shape[0]
+    if n < 1:
+        raise IndexError("sma_last_njit needs at least one value")
+
+    window_sum = 0.0
+    for i in range(n):
+        window_sum += values[i]
+        if i >= period:
+            window_sum -= values[i - period]
+
+    if n < period:
+        return np.nan
+    return window_sum / period
+
+
+@njit(cache=True, nogil=True)
+def rsi_last_njit(close, period):
+    """Last value of rsi_njit"""
+    n = close.shape[0]
+    if n < 1:
+        raise IndexError("rsi_last_njit needs at least one value")
+
+    alpha = 1.0 / period
+    avg_gain = 0.0
+    avg_loss = 0.0
+
+    for i in range(n):
+        diff = close[i] - close[i - 1] if i > 0 else 0.0
+        gain = diff if diff > 0.0 else 0.0
+        loss = -diff if diff < 0.0 else 0.0
+        avg_gain = (1.0 - alpha) * avg_gain + alpha * gain
+        avg_loss = (1.0 - alpha) * avg_loss + alpha * loss
+
+    if n < period:
+        return np.nan
+    if avg_loss == 0.0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True, nogil=True)
+def ema_pair_last_two_njit(values, fast, slow):
+    """
+    Trailing values of two ema_njit columns from a single scan
+
+    Returns (prev_fast, fast, prev_slow, slow) for the last two bars.
+    """
+    n = values.shape[0]
+    if n < 2:
+        raise IndexError("ema_pair_last_two_njit needs at least two values")
+
+    a_fast = 2.0 / (fast + 1.0)
+    a_slow = 2.0 / (slow + 1.0)
+    ef = 0.0
+    es = 0.0
+    count = 0
+    prev_fast = np.nan
+    prev_slow = np.nan
+    last_fast = np.nan
+    last_slow = np.nan
+
+    for i in range(n):
+        x = values[i]
+        if not np.isnan(x):
+            if count == 0:
+                ef = x
+                es = x
+            else:
+                ef = (1.0 - a_fast) * ef + a_fast * x
+                es = (1.0 - a_slow) * es + a_slow * x
+            count += 1
+
+        prev_fast = last_fast
+        prev_slow = last_slow
+        last_fast = ef if count >= fast else np.nan
+        last_slow = es if count >= slow else np.nan
+
+    return prev_fast, last_fast, prev_slow, last_slow
+
+
+@njit(cache=True, nogil=True)
+def macd_last_two_njit(close, fast, slow, signal):
+    """
+    Trailing values of macd_njit
+
+    Returns (prev_macd, prev_signal, macd, macd_signal, macd_hist) for the
+    last two bars, following ema_macd_njit step for step.
+    """
+    n = close.shape[0]
+    if n < 2:
+        raise IndexError("macd_last_two_njit needs at least two values")
+
+    a_mf = 2.0 / (fast + 1.0)
+    a_ms = 2.0 / (slow + 1.0)
+    a_sig = 2.0 / (signal + 1.0)
+    mf = 0.0
+    ms = 0.0
+    sig = 0.0
+    count = 0
+    count_signal = 0
+    prev_macd = np.nan
+    prev_signal = np.nan
+    macd = np.nan
+    macd_signal = np.nan
+    macd_hist = np.nan
+
+    for i in range(n):
+        prev_macd = macd
+        prev_signal = macd_signal
+        macd = np.nan
+        macd_signal = np.nan
+        macd_hist = np.nan
+
+        x = close[i]
+        if not np.isnan(x):
+            if count == 0:
+                mf = x
+                ms = x
+            else:
+                mf = (1.0 - a_mf) * mf + a_mf * x
+                ms = (1.0 - a_ms) * ms + a_ms * x
+            count += 1
+
+        if count >= fast and count >= slow:
+            m = mf - ms
+            macd = m
+            if count_signal == 0:
+                sig = m
+            else:
+                sig = (1.0 - a_sig) * sig + a_sig * m
+            count_signal += 1
+
+            if count_signal >= signal:
+                macd_signal = sig
+                macd_hist = m - sig
+
+    return prev_macd, prev_signal, macd, macd_signal, macd_hist
+
+
+@njit(cache=True, nogil=True)
+def bbands_last_njit(close, period, num_std):
+    """Last (lower, middle, upper) of bbands_njit, from the final window only"""
+    n = close.shape[0]
+    if n < 1:
+        raise IndexError("bbands_last_njit needs at least one value")
+    if n < period:
+        return np.nan, np.nan, np.nan
+
+    start = n - period
+    mean = 0.0
+    for j in range(start, n):
+        mean += close[j]
+    mean /= period
+
+    var = 0.0
+    for j in range(start, n):
+        dev = close[j] - mean
+        var += dev * dev
+    std = np.sqrt(var / period)
+
+    return mean - num_std * std, mean, mean + num_std * std
+
+
+@njit(cache=True, nogil=True)
+def true_range_njit(high, low, close):
+    """True range; the first bar falls back to high - low"""
+    n = close.shape[0]
+    tr = np.empty(n)
+
+    for i in range(n):
+        hl = high[i] - low[i]
+        if i == 0:
+            tr[i] = hl
+        else:
+            hc = abs(high[i] - close[i - 1])
+            lc = abs(low[i] - close[i - 1])
+            tr[i] = max(hl, hc, lc)
+
+    return tr
+
+
+@njit(cache=True, nogil=True)
+def atr_njit(high, low, close, period):
+    """Average True Range with Wilder smoothing, zero over the warm-up window"""
+    n = close.shape[0]
+    out = np.zeros(n)
+    if n < period:
+        return out
+
+    tr = true_range_njit(high, low, close)
+    atr = 0.0
+    for i in range(period):
+        atr += tr[i]
+    atr /= period
+    out[period - 1] = atr
+
+    for i in range(period, n):
+        atr = (atr * (period - 1) + tr[i]) / period
+        out[i] = atr
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def atr_last_njit(high, low, close, period):
+    """Last value of atr_njit, without materializing the true range column"""
+    n = close.shape[0]
+    if n < 1:
+        raise IndexError("atr_last_njit needs at least one value")
+    if n < period:
+        return 0.0
+
+    atr = 0.0
+    for i in range(n):
+        hl = high[i] - low[i]
+        if i == 0:
+            tr = hl
+        else:
+            hc = abs(high[i] - close[i - 1])
+            lc = abs(low[i] - close[i - 1])
+            tr = max(hl, hc, lc)
+
+        if i < period:
+            atr += tr
+            if i == period - 1:
+                atr /= period
+        else:
+            atr = (atr * (period - 1) + tr) / period
+
+    return atr
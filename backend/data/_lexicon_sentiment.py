@@ -0,0 +1,161 @@
+"""
+Vectorized Lexicon Sentiment
+Scores many headlines at once against TextBlob's adjective lexicon with NumPy
+"""
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from xml.etree import ElementTree
+import numpy as np
+
+# Negations flip and halve the next known word ("not good" = slightly bad)
+NEGATIONS = {"no", "not", "n't", "never"}
+NEGATION_FACTOR = -0.5
+
+# An exclamation mark boosts the preceding assessment
+EXCLAMATION_BOOST = 1.25
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?|!")
+
+
+@lru_cache(maxsize=1)
+def load_lexicon() -> Tuple[Dict[str, int], np.ndarray]:
+    """
+    Parse TextBlob's en-sentiment.xml once into an array-backed lookup
+    
+    Mirrors TextBlob's loader: senses are averaged per part-of-speech tag and
+    then across tags, "-ly" adverbs are derived from adjectives, and adverbs
+    (RB) are flagged as modifiers of the following word.
+    
+    Returns:
+        Tuple of (token -> row id, (N, 4) array of polarity, subjectivity,
+        intensity and an is-modifier flag)
+    """
+    import textblob
+    path = os.path.join(os.path.dirname(textblob.__file__), "en", "en-sentiment.xml")
+    
+    senses: Dict[str, Dict[str, List[Tuple[float, float, float]]]] = {}
+    for word in ElementTree.parse(path).getroot().findall("word"):
+        form = word.attrib.get("form")
+        if not form:
+            continue
+        senses.setdefault(form, {}).setdefault(word.attrib.get("pos"), []).append((
+            float(word.attrib.get("polarity", 0.0)),
+            float(word.attrib.get("subjectivity", 0.0)),
+            float(word.attrib.get("intensity", 1.0))
+        ))
+    
+    entries = {
+        form: {pos: np.mean(scores, axis=0) for pos, scores in by_pos.items()}
+        for form, by_pos in senses.items()
+    }
+    
+    # Derive adverbs from adjectives ("terrible" -> "terribly", "happy" -> "happily");
+    # like TextBlob, the derived scores replace any listed ones
+    for form, by_pos in list(entries.items()):
+        if "JJ" not in by_pos:
+            continue
+        stem = form[:-1] + "i" if form.endswith("y") else form
+        stem = stem[:-2] if stem.endswith("le") else stem
+        entries[stem + "ly"] = {"RB": by_pos["JJ"]}
+    
+    token_id = {}
+    table = np.empty((len(entries), 4), dtype=np.float64)
+    for i, (form, by_pos) in enumerate(entries.items()):
+        table[i, :3] = np.mean(list(by_pos.values()), axis=0)
+        table[i, 3] = 1.0 if "RB" in by_pos else 0.0
+        token_id[form] = i
+    
+    return token_id, table
+
+
+def score_texts(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean polarity and subjectivity of known lexicon words per text
+    
+    All texts are tokenized into one flat token stream; lexicon lookups,
+    modifier/negation/exclamation handling and the per-text reductions are
+    whole-array NumPy operations. This approximates TextBlob's
+    PatternAnalyzer on headlines without building a TextBlob per title.
+    
+    Args:
+        texts: Texts to score
+        
+    Returns:
+        Tuple of (polarity, subjectivity) arrays, 0.0 for texts with no known words
+    """
+    token_id, table = load_lexicon()
+    num_texts = len(texts)
+    
+    tokens: List[str] = []
+    owners: List[int] = []
+    for i, text in enumerate(texts):
+        words = _TOKEN_RE.findall((text or "").lower())
+        tokens.extend(words)
+        owners.extend([i] * len(words))
+    
+    if not tokens:
+        return np.zeros(num_texts), np.zeros(num_texts)
+    
+    num_tokens = len(tokens)
+    ids = np.fromiter((token_id.get(t, -1) for t in tokens), dtype=np.int64, count=num_tokens)
+    is_negation = np.fromiter(
+        (t in NEGATIONS or t.endswith("n't") for t in tokens),
+        dtype=bool,
+        count=num_tokens
+    )
+    is_short = np.fromiter((len(t) <= 1 for t in tokens), dtype=bool, count=num_tokens)
+    is_bang = np.fromiter((t == "!" for t in tokens), dtype=bool, count=num_tokens)
+    owner = np.asarray(owners, dtype=np.int64)
+    
+    known = ids >= 0
+    rows = table[np.maximum(ids, 0)]
+    polarity = rows[:, 0].copy()
+    subjectivity = rows[:, 1].copy()
+    is_modifier = known & (rows[:, 3] > 0)
+    
+    # Pairwise neighbour masks, restricted to tokens of the same text
+    same_prev = np.zeros(num_tokens, dtype=bool)
+    same_prev[1:] = owner[1:] == owner[:-1]
+    
+    def shift(mask: np.ndarray) -> np.ndarray:
+        """mask[i - 1] for token i (False at text starts)"""
+        out = np.zeros(num_tokens, dtype=bool)
+        out[1:] = mask[:-1]
+        return out & same_prev
+    
+    # Negation reaches the next word, or skips one single-letter word ("not a good")
+    negated = shift(is_negation) | (shift(shift(is_negation)) & shift(is_short & ~known))
+    
+    # "very good": the modifier's intensity scales the next known word and the
+    # pair counts as one assessment; a negated modifier ("not very good")
+    # inverts its intensity and passes the negation on to the pair
+    modified = known & shift(is_modifier)
+    intensity = np.ones(num_tokens)
+    intensity[1:] = rows[:-1, 2]
+    modifier_negated = shift(negated)
+    intensity = np.where(modified & modifier_negated, 1.0 / intensity, intensity)
+    polarity = np.where(modified, np.clip(polarity * intensity, -1.0, 1.0), polarity)
+    subjectivity = np.where(modified, np.clip(subjectivity * intensity, -1.0, 1.0), subjectivity)
+    negated = negated | (modified & modifier_negated)
+    absorbed = np.zeros(num_tokens, dtype=bool)
+    absorbed[:-1] = modified[1:]
+    assessed = known & ~absorbed
+    
+    # "!" boosts the latest assessment before it in the same text
+    positions = np.arange(num_tokens)
+    last_assessed = np.maximum.accumulate(np.where(assessed, positions, -1))
+    targets = last_assessed[is_bang]
+    targets = targets[(targets >= 0) & (owner[np.maximum(targets, 0)] == owner[is_bang])]
+    boosts = np.bincount(targets, minlength=num_tokens)
+    polarity = np.clip(polarity * EXCLAMATION_BOOST ** boosts, -1.0, 1.0)
+    
+    polarity = np.where(negated, polarity * NEGATION_FACTOR, polarity)
+    
+    assessed_owner = owner[assessed]
+    counts = np.maximum(np.bincount(assessed_owner, minlength=num_texts), 1)
+    avg_polarity = np.bincount(assessed_owner, weights=polarity[assessed], minlength=num_texts) / counts
+    avg_subjectivity = np.bincount(assessed_owner, weights=subjectivity[assessed], minlength=num_texts) / counts
+    
+    return avg_polarity, avg_subjectivity
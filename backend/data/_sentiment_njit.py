@@ -0,0 +1,45 @@
+"""
+Sentiment Aggregation Kernels
+Numba-compiled reductions over news and source sentiment arrays
+"""
+from _njit import njit
+
+
+@njit(cache=True)
+def news_stats_njit(scores, confidences):
+    """
+    Reduce per-headline sentiment to (avg_nonzero_score, num_nonzero, avg_confidence)
+
+    Neutral (zero) scores are excluded from the score average but every
+    headline counts toward the confidence average.
+    """
+    n = scores.shape[0]
+    score_sum = 0.0
+    num_nonzero = 0
+    conf_sum = 0.0
+
+    for i in range(n):
+        if scores[i] != 0.0:
+            score_sum += scores[i]
+            num_nonzero += 1
+        conf_sum += confidences[i]
+
+    avg_score = score_sum / num_nonzero if num_nonzero > 0 else 0.0
+    avg_conf = conf_sum / n if n > 0 else 0.0
+    return avg_score, num_nonzero, avg_conf
+
+
+@njit(cache=True)
+def weighted_stats_njit(scores, confidences):
+    """Confidence-weighted score, mean confidence and total weight"""
+    n = scores.shape[0]
+    weighted_sum = 0.0
+    total_weight = 0.0
+
+    for i in range(n):
+        weighted_sum += scores[i] * confidences[i]
+        total_weight += confidences[i]
+
+    weighted_score = weighted_sum / total_weight if total_weight > 0.0 else 0.0
+    avg_conf = total_weight / n if n > 0 else 0.0
+    return weighted_score, avg_conf, total_weight
@@ -2,18 +2,81 @@
 Historical Data Loader
 Loads and preprocesses historical data for ML training
 """
+import threading
 import pandas as pd
 import numpy as np
+from cachetools import TTLCache
 from typing import Optional, Tuple
 from datetime import datetime, timedelta
-import pandas_ta as ta
+from sqlalchemy import select
 from config import settings
-from models import HistoricalData, SessionLocal
+from models import HistoricalData, SessionLocal, append_dataframe
 from data.market_data_collector import MarketDataCollector
+from data._indicators_njit import (
+    rsi_njit, ema_macd_njit, bbands_njit, atr_njit, sma_njit
+)
 import structlog
 
 logger = structlog.get_logger()
 
+# Columns persisted to the historical_data table
+HISTORICAL_DATA_COLUMNS = [
+    'coin', 'timeframe', 'timestamp',
+    'open', 'high', 'low', 'close', 'volume',
+    'rsi', 'ema_fast', 'ema_slow',
+    'macd', 'macd_signal',
+    'bollinger_upper', 'bollinger_lower',
+    'atr'
+]
+
+# Indicator parameters snapshotted as plain ints/floats; settings are not
+# mutated at runtime and the kernels specialise on these argument types
+_RSI_PERIOD = int(settings.RSI_PERIOD)
+_EMA_FAST = int(settings.EMA_FAST)
+_EMA_SLOW = int(settings.EMA_SLOW)
+_MACD_FAST = int(settings.MACD_FAST)
+_MACD_SLOW = int(settings.MACD_SLOW)
+_MACD_SIGNAL = int(settings.MACD_SIGNAL)
+_BOLLINGER_PERIOD = int(settings.BOLLINGER_PERIOD)
+_BOLLINGER_STD = float(settings.BOLLINGER_STD)
+_ATR_PERIOD = 14
+_VOLUME_SMA_PERIOD = 20
+
+# Indicators are deterministic from the candles, and the prediction engine and
+# /api/market-data run them on the same cached OHLCV window, so live-sized
+# frames share one result per window
+INDICATOR_CACHE_TTL_SECONDS = 60
+INDICATOR_CACHE_MAX_ROWS = 1000
+_indicator_cache = TTLCache(maxsize=256, ttl=INDICATOR_CACHE_TTL_SECONDS)
+_indicator_lock = threading.Lock()
+
+
+def candle_window_key(df: pd.DataFrame) -> Optional[tuple]:
+    """
+    Identify an OHLCV window by coin, timeframe, span and its last candle
+    
+    The last candle is the only one still changing, so its prices are part of
+    the key. Frames without coin/timeframe columns or larger than a live
+    window (training sets) are not cached.
+    """
+    if df.empty or len(df) > INDICATOR_CACHE_MAX_ROWS:
+        return None
+    if not {'coin', 'timeframe', 'timestamp'}.issubset(df.columns):
+        return None
+    
+    return (
+        df['coin'].iat[-1],
+        df['timeframe'].iat[-1],
+        len(df),
+        df['timestamp'].iat[0],
+        df['timestamp'].iat[-1],
+        float(df['open'].iat[-1]),
+        float(df['high'].iat[-1]),
+        float(df['low'].iat[-1]),
+        float(df['close'].iat[-1]),
+        float(df['volume'].iat[-1])
+    )
+
 
 class HistoricalDataLoader:
     """Loads and preprocesses historical data for ML training"""
@@ -68,34 +131,34 @@ class HistoricalDataLoader:
             db = SessionLocal()
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            results = db.query(HistoricalData).filter(
-                HistoricalData.coin == coin,
-                HistoricalData.timeframe == timeframe,
-                HistoricalData.timestamp >= cutoff_date
-            ).order_by(HistoricalData.timestamp).all()
+            table = HistoricalData.__table__
+            stmt = select(
+                table.c.timestamp,
+                table.c.open,
+                table.c.high,
+                table.c.low,
+                table.c.close,
+                table.c.volume,
+                table.c.rsi,
+                table.c.ema_fast,
+                table.c.ema_slow,
+                table.c.macd,
+                table.c.macd_signal,
+                table.c.bollinger_upper,
+                table.c.bollinger_lower,
+                table.c.atr
+            ).where(
+                table.c.coin == coin,
+                table.c.timeframe == timeframe,
+                table.c.timestamp >= cutoff_date
+            ).order_by(table.c.timestamp)
             
-            if not results:
-                return None
+            # Stream the result set straight into a DataFrame
+            df = pd.read_sql(stmt, db.connection())
             
-            # Convert to DataFrame
-            data = [{
-                'timestamp': r.timestamp,
-                'open': r.open,
-                'high': r.high,
-                'low': r.low,
-                'close': r.close,
-                'volume': r.volume,
-                'rsi': r.rsi,
-                'ema_fast': r.ema_fast,
-                'ema_slow': r.ema_slow,
-                'macd': r.macd,
-                'macd_signal': r.macd_signal,
-                'bollinger_upper': r.bollinger_upper,
-                'bollinger_lower': r.bollinger_lower,
-                'atr': r.atr
-            } for r in results]
+            if df.empty:
+                return None
             
-            df = pd.DataFrame(data)
             df['coin'] = coin
             df['timeframe'] = timeframe
             
@@ -111,37 +174,12 @@ class HistoricalDataLoader:
     def _save_to_db(self, df: pd.DataFrame):
         """Save historical data with indicators to database"""
         try:
-            db = SessionLocal()
-            
-            for _, row in df.iterrows():
-                data = HistoricalData(
-                    coin=row.get('coin'),
-                    timeframe=row.get('timeframe'),
-                    timestamp=row['timestamp'],
-                    open=row['open'],
-                    high=row['high'],
-                    low=row['low'],
-                    close=row['close'],
-                    volume=row['volume'],
-                    rsi=row.get('rsi'),
-                    ema_fast=row.get('ema_fast'),
-                    ema_slow=row.get('ema_slow'),
-                    macd=row.get('macd'),
-                    macd_signal=row.get('macd_signal'),
-                    bollinger_upper=row.get('bollinger_upper'),
-                    bollinger_lower=row.get('bollinger_lower'),
-                    atr=row.get('atr')
-                )
-                db.add(data)
-            
-            db.commit()
-            logger.info("Saved historical data to DB", rows=len(df))
+            # Multi-row INSERTs in one transaction instead of per-candle ORM adds
+            rows = append_dataframe(df, HistoricalData, HISTORICAL_DATA_COLUMNS)
+            logger.info("Saved historical data to DB", rows=rows)
         
         except Exception as e:
             logger.error("Error saving to database", error=str(e))
-            db.rollback()
-        finally:
-            db.close()
     
     def add_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -154,56 +192,107 @@ class HistoricalDataLoader:
             DataFrame with added indicators
         """
         try:
+            key = candle_window_key(df)
+        except Exception:
+            key = None
+        
+        if key is not None:
+            with _indicator_lock:
+                cached = _indicator_cache.get(key)
+            if cached is not None:
+                # Shallow copy: callers adding columns do not touch the cache
+                return cached.copy(deep=False)
+        
+        result, ok = self._compute_indicators(df)
+        
+        if ok and key is not None:
+            with _indicator_lock:
+                _indicator_cache[key] = result
+            return result.copy(deep=False)
+        return result
+    
+    def _compute_indicators(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, bool]:
+        """Run the indicator kernels; returns (frame, succeeded)"""
+        try:
+            # Extract raw arrays once for the compiled kernels
+            close = df['close'].to_numpy(dtype=np.float64)
+            high = df['high'].to_numpy(dtype=np.float64)
+            low = df['low'].to_numpy(dtype=np.float64)
+            volume = df['volume'].to_numpy(dtype=np.float64)
+            
+            # Collect every new column as a raw array and attach them with one
+            # concat (assign() inserts them one by one, each a block insert)
+            new_cols = {}
+            
             # RSI
-            df['rsi'] = ta.rsi(df['close'], length=settings.RSI_PERIOD)
+            new_cols['rsi'] = rsi_njit(close, _RSI_PERIOD)
             
-            # EMA
-            df['ema_fast'] = ta.ema(df['close'], length=settings.EMA_FAST)
-            df['ema_slow'] = ta.ema(df['close'], length=settings.EMA_SLOW)
+            # EMA and MACD, fused into a single scan over close
+            ema_fast, ema_slow, macd, macd_signal, macd_hist = ema_macd_njit(
+                close,
+                _EMA_FAST,
+                _EMA_SLOW,
+                _MACD_FAST,
+                _MACD_SLOW,
+                _MACD_SIGNAL
+            )
+            new_cols['ema_fast'] = ema_fast
+            new_cols['ema_slow'] = ema_slow
             
             # MACD
-            macd = ta.macd(
-                df['close'],
-                fast=settings.MACD_FAST,
-                slow=settings.MACD_SLOW,
-                signal=settings.MACD_SIGNAL
-            )
-            df['macd'] = macd[f'MACD_{settings.MACD_FAST}_{settings.MACD_SLOW}_{settings.MACD_SIGNAL}']
-            df['macd_signal'] = macd[f'MACDs_{settings.MACD_FAST}_{settings.MACD_SLOW}_{settings.MACD_SIGNAL}']
-            df['macd_hist'] = macd[f'MACDh_{settings.MACD_FAST}_{settings.MACD_SLOW}_{settings.MACD_SIGNAL}']
+            new_cols['macd'] = macd
+            new_cols['macd_signal'] = macd_signal
+            new_cols['macd_hist'] = macd_hist
             
             # Bollinger Bands
-            bbands = ta.bbands(
-                df['close'],
-                length=settings.BOLLINGER_PERIOD,
-                std=settings.BOLLINGER_STD
+            bb_lower, bb_middle, bb_upper = bbands_njit(
+                close,
+                _BOLLINGER_PERIOD,
+                _BOLLINGER_STD
             )
-            df['bollinger_upper'] = bbands[f'BBU_{settings.BOLLINGER_PERIOD}_{settings.BOLLINGER_STD}.0']
-            df['bollinger_middle'] = bbands[f'BBM_{settings.BOLLINGER_PERIOD}_{settings.BOLLINGER_STD}.0']
-            df['bollinger_lower'] = bbands[f'BBL_{settings.BOLLINGER_PERIOD}_{settings.BOLLINGER_STD}.0']
+            new_cols['bollinger_upper'] = bb_upper
+            new_cols['bollinger_middle'] = bb_middle
+            new_cols['bollinger_lower'] = bb_lower
             
             # ATR (Average True Range) for volatility
-            df['atr'] = ta.atr(df['high'], df['low'], df['close'], length=14)
+            new_cols['atr'] = atr_njit(high, low, close, _ATR_PERIOD)
             
             # Volume SMA
-            df['volume_sma'] = ta.sma(df['volume'], length=20)
+            new_cols['volume_sma'] = sma_njit(volume, _VOLUME_SMA_PERIOD)
             
             # Price change
-            df['price_change'] = df['close'].pct_change()
-            df['price_change_abs'] = df['close'].diff()
+            price_change = np.empty_like(close)
+            price_change[0] = np.nan
+            price_change[1:] = close[1:] / close[:-1] - 1.0
+            new_cols['price_change'] = price_change
             
-            # Target for ML (1 if price goes up, 0 if down)
-            df['target'] = (df['close'].shift(-1) > df['close']).astype(int)
+            price_change_abs = np.empty_like(close)
+            price_change_abs[0] = np.nan
+            price_change_abs[1:] = close[1:] - close[:-1]
+            new_cols['price_change_abs'] = price_change_abs
+            
+            # Target for ML (1 if price goes up, 0 if down; last row has no next close)
+            target = np.zeros(len(close), dtype=np.int8)
+            if len(close) > 1:
+                target[:-1] = close[1:] > close[:-1]
+            new_cols['target'] = target
+            
+            # Frames loaded from the DB already carry (NULL) indicator columns;
+            # replace them rather than appending duplicates
+            df = pd.concat(
+                [df.drop(columns=list(new_cols), errors='ignore'), pd.DataFrame(new_cols, index=df.index)],
+                axis=1
+            )
             
             # Drop NaN values from indicator calculation
             df = df.dropna()
             
             logger.info("Added technical indicators", indicators=8)
-            return df
+            return df, True
         
         except Exception as e:
             logger.error("Error adding indicators", error=str(e))
-            return df
+            return df, False
     
     def prepare_ml_dataset(
         self,
@@ -2,28 +2,170 @@
 Market Data Collector
 Fetches real-time and historical OHLCV data from Binance public API
 """
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import ccxt
+import ccxt.async_support as ccxt_async
+import numpy as np
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from cachetools import TTLCache
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, Callable, Hashable, Any
 import time
-from config import settings
-from models import MarketData, SessionLocal
+from config import settings, SUPPORTED_COIN_SET
+from models import MarketData, append_dataframe
 import structlog
 
 logger = structlog.get_logger()
 
+# Columns persisted to the market_data table
+MARKET_DATA_COLUMNS = [
+    'coin', 'timeframe', 'timestamp',
+    'open', 'high', 'low', 'close', 'volume'
+]
+
+# Candle length in minutes per timeframe
+TIMEFRAME_MINUTES = {
+    "1s": 1/60,
+    "1m": 1,
+    "3m": 3,
+    "5m": 5,
+    "15m": 15,
+    "30m": 30,
+    "1h": 60,
+    "2h": 120,
+    "4h": 240,
+    "6h": 360,
+    "8h": 480,
+    "12h": 720,
+    "1d": 1440,
+    "3d": 4320,
+    "1w": 10080,
+    "1M": 43200
+}
+
+# Binance API limit is 1000 candles per request
+OHLCV_BATCH_LIMIT = 1000
+
+# Batches needed to cover one day of each timeframe
+BATCHES_PER_DAY = {
+    tf: (24 * 60 / minutes) / OHLCV_BATCH_LIMIT
+    for tf, minutes in TIMEFRAME_MINUTES.items()
+}
+
+
+def _plan_batches(timeframe: str, days: int) -> int:
+    """Number of OHLCV_BATCH_LIMIT-sized requests that cover `days` of candles"""
+    per_day = BATCHES_PER_DAY.get(timeframe, BATCHES_PER_DAY["1h"])
+    total_candles = int(round(days * per_day * OHLCV_BATCH_LIMIT))
+    return -(-total_candles // OHLCV_BATCH_LIMIT)
+
+# Short-lived caches so bursts of identical requests share one round trip
+PRICE_CACHE_TTL_SECONDS = 5
+OHLCV_CACHE_TTL_SECONDS = 30
+_price_cache = TTLCache(maxsize=256, ttl=PRICE_CACHE_TTL_SECONDS)
+_ohlcv_cache = TTLCache(maxsize=512, ttl=OHLCV_CACHE_TTL_SECONDS)
+
+# TTLCache is not thread-safe; callers reach us from worker threads
+_cache_lock = threading.Lock()
+
+# Fixed pool of fetch locks; keys hash onto a stripe so client-chosen keys
+# (e.g. arbitrary limits) cannot grow it. Colliding keys only serialize.
+KEY_LOCK_STRIPES = 64
+_key_locks: List[threading.Lock] = [threading.Lock() for _ in range(KEY_LOCK_STRIPES)]
+
+
+def _cached_fetch(cache: TTLCache, key: Hashable, fetch: Callable[[], Any]) -> Any:
+    """
+    Return cache[key], calling fetch() on a miss
+    
+    Concurrent misses on the same key wait on that key's lock stripe so only
+    one of them goes upstream. Failed fetches (None) are not cached.
+    """
+    with _cache_lock:
+        value = cache.get(key)
+        if value is not None:
+            return value
+    key_lock = _key_locks[hash(key) % KEY_LOCK_STRIPES]
+    
+    with key_lock:
+        with _cache_lock:
+            value = cache.get(key)
+        if value is not None:
+            return value
+        
+        value = fetch()
+        if value is not None:
+            with _cache_lock:
+                cache[key] = value
+        return value
+
 
 class MarketDataCollector:
     """Collects market data from Binance public API"""
     
     def __init__(self):
         """Initialize exchange connection"""
-        self.exchange = ccxt.binance({
+        self.exchange = ccxt.binance(self._exchange_config())
+        
+        # ccxt keeps one requests.Session; widen its pool so worker threads
+        # calling in concurrently reuse keep-alive connections
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+        self.exchange.session.mount("https://", adapter)
+        logger.info("MarketDataCollector initialized", exchange="Binance")
+    
+    @staticmethod
+    def _exchange_config() -> Dict:
+        """Shared ccxt config for the sync and async Binance clients"""
+        return {
             'enableRateLimit': True,
             'options': {'defaultType': 'spot'}
+        }
+    
+    @staticmethod
+    def _ohlcv_to_df(ohlcv: List, coin: str, timeframe: str) -> pd.DataFrame:
+        """Convert raw ccxt OHLCV rows to a DataFrame"""
+        df = pd.DataFrame(
+            ohlcv,
+            columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
+        )
+        
+        # Convert timestamp to datetime
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df['coin'] = coin
+        df['timeframe'] = timeframe
+        return df
+    
+    @staticmethod
+    def _batches_to_df(all_data: List, coin: str, timeframe: str) -> pd.DataFrame:
+        """
+        Build a time-sorted, de-duplicated OHLCV frame from concatenated batches
+        
+        Batches only overlap at their boundaries, so sorting and de-duplicating
+        the raw array once is cheaper than drop_duplicates/sort_values passes.
+        """
+        arr = np.asarray(all_data, dtype=np.float64).reshape(-1, 6)
+        ts = arr[:, 0].astype(np.int64)
+        
+        # Stable sort keeps the first-fetched copy of a duplicated candle first
+        order = np.argsort(ts, kind='stable')
+        _, first_idx = np.unique(ts[order], return_index=True)
+        keep = order[first_idx]
+        arr = arr[keep]
+        
+        df = pd.DataFrame({
+            'timestamp': pd.to_datetime(ts[keep], unit='ms'),
+            'open': arr[:, 1],
+            'high': arr[:, 2],
+            'low': arr[:, 3],
+            'close': arr[:, 4],
+            'volume': arr[:, 5]
         })
-        logger.info("MarketDataCollector initialized", exchange="Binance")
+        df['coin'] = coin
+        df['timeframe'] = timeframe
+        return df
     
     def get_current_price(self, coin: str) -> Optional[float]:
         """
@@ -35,6 +177,10 @@ class MarketDataCollector:
         Returns:
             Current price in USDT or None if error
         """
+        return _cached_fetch(_price_cache, coin, lambda: self._fetch_current_price(coin))
+    
+    def _fetch_current_price(self, coin: str) -> Optional[float]:
+        """Fetch the latest price from Binance, bypassing the cache"""
         try:
             symbol = f"{coin}/USDT"
             ticker = self.exchange.fetch_ticker(symbol)
@@ -62,6 +208,48 @@ class MarketDataCollector:
         Returns:
             DataFrame with OHLCV data or None if error
         """
+        ohlcv = self._get_ohlcv_rows(coin, timeframe, limit)
+        if ohlcv is None:
+            return None
+        return self._ohlcv_to_df(ohlcv, coin, timeframe)
+    
+    def get_ohlcv_array(
+        self,
+        coin: str,
+        timeframe: str,
+        limit: int = 100
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Get OHLCV data as raw numpy arrays, skipping DataFrame construction
+        
+        Args:
+            coin: Coin symbol (e.g., 'BTC')
+            timeframe: Timeframe (15m, 1h, 4h, 1d)
+            limit: Number of candles to fetch (default 100)
+            
+        Returns:
+            Tuple of (timestamps_ns int64 array, (N, 5) float64 array of
+            open/high/low/close/volume) or None if error
+        """
+        ohlcv = self._get_ohlcv_rows(coin, timeframe, limit)
+        if ohlcv is None:
+            return None
+        
+        arr = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+        timestamps_ns = arr[:, 0].astype(np.int64) * 1_000_000
+        prices = np.ascontiguousarray(arr[:, 1:])
+        return timestamps_ns, prices
+    
+    def _get_ohlcv_rows(self, coin: str, timeframe: str, limit: int) -> Optional[List]:
+        """Raw ccxt OHLCV rows, served from the short-lived cache when fresh"""
+        return _cached_fetch(
+            _ohlcv_cache,
+            (coin, timeframe, limit),
+            lambda: self._fetch_ohlcv(coin, timeframe, limit)
+        )
+    
+    def _fetch_ohlcv(self, coin: str, timeframe: str, limit: int) -> Optional[List]:
+        """Fetch OHLCV candles from Binance, bypassing the cache"""
         try:
             symbol = f"{coin}/USDT"
             tf = settings.TIMEFRAME_MAP.get(timeframe, "1h")
@@ -69,16 +257,49 @@ class MarketDataCollector:
             # Fetch OHLCV data
             ohlcv = self.exchange.fetch_ohlcv(symbol, tf, limit=limit)
             
-            # Convert to DataFrame
-            df = pd.DataFrame(
-                ohlcv,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
+            logger.info(
+                "Fetched OHLCV data", 
+                coin=coin, 
+                timeframe=timeframe, 
+                rows=len(ohlcv)
+            )
+            
+            return ohlcv
+        
+        except Exception as e:
+            logger.error(
+                "Error fetching OHLCV data", 
+                coin=coin, 
+                timeframe=timeframe, 
+                error=str(e)
             )
+            return None
+    
+    async def aget_ohlcv(
+        self,
+        exchange: ccxt_async.Exchange,
+        coin: str,
+        timeframe: str,
+        limit: int = 100
+    ) -> Optional[pd.DataFrame]:
+        """
+        Async variant of get_ohlcv using an async_support exchange
+        
+        Args:
+            exchange: ccxt.async_support exchange bound to the running loop
+            coin: Coin symbol (e.g., 'BTC')
+            timeframe: Timeframe (15m, 1h, 4h, 1d)
+            limit: Number of candles to fetch (default 100)
+            
+        Returns:
+            DataFrame with OHLCV data or None if error
+        """
+        try:
+            symbol = f"{coin}/USDT"
+            tf = settings.TIMEFRAME_MAP.get(timeframe, "1h")
             
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df['coin'] = coin
-            df['timeframe'] = timeframe
+            ohlcv = await exchange.fetch_ohlcv(symbol, tf, limit=limit)
+            df = self._ohlcv_to_df(ohlcv, coin, timeframe)
             
             logger.info(
                 "Fetched OHLCV data", 
@@ -107,6 +328,38 @@ class MarketDataCollector:
         """
         Get historical OHLCV data for ML training
         
+        Batches are fetched concurrently through aget_historical_ohlcv. When
+        called from a thread that is already running an event loop (sync code
+        inside an async endpoint) it falls back to the sequential walk.
+        
+        Args:
+            coin: Coin symbol
+            timeframe: Timeframe
+            days: Number of days to fetch
+            
+        Returns:
+            DataFrame with historical OHLCV data
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aget_historical_ohlcv(coin, timeframe, days))
+        
+        return self._get_historical_ohlcv_sequential(coin, timeframe, days)
+    
+    async def aget_historical_ohlcv(
+        self,
+        coin: str,
+        timeframe: str,
+        days: int = 180
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch historical OHLCV with all pagination windows in flight at once
+        
+        The `since` offset of every batch is planned up front from the candle
+        length, so batches do not wait on each other. Concurrency is capped by
+        API_MAX_CONCURRENCY and paced by ccxt's rate limiter.
+        
         Args:
             coin: Coin symbol
             timeframe: Timeframe
@@ -119,36 +372,73 @@ class MarketDataCollector:
             symbol = f"{coin}/USDT"
             tf = settings.TIMEFRAME_MAP.get(timeframe, "1h")
             
-            # Calculate how many candles we need
-            timeframe_minutes = {
-                "1s": 1/60,
-                "1m": 1,
-                "3m": 3,
-                "5m": 5,
-                "15m": 15,
-                "30m": 30,
-                "1h": 60,
-                "2h": 120,
-                "4h": 240,
-                "6h": 360,
-                "8h": 480,
-                "12h": 720,
-                "1d": 1440,
-                "3d": 4320,
-                "1w": 10080,
-                "1M": 43200
-            }
-            minutes = timeframe_minutes.get(timeframe, 60)
-            total_candles = int((days * 24 * 60) / minutes)
+            minutes = TIMEFRAME_MINUTES.get(timeframe, 60)
+            batch_ms = int(OHLCV_BATCH_LIMIT * minutes * 60 * 1000)
+            num_batches = _plan_batches(timeframe, days)
+            
+            start_ms = int((datetime.now() - timedelta(days=days)).timestamp() * 1000)
+            starts = [start_ms + k * batch_ms for k in range(num_batches)]
+            
+            exchange = ccxt_async.binance(self._exchange_config())
+            semaphore = asyncio.Semaphore(settings.API_MAX_CONCURRENCY)
+            
+            async def fetch_batch(since: int) -> List:
+                async with semaphore:
+                    return await exchange.fetch_ohlcv(
+                        symbol,
+                        tf,
+                        since=since,
+                        limit=OHLCV_BATCH_LIMIT
+                    )
+            
+            try:
+                batches = await asyncio.gather(*(fetch_batch(since) for since in starts))
+            finally:
+                await exchange.close()
+            
+            all_data = [candle for batch in batches for candle in batch]
+            df = self._batches_to_df(all_data, coin, timeframe)
+            
+            logger.info(
+                "Fetched historical OHLCV data",
+                coin=coin,
+                timeframe=timeframe,
+                days=days,
+                batches=num_batches,
+                rows=len(df)
+            )
+            
+            return df
+        
+        except Exception as e:
+            logger.error(
+                "Error fetching historical data",
+                coin=coin,
+                error=str(e)
+            )
+            return None
+    
+    def _get_historical_ohlcv_sequential(
+        self,
+        coin: str,
+        timeframe: str,
+        days: int
+    ) -> Optional[pd.DataFrame]:
+        """Walk historical batches one request at a time (no event loop needed)"""
+        try:
+            symbol = f"{coin}/USDT"
+            tf = settings.TIMEFRAME_MAP.get(timeframe, "1h")
+            
+            # Calculate how many batches we need
+            num_batches = _plan_batches(timeframe, days)
             
-            # Binance API limit is 1000 candles per request
-            limit_per_request = 1000
+            limit_per_request = OHLCV_BATCH_LIMIT
             all_data = []
             
             # Fetch in batches
             since = int((datetime.now() - timedelta(days=days)).timestamp() * 1000)
             
-            while len(all_data) < total_candles:
+            for _ in range(num_batches):
                 ohlcv = self.exchange.fetch_ohlcv(
                     symbol, 
                     tf, 
@@ -173,19 +463,8 @@ class MarketDataCollector:
                     total_candles=len(all_data)
                 )
             
-            # Convert to DataFrame
-            df = pd.DataFrame(
-                all_data,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
-            
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df['coin'] = coin
-            df['timeframe'] = timeframe
-            
-            # Remove duplicates
-            df = df.drop_duplicates(subset=['timestamp'])
-            df = df.sort_values('timestamp').reset_index(drop=True)
+            # Convert to a sorted, de-duplicated DataFrame
+            df = self._batches_to_df(all_data, coin, timeframe)
             
             logger.info(
                 "Fetched historical OHLCV data",
@@ -214,29 +493,11 @@ class MarketDataCollector:
             table: Table name (market_data or historical_data)
         """
         try:
-            db = SessionLocal()
-            
-            for _, row in df.iterrows():
-                data = MarketData(
-                    coin=row['coin'],
-                    timeframe=row['timeframe'],
-                    timestamp=row['timestamp'],
-                    open=row['open'],
-                    high=row['high'],
-                    low=row['low'],
-                    close=row['close'],
-                    volume=row['volume']
-                )
-                db.add(data)
-            
-            db.commit()
-            logger.info("Saved to database", table=table, rows=len(df))
+            rows = append_dataframe(df, MarketData, MARKET_DATA_COLUMNS)
+            logger.info("Saved to database", table=table, rows=rows)
             
         except Exception as e:
             logger.error("Error saving to database", error=str(e))
-            db.rollback()
-        finally:
-            db.close()
     
     def validate_coin(self, coin: str) -> bool:
         """
@@ -248,29 +509,105 @@ class MarketDataCollector:
         Returns:
             True if supported, False otherwise
         """
-        return coin.upper() in settings.SUPPORTED_COINS
+        return coin.upper() in SUPPORTED_COIN_SET
     
     def get_all_coins_data(self, timeframe: str = "1h") -> Dict[str, pd.DataFrame]:
         """
         Get current data for all supported coins
         
+        Uses the async fetcher when no event loop is running in this thread
+        and a thread pool otherwise.
+        
         Args:
             timeframe: Timeframe to fetch
             
         Returns:
             Dictionary of coin -> DataFrame
         """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aget_all_coins_data(timeframe))
+        
+        # Sync caller on an event-loop thread: asyncio.run is unavailable here
+        return self._get_all_coins_data_threaded(timeframe)
+    
+    def _get_all_coins_data_threaded(self, timeframe: str) -> Dict[str, pd.DataFrame]:
+        """Fan get_ohlcv out over a thread pool; ccxt's requests I/O releases the GIL"""
         all_data = {}
         
-        for coin in settings.SUPPORTED_COINS:
-            df = self.get_ohlcv(coin, timeframe, limit=100)
-            if df is not None:
-                all_data[coin] = df
-            time.sleep(settings.API_RATE_LIMIT_SECONDS)
+        with ThreadPoolExecutor(max_workers=settings.API_MAX_CONCURRENCY) as executor:
+            futures = {
+                executor.submit(self.get_ohlcv, coin, timeframe, 100): coin
+                for coin in settings.SUPPORTED_COINS
+            }
+            for future in as_completed(futures):
+                df = future.result()
+                if df is not None:
+                    all_data[futures[future]] = df
         
         logger.info("Fetched all coins data", coins=len(all_data))
         return all_data
-
+    
+    async def aget_all_coins_data(self, timeframe: str = "1h") -> Dict[str, pd.DataFrame]:
+        """
+        Fetch all supported coins concurrently
+        
+        Args:
+            timeframe: Timeframe to fetch
+            
+        Returns:
+            Dictionary of coin -> DataFrame
+        """
+        all_data = await self.aget_ohlcv_many(settings.SUPPORTED_COINS, timeframe, limit=100)
+        
+        logger.info("Fetched all coins data", coins=len(all_data))
+        return all_data
+    
+    async def aget_ohlcv_many(
+        self,
+        coins: List[str],
+        timeframe: str,
+        limit: int = 100
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch OHLCV for several coins concurrently on one async exchange
+        
+        Requests are capped by API_MAX_CONCURRENCY and paced by ccxt's
+        built-in rate limiter. The async exchange owns an aiohttp session
+        tied to the running loop, so it is created and closed per call.
+        
+        Args:
+            coins: Coin symbols
+            timeframe: Timeframe to fetch
+            limit: Number of candles per coin
+            
+        Returns:
+            Dictionary of coin -> DataFrame (coins that failed are left out)
+        """
+        exchange = ccxt_async.binance(self._exchange_config())
+        semaphore = asyncio.Semaphore(settings.API_MAX_CONCURRENCY)
+        
+        async def fetch(coin: str) -> Optional[pd.DataFrame]:
+            async with semaphore:
+                return await self.aget_ohlcv(exchange, coin, timeframe, limit=limit)
+        
+        try:
+            results = await asyncio.gather(
+                *(fetch(coin) for coin in coins),
+                return_exceptions=True
+            )
+        finally:
+            await exchange.close()
+        
+        frames = {}
+        for coin, result in zip(coins, results):
+            if isinstance(result, Exception):
+                logger.error("Error fetching OHLCV data", coin=coin, error=str(result))
+            elif result is not None:
+                frames[coin] = result
+        
+        return frames
 
 # Usage example
 if __name__ == "__main__":
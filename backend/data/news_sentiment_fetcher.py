@@ -2,17 +2,272 @@
 News & Sentiment Fetcher
 Fetches news and sentiment data from multiple free sources
 """
+import asyncio
+import atexit
+import threading
+import httpx
+import numpy as np
+import orjson
 import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime
+from typing import Callable, List, Dict, Optional, Tuple
 import time
-from textblob import TextBlob
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import LRUCache, TTLCache
+from tenacity import (
+    retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+)
 from config import settings
 from models import NewsSentiment, SessionLocal
+from _aio import run_sync
+from data._sentiment_njit import news_stats_njit, weighted_stats_njit
+from data._lexicon_sentiment import score_texts
 import structlog
 
+# VADER is a lexicon/rule scorer tuned for short social and news text and far
+# cheaper per headline than TextBlob's parser; the TextBlob lexicon remains
+# the fallback
+try:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    VADER_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without vaderSentiment
+    SentimentIntensityAnalyzer = None
+    VADER_AVAILABLE = False
+
+# ciso8601 parses RFC 3339 timestamps (including the trailing 'Z') in C;
+# fromisoformat needs the 'Z' rewritten on Python < 3.11
+try:
+    from ciso8601 import parse_datetime as _parse_iso8601
+except ImportError:  # pragma: no cover - exercised only without ciso8601
+    def _parse_iso8601(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+# ijson parses the posts array incrementally so the download can stop at the
+# first post older than the lookback window; without it the page is buffered
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without ijson
+    ijson = None
+    IJSON_AVAILABLE = False
+
 logger = structlog.get_logger()
 
+# Coin symbols CryptoPanic can filter posts on via `currencies`
+CRYPTOPANIC_CURRENCIES = frozenset({
+    'BTC', 'ETH', 'BNB', 'SOL', 'XRP',
+    'ADA', 'DOGE', 'AVAX', 'DOT', 'MATIC'
+})
+
+# Query params shared by every CryptoPanic posts request; copied per call
+_CRYPTOPANIC_BASE_PARAMS = {
+    'auth_token': settings.CRYPTOPANIC_API_KEY,
+    'public': 'true'
+}
+
+# Fear & Greed updates daily; news polling bursts collapse onto one fetch
+FEAR_GREED_CACHE_TTL_SECONDS = 3600
+NEWS_CACHE_TTL_SECONDS = 300
+_fear_greed_cache = TTLCache(maxsize=1, ttl=FEAR_GREED_CACHE_TTL_SECONDS)
+_news_cache = TTLCache(maxsize=128, ttl=NEWS_CACHE_TTL_SECONDS)
+_cache_lock = threading.Lock()
+
+# Fear & Greed values are integers 0-100, so the score/confidence mapping is
+# precomputed once: score normalised to -1..1, confidence grows at extremes
+_FG_VALUES = np.arange(101)
+_FG_SENTIMENT = (_FG_VALUES - 50) / 50
+_FG_CONFIDENCE = np.minimum(100, np.abs(_FG_VALUES - 50) * 2)
+
+# Weighted scores above / below +-SIGNAL_THRESHOLD map to BUY / SELL; the
+# LUT is indexed by (score > t) - (score < -t) + 1
+SIGNAL_THRESHOLD = 0.2
+_SIGNAL_LUT = np.array(['SELL', 'NEUTRAL', 'BUY'], dtype=object)
+
+# Worker threads for aggregate_many; matches the session's pool_maxsize so
+# every worker gets a kept-alive connection
+AGGREGATE_MAX_WORKERS = 8
+
+# Transient HTTP failures (429 / 5xx) are retried; Retry-After is honoured
+# up to this many seconds, otherwise jittered exponential backoff applies
+HTTP_RETRY_ATTEMPTS = 3
+RETRY_AFTER_MAX_SECONDS = 5.0
+_backoff = wait_exponential_jitter(initial=0.2, max=2)
+
+# Chunk size used when streaming CryptoPanic responses
+STREAM_CHUNK_BYTES = 16 * 1024
+
+# CryptoPanic reposts identical headlines across polls; remember their scores
+TITLE_SCORE_CACHE_SIZE = 2048
+# Score for titles with nothing to analyze (empty, URLs, punctuation only)
+NEUTRAL_TITLE_SCORE = {'score': 0.0, 'confidence': 20.0}
+
+# Single-coin saves are buffered and written in one INSERT once this many
+# rows are pending or the oldest has waited this long
+SENTIMENT_FLUSH_ROWS = 32
+SENTIMENT_FLUSH_SECONDS = 5.0
+
+
+def _cache_get(cache: TTLCache, key):
+    """Thread-safe TTLCache lookup (None on miss)"""
+    with _cache_lock:
+        return cache.get(key)
+
+
+def _cache_set(cache: TTLCache, key, value, keep: Callable = bool):
+    """Store a successful fetch; failures (None / empty) are not cached"""
+    if keep(value):
+        with _cache_lock:
+            cache[key] = value
+    return value
+
+
+def _object_array(values: List) -> np.ndarray:
+    """1-D object array, even when the values are equal-length lists"""
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def _empty_news() -> Dict[str, np.ndarray]:
+    """Column-oriented news batch with no items"""
+    return {
+        'title': _object_array([]),
+        'url': _object_array([]),
+        'source': _object_array([]),
+        'currencies': _object_array([]),
+        'published_at': np.empty(0, dtype='datetime64[s]'),
+        'sentiment_score': np.empty(0, dtype=np.float32),
+        'confidence': np.empty(0, dtype=np.float32)
+    }
+
+
+def _take_news(news: Dict[str, np.ndarray], index: List[int]) -> Dict[str, np.ndarray]:
+    """Select items of a column-oriented news batch by position"""
+    index = np.asarray(index, dtype=np.intp)
+    return {name: column[index] for name, column in news.items()}
+
+
+def _classify_signals(scores: np.ndarray) -> np.ndarray:
+    """Branchless BUY / SELL / NEUTRAL classification of weighted scores"""
+    index = (scores > SIGNAL_THRESHOLD).astype(np.intp) - (scores < -SIGNAL_THRESHOLD) + 1
+    return _SIGNAL_LUT[index]
+
+
+def _has_news(news: Dict[str, np.ndarray]) -> bool:
+    """True when a news batch holds at least one item"""
+    return news is not None and len(news['sentiment_score']) > 0
+
+
+def _is_transient_http_error(exc: BaseException) -> bool:
+    """True for rate-limit and server errors from requests or httpx"""
+    if not isinstance(exc, (requests.HTTPError, httpx.HTTPStatusError)):
+        return False
+    response = exc.response
+    return response is not None and (response.status_code == 429 or response.status_code >= 500)
+
+
+def _wait_retry_after(retry_state) -> float:
+    """Sleep for the server's Retry-After when given, else back off with jitter"""
+    exc = retry_state.outcome.exception()
+    response = getattr(exc, 'response', None)
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    
+    try:
+        return min(float(retry_after), RETRY_AFTER_MAX_SECONDS)
+    except (TypeError, ValueError):
+        return _backoff(retry_state)
+
+
+# Shared by the sync and async raw fetchers (tenacity detects coroutines)
+_http_retry = retry(
+    stop=stop_after_attempt(HTTP_RETRY_ATTEMPTS),
+    wait=_wait_retry_after,
+    retry=retry_if_exception(_is_transient_http_error),
+    reraise=True
+)
+
+
+class _RecentPostCollector:
+    """
+    Incrementally collects CryptoPanic posts newer than a cutoff
+    
+    Response bytes are fed in chunks; posts come newest-first, so collection
+    stops at the first post older than the cutoff and the rest of the page is
+    never parsed (or downloaded, once the caller closes the stream). Fields
+    are pulled into per-column lists in the same pass as the time filter.
+    """
+    
+    def __init__(self, hours: int):
+        # Compare as epoch seconds: one float compare per post, and no
+        # naive/aware datetime mismatch against the UTC-suffixed timestamps
+        self.cutoff_ts = time.time() - hours * 3600
+        self.columns = {
+            'title': [],
+            'url': [],
+            'source': [],
+            'currencies': [],
+            'published_at': []
+        }
+        self.done = False
+        
+        if IJSON_AVAILABLE:
+            self._buffer = None
+            self._items = ijson.sendable_list()
+            self._parser = ijson.items_coro(self._items, 'results.item')
+        else:
+            self._buffer = []
+    
+    def feed(self, chunk: bytes) -> bool:
+        """Consume a chunk of the response body; True once collection is done"""
+        if self._buffer is not None:
+            self._buffer.append(chunk)
+            return False
+        
+        self._parser.send(chunk)
+        self._take(self._items)
+        del self._items[:]
+        return self.done
+    
+    def close(self) -> Dict[str, List]:
+        """Finish parsing and return the raw column lists (epoch-second timestamps)"""
+        if self._buffer is not None:
+            data = orjson.loads(b''.join(self._buffer))
+            self._take(data.get('results', []))
+        elif not self.done:
+            self._parser.close()
+            self._take(self._items)
+        return self.columns
+    
+    def _take(self, items):
+        """Keep posts inside the window, stopping at the first stale one"""
+        if self.done:
+            return
+        
+        # Bind the hot-loop lookups once per chunk
+        cutoff_ts = self.cutoff_ts
+        parse = _parse_iso8601
+        add_title = self.columns['title'].append
+        add_url = self.columns['url'].append
+        add_source = self.columns['source'].append
+        add_currencies = self.columns['currencies'].append
+        add_published = self.columns['published_at'].append
+        
+        for item in items:
+            published_ts = parse(item['published_at']).timestamp()
+            
+            # Filter by time
+            if published_ts < cutoff_ts:
+                self.done = True
+                return
+            
+            add_title(item.get('title', ''))
+            add_url(item.get('url', ''))
+            add_source((item.get('source') or {}).get('title', 'Unknown'))
+            add_currencies([c.get('code') for c in item.get('currencies') or ()])
+            add_published(published_ts)
+
 
 class NewsSentimentFetcher:
     """Fetches news and sentiment data from free sources"""
@@ -21,6 +276,27 @@ class NewsSentimentFetcher:
         """Initialize sentiment fetcher"""
         self.cryptopanic_api = settings.CRYPTOPANIC_API_URL
         self.fear_greed_api = settings.FEAR_GREED_API_URL
+        self._vader = SentimentIntensityAnalyzer() if VADER_AVAILABLE else None
+        
+        # Keep-alive pool shared by all sync fetches (requests already
+        # negotiates gzip); transient failures get two quick retries
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        
+        self._title_scores = LRUCache(maxsize=TITLE_SCORE_CACHE_SIZE)
+        self._title_lock = threading.Lock()
+        
+        # Write-behind buffer for get_aggregated_sentiment rows
+        self._pending_rows = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer = None
+        atexit.register(self.flush)
         logger.info("NewsSentimentFetcher initialized")
     
     def get_fear_greed_index(self) -> Optional[Dict]:
@@ -30,49 +306,98 @@ class NewsSentimentFetcher:
         Returns:
             Dictionary with fear/greed data
         """
+        cached = _cache_get(_fear_greed_cache, self.fear_greed_api)
+        if cached is not None:
+            return cached
+        
         try:
-            response = requests.get(self.fear_greed_api, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            return _cache_set(
+                _fear_greed_cache,
+                self.fear_greed_api,
+                self._parse_fear_greed(self._fetch_fg_raw())
+            )
+        
+        except Exception as e:
+            logger.error("Error fetching Fear & Greed Index", error=str(e))
+            return None
+    
+    async def aget_fear_greed_index(self, client: httpx.AsyncClient) -> Optional[Dict]:
+        """
+        Async variant of get_fear_greed_index
+        
+        Args:
+            client: Shared httpx.AsyncClient
             
-            if 'data' in data and len(data['data']) > 0:
-                fg_data = data['data'][0]
-                value = int(fg_data['value'])
-                classification = fg_data['value_classification']
-                
-                # Convert to sentiment score (-1 to 1)
-                # Fear & Greed is 0-100, where 0 = Extreme Fear, 100 = Extreme Greed
-                sentiment_score = (value - 50) / 50  # Normalize to -1 to 1
-                
-                # Confidence based on extreme values
-                confidence = min(100, abs(value - 50) * 2)
-                
-                result = {
-                    'value': value,
-                    'classification': classification,
-                    'sentiment_score': sentiment_score,
-                    'confidence': confidence,
-                    'timestamp': datetime.now()
-                }
-                
-                logger.info(
-                    "Fetched Fear & Greed Index",
-                    value=value,
-                    classification=classification
-                )
-                
-                return result
+        Returns:
+            Dictionary with fear/greed data
+        """
+        cached = _cache_get(_fear_greed_cache, self.fear_greed_api)
+        if cached is not None:
+            return cached
+        
+        try:
+            return _cache_set(
+                _fear_greed_cache,
+                self.fear_greed_api,
+                self._parse_fear_greed(await self._afetch_fg_raw(client))
+            )
         
         except Exception as e:
             logger.error("Error fetching Fear & Greed Index", error=str(e))
             return None
     
+    @_http_retry
+    def _fetch_fg_raw(self) -> Dict:
+        """GET the Fear & Greed payload, retrying transient failures"""
+        response = self._session.get(self.fear_greed_api, timeout=10)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    @_http_retry
+    async def _afetch_fg_raw(self, client: httpx.AsyncClient) -> Dict:
+        """Async variant of _fetch_fg_raw"""
+        response = await client.get(self.fear_greed_api)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    def _parse_fear_greed(self, data: Dict) -> Optional[Dict]:
+        """Convert the Fear & Greed API payload to a sentiment record"""
+        if 'data' in data and len(data['data']) > 0:
+            fg_data = data['data'][0]
+            value = int(fg_data['value'])
+            classification = fg_data['value_classification']
+            
+            # Convert to sentiment score (-1 to 1)
+            # Fear & Greed is 0-100, where 0 = Extreme Fear, 100 = Extreme Greed
+            index = min(max(value, 0), 100)
+            sentiment_score = float(_FG_SENTIMENT[index])
+            
+            # Confidence based on extreme values
+            confidence = int(_FG_CONFIDENCE[index])
+            
+            result = {
+                'value': value,
+                'classification': classification,
+                'sentiment_score': sentiment_score,
+                'confidence': confidence,
+                'timestamp': datetime.now()
+            }
+            
+            logger.info(
+                "Fetched Fear & Greed Index",
+                value=value,
+                classification=classification
+            )
+            
+            return result
+        
+        return None
+    
     def get_cryptopanic_news(
         self,
         coin: str = None,
         hours: int = 24
-    ) -> List[Dict]:
+    ) -> Dict[str, np.ndarray]:
         """
         Get news from CryptoPanic
         
@@ -81,85 +406,148 @@ class NewsSentimentFetcher:
             hours: Lookback hours (default 24)
             
         Returns:
-            List of news items with sentiment
+            Column-oriented news batch (one array per field)
         """
+        cached = _cache_get(_news_cache, (coin, hours))
+        if cached is not None:
+            return cached
+        
         try:
-            # CryptoPanic free API endpoint
-            url = f"{self.cryptopanic_api}/posts/"
-            
-            params = {
-                'auth_token': settings.CRYPTOPANIC_API_KEY,
-                'public': 'true'
-            }
-            
-            # Filter by coin if specified
-            if coin:
-                # Map common coin symbols to CryptoPanic currencies
-                currency_map = {
-                    'BTC': 'BTC',
-                    'ETH': 'ETH',
-                    'BNB': 'BNB',
-                    'SOL': 'SOL',
-                    'XRP': 'XRP',
-                    'ADA': 'ADA',
-                    'DOGE': 'DOGE',
-                    'AVAX': 'AVAX',
-                    'DOT': 'DOT',
-                    'MATIC': 'MATIC'
-                }
-                
-                if coin in currency_map:
-                    params['currencies'] = currency_map[coin]
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            news_items = []
-            cutoff_time = datetime.now() - timedelta(hours=hours)
-            
-            if 'results' in data:
-                for item in data['results']:
-                    published_at = datetime.fromisoformat(
-                        item['published_at'].replace('Z', '+00:00')
-                    )
-                    
-                    # Filter by time
-                    if published_at < cutoff_time:
-                        continue
-                    
-                    title = item.get('title', '')
-                    
-                    # Analyze sentiment
-                    sentiment = self._analyze_text_sentiment(title)
-                    
-                    news_item = {
-                        'title': title,
-                        'url': item.get('url', ''),
-                        'published_at': published_at,
-                        'source': item.get('source', {}).get('title', 'Unknown'),
-                        'sentiment_score': sentiment['score'],
-                        'confidence': sentiment['confidence']
-                    }
-                    
-                    news_items.append(news_item)
-            
-            logger.info(
-                "Fetched CryptoPanic news",
-                coin=coin,
-                count=len(news_items)
+            return _cache_set(
+                _news_cache,
+                (coin, hours),
+                self._parse_cryptopanic(self._fetch_cryptopanic_raw(coin, hours), coin),
+                keep=_has_news
             )
+        
+        except Exception as e:
+            logger.error("Error fetching CryptoPanic news", error=str(e))
+            return _empty_news()
+    
+    async def aget_cryptopanic_news(
+        self,
+        client: httpx.AsyncClient,
+        coin: str = None,
+        hours: int = 24
+    ) -> Dict[str, np.ndarray]:
+        """
+        Async variant of get_cryptopanic_news
+        
+        Args:
+            client: Shared httpx.AsyncClient
+            coin: Specific coin filter (optional)
+            hours: Lookback hours (default 24)
             
-            return news_items
+        Returns:
+            Column-oriented news batch (one array per field)
+        """
+        cached = _cache_get(_news_cache, (coin, hours))
+        if cached is not None:
+            return cached
+        
+        try:
+            return _cache_set(
+                _news_cache,
+                (coin, hours),
+                self._parse_cryptopanic(
+                    await self._afetch_cryptopanic_raw(client, coin, hours),
+                    coin
+                ),
+                keep=_has_news
+            )
         
         except Exception as e:
             logger.error("Error fetching CryptoPanic news", error=str(e))
-            return []
+            return _empty_news()
+    
+    @_http_retry
+    def _fetch_cryptopanic_raw(self, coin: str, hours: int) -> Dict[str, List]:
+        """Stream CryptoPanic posts inside the window, retrying transient failures"""
+        url, params = self._cryptopanic_request(coin)
+        collector = _RecentPostCollector(hours)
+        with self._session.get(url, params=params, stream=True, timeout=10) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(STREAM_CHUNK_BYTES):
+                if collector.feed(chunk):
+                    break
+        return collector.close()
+    
+    @_http_retry
+    async def _afetch_cryptopanic_raw(
+        self,
+        client: httpx.AsyncClient,
+        coin: str,
+        hours: int
+    ) -> Dict[str, List]:
+        """Async variant of _fetch_cryptopanic_raw"""
+        url, params = self._cryptopanic_request(coin)
+        collector = _RecentPostCollector(hours)
+        async with client.stream('GET', url, params=params) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(STREAM_CHUNK_BYTES):
+                if collector.feed(chunk):
+                    break
+        return collector.close()
+    
+    def _cryptopanic_request(self, coin: str = None):
+        """Build the CryptoPanic posts URL and query params"""
+        # CryptoPanic free API endpoint
+        url = f"{self.cryptopanic_api}/posts/"
+        
+        params = _CRYPTOPANIC_BASE_PARAMS.copy()
+        
+        # Filter by coin(s) if specified; a comma-separated list is accepted
+        if coin in CRYPTOPANIC_CURRENCIES:
+            params['currencies'] = coin
+        elif coin:
+            currencies = [c for c in coin.split(',') if c in CRYPTOPANIC_CURRENCIES]
+            if currencies:
+                params['currencies'] = ','.join(currencies)
+        
+        return url, params
+    
+    def _parse_cryptopanic(self, raw: Dict[str, List], coin: str) -> Dict[str, np.ndarray]:
+        """
+        Score the titles of posts inside the lookback window
+        
+        Args:
+            raw: Column lists from the posts collector
+            coin: Coin filter the posts were fetched with (for logging)
+            
+        Returns:
+            Column-oriented batch: one array per field
+        """
+        if not raw['title']:
+            news_items = _empty_news()
+        else:
+            # Analyze sentiment for all titles in one batch
+            sentiments = self._score_titles(raw['title'])
+            
+            news_items = {
+                'title': _object_array(raw['title']),
+                'url': _object_array(raw['url']),
+                'source': _object_array(raw['source']),
+                'currencies': _object_array(raw['currencies']),
+                'published_at': np.array(
+                    raw['published_at'], dtype=np.float64
+                ).astype(np.int64).astype('datetime64[s]'),
+                # Scores in [-1, 1] and confidences in [0, 100] fit float32
+                # comfortably; the kernels accumulate in float64
+                'sentiment_score': np.array([x['score'] for x in sentiments], dtype=np.float32),
+                'confidence': np.array([x['confidence'] for x in sentiments], dtype=np.float32)
+            }
+        
+        logger.info(
+            "Fetched CryptoPanic news",
+            coin=coin,
+            count=len(news_items['sentiment_score'])
+        )
+        
+        return news_items
     
     def _analyze_text_sentiment(self, text: str) -> Dict:
         """
-        Analyze text sentiment using TextBlob
+        Analyze text sentiment
         
         Args:
             text: Text to analyze
@@ -167,26 +555,84 @@ class NewsSentimentFetcher:
         Returns:
             Dictionary with sentiment score and confidence
         """
-        try:
-            blob = TextBlob(text)
-            polarity = blob.sentiment.polarity  # -1 to 1
-            subjectivity = blob.sentiment.subjectivity  # 0 to 1
+        return self._score_titles([text])[0]
+    
+    def _score_titles(self, titles: List[str]) -> List[Dict]:
+        """
+        Score a batch of headlines, skipping degenerate titles and reusing
+        cached scores so only unseen headlines reach the scorer
+        
+        Args:
+            titles: Headlines to analyze
+            
+        Returns:
+            List of dictionaries with sentiment score and confidence
+        """
+        results = [None] * len(titles)
+        pending = {}
+        
+        with self._title_lock:
+            for i, title in enumerate(titles):
+                if not title or not any(c.isalpha() for c in title[:64]):
+                    results[i] = dict(NEUTRAL_TITLE_SCORE)
+                    continue
+                
+                cached = self._title_scores.get(title)
+                if cached is not None:
+                    results[i] = dict(cached)
+                else:
+                    pending.setdefault(title, []).append(i)
+        
+        if pending:
+            unique_titles = list(pending)
+            scored = self._score_uncached(unique_titles)
             
-            # Confidence based on subjectivity (more subjective = higher confidence)
-            confidence = min(100, subjectivity * 100)
+            with self._title_lock:
+                for title, result in zip(unique_titles, scored):
+                    # Do not remember the error fallback
+                    if result['confidence'] > 0:
+                        self._title_scores[title] = result
+                    for i in pending[title]:
+                        results[i] = dict(result)
+        
+        return results
+    
+    def _score_uncached(self, titles: List[str]) -> List[Dict]:
+        """
+        Score headlines with VADER, or the vectorized TextBlob lexicon scorer
+        when vaderSentiment is unavailable
+        
+        Args:
+            titles: Headlines to analyze
+            
+        Returns:
+            List of dictionaries with sentiment score and confidence
+        """
+        try:
+            if self._vader is not None:
+                scores = np.fromiter(
+                    (self._vader.polarity_scores(t)['compound'] for t in titles),  # -1 to 1
+                    dtype=np.float64,
+                    count=len(titles)
+                )
+                # Confidence based on polarity strength
+                confidence = np.abs(scores) * 100
+            else:
+                scores, subjectivity = score_texts(titles)  # -1 to 1, 0 to 1
+                # Confidence based on subjectivity (more subjective = higher confidence)
+                confidence = subjectivity * 100
             
             # Ensure minimum confidence
-            if confidence < 20:
-                confidence = 20
+            confidence = np.clip(confidence, 20, 100)
             
-            return {
-                'score': polarity,
-                'confidence': confidence
-            }
+            return [
+                {'score': float(score), 'confidence': float(conf)}
+                for score, conf in zip(scores, confidence)
+            ]
         
         except Exception as e:
             logger.error("Error analyzing sentiment", error=str(e))
-            return {'score': 0.0, 'confidence': 0}
+            return [{'score': 0.0, 'confidence': 0} for _ in titles]
     
     def get_aggregated_sentiment(
         self,
@@ -203,111 +649,291 @@ class NewsSentimentFetcher:
         Returns:
             Aggregated sentiment data
         """
+        log = logger.bind(coin=coin)
+        
         try:
-            sentiments = []
-            
-            # Fear & Greed Index (general market sentiment)
-            fg_index = self.get_fear_greed_index()
-            if fg_index:
-                sentiments.append({
-                    'score': fg_index['sentiment_score'],
-                    'confidence': fg_index['confidence'] * 0.3,  # Weight 30%
-                    'source': 'fear_greed'
-                })
-            
-            # CryptoPanic news
-            news = self.get_cryptopanic_news(coin, hours)
-            if news:
-                # Average news sentiment
-                news_scores = [n['sentiment_score'] for n in news if n['sentiment_score'] != 0]
-                if news_scores:
-                    avg_score = sum(news_scores) / len(news_scores)
-                    avg_confidence = sum([n['confidence'] for n in news]) / len(news)
-                    
-                    sentiments.append({
-                        'score': avg_score,
-                        'confidence': avg_confidence * 0.7,  # Weight 70%
-                        'source': 'cryptopanic'
-                    })
+            # Both sources are independent, so fetch them concurrently
+            fg_index, news = run_sync(self._fetch_sentiment_sources(coin, hours))
             
-            # Calculate weighted average
-            if sentiments:
-                total_weight = sum(s['confidence'] for s in sentiments)
-                
-                if total_weight > 0:
-                    weighted_score = sum(
-                        s['score'] * s['confidence'] for s in sentiments
-                    ) / total_weight
-                    
-                    avg_confidence = sum(s['confidence'] for s in sentiments) / len(sentiments)
-                    
-                    # Convert sentiment score to signal
-                    if weighted_score > 0.2:
-                        signal = "BUY"
-                    elif weighted_score < -0.2:
-                        signal = "SELL"
-                    else:
-                        signal = "NEUTRAL"
-                    
-                    result = {
-                        'coin': coin,
-                        'sentiment_score': weighted_score,
-                        'confidence': round(avg_confidence, 2),
-                        'signal': signal,
-                        'num_sources': len(sentiments),
-                        'timestamp': datetime.now()
-                    }
-                    
-                    # Save to database
-                    self._save_to_db(coin, result)
-                    
-                    logger.info(
-                        "Aggregated sentiment",
-                        coin=coin,
-                        signal=signal,
-                        confidence=result['confidence']
-                    )
-                    
-                    return result
+            result = self._aggregate(coin, fg_index, news)
+            if result['num_sources'] > 0:
+                # Save to database
+                self._save_to_db(coin, result)
             
-            # Default neutral if no data
-            return {
-                'coin': coin,
-                'sentiment_score': 0.0,
-                'confidence': 0,
-                'signal': 'NEUTRAL',
-                'num_sources': 0,
-                'timestamp': datetime.now()
-            }
+            return result
         
         except Exception as e:
-            logger.error("Error aggregating sentiment", coin=coin, error=str(e))
+            log.error("Error aggregating sentiment", error=str(e))
             return None
     
-    def _save_to_db(self, coin: str, sentiment_data: Dict):
-        """Save sentiment data to database"""
+    def aggregate_many(
+        self,
+        coins: List[str],
+        hours: int = 24
+    ) -> Dict[str, Optional[Dict]]:
+        """
+        Get aggregated sentiment for several coins concurrently
+        
+        Each coin keeps its own CryptoPanic query (unlike
+        get_aggregated_sentiment_batch, which shares one filtered page), and the
+        per-coin round-trips overlap on a bounded thread pool.
+        
+        Args:
+            coins: Coin symbols
+            hours: Lookback hours
+            
+        Returns:
+            Dictionary of coin -> aggregated sentiment data (None on failure)
+        """
+        if not coins:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(AGGREGATE_MAX_WORKERS, len(coins))) as executor:
+            results = list(executor.map(
+                lambda coin: self.get_aggregated_sentiment(coin, hours),
+                coins
+            ))
+        
+        return dict(zip(coins, results))
+    
+    def get_aggregated_sentiment_batch(
+        self,
+        coins: List[str],
+        hours: int = 24
+    ) -> Dict[str, Dict]:
+        """
+        Get aggregated sentiment for many coins with O(1) HTTP requests
+        
+        Fear & Greed is market-wide and fetched once. CryptoPanic is queried
+        once for all mapped coins (comma-separated `currencies` filter) and the
+        posts are bucketed per coin; coins CryptoPanic cannot filter on share
+        one unfiltered query, matching get_aggregated_sentiment.
+        
+        Args:
+            coins: Coin symbols
+            hours: Lookback hours
+            
+        Returns:
+            Dictionary of coin -> aggregated sentiment data
+        """
         try:
-            db = SessionLocal()
+            fg_index, filtered_news, general_news = run_sync(
+                self._fetch_batch_sources(coins, hours)
+            )
+            
+            # Bucket filtered posts by the currencies they are tagged with
+            index_by_coin = {coin: [] for coin in coins}
+            for i, codes in enumerate(filtered_news['currencies']):
+                for code in codes:
+                    if code in index_by_coin:
+                        index_by_coin[code].append(i)
+            
+            news_list = [
+                _take_news(filtered_news, index_by_coin[coin])
+                if coin in CRYPTOPANIC_CURRENCIES else general_news
+                for coin in coins
+            ]
+            results = self._aggregate_coins(coins, fg_index, news_list)
+            
+            self._save_many_to_db([r for r in results.values() if r['num_sources'] > 0])
+            
+            return results
+        
+        except Exception as e:
+            logger.error("Error aggregating batch sentiment", coins=len(coins), error=str(e))
+            return {}
+    
+    def _aggregate(
+        self,
+        coin: str,
+        fg_index: Optional[Dict],
+        news: Dict[str, np.ndarray]
+    ) -> Dict:
+        """Combine Fear & Greed and news into one weighted sentiment result"""
+        return self._aggregate_coins([coin], fg_index, [news])[coin]
+    
+    def _aggregate_coins(
+        self,
+        coins: List[str],
+        fg_index: Optional[Dict],
+        news_list: List[Dict[str, np.ndarray]]
+    ) -> Dict[str, Dict]:
+        """
+        Build aggregated sentiment results for several coins at once
+        
+        Args:
+            coins: Coin symbols
+            fg_index: Market-wide Fear & Greed record (shared by all coins)
+            news_list: News batch per coin, aligned with coins
+            
+        Returns:
+            Dictionary of coin -> aggregated sentiment data
+        """
+        weighed = [self._weigh_sources(fg_index, news) for news in news_list]
+        
+        # Convert sentiment scores to signals in one vectorized pass
+        signals = _classify_signals(np.array(
+            [w[0] if w is not None else 0.0 for w in weighed],
+            dtype=np.float64
+        ))
+        
+        results = {}
+        for coin, w, signal in zip(coins, weighed, signals):
+            if w is None:
+                # Default neutral if no data
+                results[coin] = {
+                    'coin': coin,
+                    'sentiment_score': 0.0,
+                    'confidence': 0,
+                    'signal': 'NEUTRAL',
+                    'num_sources': 0,
+                    'timestamp': datetime.now()
+                }
+                continue
+            
+            weighted_score, avg_confidence, num_sources = w
+            results[coin] = {
+                'coin': coin,
+                'sentiment_score': weighted_score,
+                'confidence': round(avg_confidence, 2),
+                'signal': signal,
+                'num_sources': num_sources,
+                'timestamp': datetime.now()
+            }
             
-            sentiment = NewsSentiment(
+            logger.info(
+                "Aggregated sentiment",
                 coin=coin,
-                timestamp=sentiment_data['timestamp'],
-                source='aggregated',
-                title=f"Aggregated sentiment from {sentiment_data['num_sources']} sources",
-                content='',
-                sentiment_score=sentiment_data['sentiment_score'],
-                confidence=sentiment_data['confidence']
+                signal=signal,
+                confidence=results[coin]['confidence']
+            )
+        
+        return results
+    
+    def _weigh_sources(
+        self,
+        fg_index: Optional[Dict],
+        news: Dict[str, np.ndarray]
+    ) -> Optional[Tuple[float, float, int]]:
+        """Weighted (score, confidence, num_sources) over the sources, None if no weight"""
+        sentiments = []
+        
+        # Fear & Greed Index (general market sentiment)
+        if fg_index:
+            sentiments.append({
+                'score': fg_index['sentiment_score'],
+                'confidence': fg_index['confidence'] * 0.3,  # Weight 30%
+                'source': 'fear_greed'
+            })
+        
+        # CryptoPanic news
+        if _has_news(news):
+            # Average news sentiment straight over the score/confidence columns
+            avg_score, num_scored, avg_confidence = news_stats_njit(
+                news['sentiment_score'],
+                news['confidence']
+            )
+            if num_scored > 0:
+                sentiments.append({
+                    'score': avg_score,
+                    'confidence': avg_confidence * 0.7,  # Weight 70%
+                    'source': 'cryptopanic'
+                })
+        
+        # Calculate weighted average
+        if sentiments:
+            weighted_score, avg_confidence, total_weight = weighted_stats_njit(
+                np.array([s['score'] for s in sentiments], dtype=np.float64),
+                np.array([s['confidence'] for s in sentiments], dtype=np.float64)
             )
             
-            db.add(sentiment)
-            db.commit()
-            logger.info("Saved sentiment to DB", coin=coin)
+            if total_weight > 0:
+                return weighted_score, avg_confidence, len(sentiments)
+        
+        return None
+    
+    async def _fetch_sentiment_sources(self, coin: str, hours: int):
+        """Fetch Fear & Greed and CryptoPanic news over one async client"""
+        async with httpx.AsyncClient(timeout=10) as client:
+            return await asyncio.gather(
+                self.aget_fear_greed_index(client),
+                self.aget_cryptopanic_news(client, coin, hours)
+            )
+    
+    async def _fetch_batch_sources(self, coins: List[str], hours: int):
+        """Fetch Fear & Greed plus filtered and general CryptoPanic news at once"""
+        mapped = [coin for coin in coins if coin in CRYPTOPANIC_CURRENCIES]
+        needs_general = len(mapped) < len(coins)
+        
+        async def no_news() -> Dict[str, np.ndarray]:
+            return _empty_news()
+        
+        async with httpx.AsyncClient(timeout=10) as client:
+            return await asyncio.gather(
+                self.aget_fear_greed_index(client),
+                self.aget_cryptopanic_news(client, ",".join(mapped), hours) if mapped else no_news(),
+                self.aget_cryptopanic_news(client, None, hours) if needs_general else no_news()
+            )
+    
+    def _sentiment_row(self, coin: str, sentiment_data: Dict) -> Dict:
+        """Build the news_sentiment row dict for an aggregated result"""
+        return {
+            'coin': coin,
+            'timestamp': sentiment_data['timestamp'],
+            'source': 'aggregated',
+            'title': f"Aggregated sentiment from {sentiment_data['num_sources']} sources",
+            'content': '',
+            'sentiment_score': sentiment_data['sentiment_score'],
+            'confidence': sentiment_data['confidence'],
+            'url': None
+        }
+    
+    def _save_to_db(self, coin: str, sentiment_data: Dict):
+        """Queue sentiment data for the next buffered database write"""
+        with self._pending_lock:
+            self._pending_rows.append(self._sentiment_row(coin, sentiment_data))
+            flush_now = len(self._pending_rows) >= SENTIMENT_FLUSH_ROWS
+            if not flush_now and self._flush_timer is None:
+                self._flush_timer = threading.Timer(SENTIMENT_FLUSH_SECONDS, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        
+        if flush_now:
+            self.flush()
+    
+    def flush(self):
+        """Write any buffered sentiment rows to the database"""
+        with self._pending_lock:
+            rows, self._pending_rows = self._pending_rows, []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        
+        self._save_batch_to_db(rows)
+    
+    def _save_many_to_db(self, results: List[Dict]):
+        """Save several aggregated results in one INSERT"""
+        self._save_batch_to_db([self._sentiment_row(r['coin'], r) for r in results])
+    
+    def _save_batch_to_db(self, rows: List[Dict]):
+        """
+        Bulk-insert pre-shaped news_sentiment rows in a single transaction
+        
+        Args:
+            rows: Dictionaries keyed by news_sentiment column names
+        """
+        if not rows:
+            return
+        
+        try:
+            # Core executemany: no ORM identity map or per-row state
+            with SessionLocal() as db:
+                db.execute(NewsSentiment.__table__.insert(), rows)
+                db.commit()
+            logger.info("Saved sentiment to DB", rows=len(rows))
         
         except Exception as e:
-            logger.error("Error saving sentiment to DB", error=str(e))
-            db.rollback()
-        finally:
-            db.close()
+            logger.error("Error saving sentiment to DB", rows=len(rows), error=str(e))
 
 
 # Usage example
@@ -326,3 +952,5 @@ if __name__ == "__main__":
         print(f"  Signal: {sentiment['signal']}")
         print(f"  Confidence: {sentiment['confidence']}%")
         print(f"  Score: {sentiment['sentiment_score']:.3f}")
+    
+    fetcher.flush()
@@ -4,6 +4,7 @@ Debug Prediction Logic
 import sys
 import os
 import traceback
+import orjson
 import pandas as pd
 
 # Add current directory to path
@@ -11,6 +12,11 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from prediction.prediction_engine import PredictionEngine
 
+def _fallback(obj):
+    """Report and stringify values orjson cannot serialize natively"""
+    print(f"  non-serializable: {type(obj).__name__}={obj!r}")
+    return str(obj)
+
 def debug():
     print("Initializing PredictionEngine...")
     try:
@@ -20,24 +26,10 @@ def debug():
         prediction = engine.predict('BTC', '1h', min_confidence=10)
         
         print("\n--- PREDICTION RESULT ---")
-        import json
-        # Try to serialize to see if it's a serialization error
-        try:
-            print(json.dumps(prediction, indent=2))
-        except TypeError as te:
-            print(f"SERIALIZATION ERROR: {str(te)}")
-            # Try to find which key is failing
-            for k, v in prediction.items():
-                try:
-                    json.dumps(v)
-                except:
-                    print(f"  Failing key: {k} (type: {type(v)})")
-                    if isinstance(v, dict):
-                        for k2, v2 in v.items():
-                            try:
-                                json.dumps(v2)
-                            except:
-                                print(f"    Failing sub-key: {k2} (type: {type(v2)})")
+        # orjson handles numpy scalars/arrays and datetimes natively; anything
+        # else is reported once by the fallback and rendered as a string
+        options = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        print(orjson.dumps(prediction, default=_fallback, option=options).decode())
                                 
     except Exception as e:
         print("\n--- EXCEPTION CAUGHT ---")
@@ -0,0 +1,99 @@
+"""
+Logging Configuration
+Routes structlog events through a queue so JSON rendering and I/O run off the caller's thread
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import orjson
+import structlog
+from config import settings
+
+_listener = None
+
+# Whether DEBUG events pass the level filter; hot paths check it before
+# building debug payloads (unconfigured structlog prints every level)
+DEBUG_ENABLED = True
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that enqueues records untouched for the listener to format"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats the message on the calling thread
+        return record
+
+
+def _orjson_serializer(obj, **kwargs) -> str:
+    """JSONRenderer serializer backed by orjson"""
+    return orjson.dumps(obj, default=str).decode()
+
+
+def configure_logging(level: str = None, log_file: str = None):
+    """
+    Configure structlog with level filtering and a background queue sink
+    
+    Events below the level are discarded before any processor runs. The
+    rest get a level and timestamp on the calling thread, then travel as raw
+    event dicts through a queue to a listener thread that renders JSON lines.
+    
+    Args:
+        level: Log level name (default from settings)
+        log_file: File to append to; empty logs to stdout (default from settings)
+    """
+    global _listener, DEBUG_ENABLED
+    
+    if _listener is not None:
+        return
+    
+    level = (level or settings.LOG_LEVEL).upper()
+    log_file = settings.LOG_FILE if log_file is None else log_file
+    level_no = logging.getLevelName(level)
+    DEBUG_ENABLED = level_no <= logging.DEBUG
+    
+    sink = logging.FileHandler(log_file) if log_file else logging.StreamHandler(sys.stdout)
+    sink.setFormatter(structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=[
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso")
+        ],
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.JSONRenderer(serializer=_orjson_serializer)
+        ]
+    ))
+    
+    log_queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.handlers = [_RecordQueueHandler(log_queue)]
+    root.setLevel(level_no)
+    
+    _listener = logging.handlers.QueueListener(log_queue, sink, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            # Tracebacks must be captured while still on the raising thread
+            structlog.processors.format_exc_info,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(level_no),
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        cache_logger_on_first_use=True
+    )
+
+
+# Usage example
+if __name__ == "__main__":
+    configure_logging()
+    
+    log = structlog.get_logger().bind(coin="BTC")
+    log.info("Fetched price", price=50000.0)
+    log.debug("Filtered out before any processor runs")
+    logging.getLogger("uvicorn").warning("Foreign stdlib record")
@@ -4,19 +4,33 @@ Main application with REST API and WebSocket support (v1.0.1)
 """
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from cachetools import TLRUCache, TTLCache
 import asyncio
-import json
-
-from config import settings, COIN_DISPLAY_NAMES, DEFAULT_USER_SETTINGS
-from models import init_db, get_db, UserSettings, TradeHistory
+import os
+import numpy as np
+import orjson
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings, COIN_DISPLAY_NAMES, DEFAULT_USER_SETTINGS, SUPPORTED_COIN_SET, TIMEFRAME_SET
+from models import init_db, get_db, async_engine, UserSettings, TradeHistory
 from prediction.prediction_engine import PredictionEngine
-from data.market_data_collector import MarketDataCollector
+from data.market_data_collector import MarketDataCollector, TIMEFRAME_MINUTES
+from data.historical_loader import HistoricalDataLoader
 from ml.model_trainer import MLModelTrainer
+from logging_config import configure_logging
+from build_kernels import build_kernels
 import structlog
 
+configure_logging()
 logger = structlog.get_logger()
 
 # Initialize FastAPI app
@@ -35,12 +49,130 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses (market data with indicators runs to tens of KB);
+# WebSocket frames are compressed by permessage-deflate instead
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
 # Initialize database
 init_db()
 
 # Global instances
 prediction_engine = None
-market_collector = None
+
+
+@lru_cache(maxsize=1)
+def get_collector() -> MarketDataCollector:
+    """Process-wide MarketDataCollector (one pooled exchange session)"""
+    return MarketDataCollector()
+
+
+@lru_cache(maxsize=1)
+def get_loader() -> HistoricalDataLoader:
+    """Process-wide HistoricalDataLoader for indicator computation"""
+    return HistoricalDataLoader()
+
+# Bounded pool for blocking prediction / market-data work, shared by all
+# requests and WebSocket clients instead of the default to_thread pool
+executor = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 4),
+    thread_name_prefix="moltbot-worker"
+)
+
+
+def frame_to_records(df: pd.DataFrame) -> List[Dict]:
+    """
+    Convert an OHLCV/indicator DataFrame to JSON-ready row dicts
+    
+    Works column-wise: datetimes become ISO strings in one vectorized pass and
+    every other column goes through ndarray.tolist() (native Python scalars in
+    C). NaN/inf are left as floats; orjson writes them as null, matching what
+    _clean_for_serialization produced row by row.
+    """
+    columns = []
+    for name in df.columns:
+        column = df[name]
+        if pd.api.types.is_datetime64_any_dtype(column):
+            values = column.to_numpy(dtype='datetime64[ns]')
+            if (values.astype(np.int64) % 1_000_000_000 != 0).any():
+                columns.append([ts.isoformat() for ts in column])
+            else:
+                columns.append(np.datetime_as_string(values, unit='s').tolist())
+        else:
+            columns.append(column.to_numpy().tolist())
+    
+    names = [str(name) for name in df.columns]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+async def run_blocking(func, *args):
+    """Run a blocking callable on the shared worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, func, *args)
+
+
+# Server-side response caches: every REST caller and WebSocket client asking
+# for the same coin/timeframe inside the TTL shares one computation
+PREDICTION_CACHE_TTL_SECONDS = 15
+MARKET_CACHE_MAX_TTL_SECONDS = 30
+_prediction_cache = TTLCache(maxsize=128, ttl=PREDICTION_CACHE_TTL_SECONDS)
+
+# WebSocket updates use predict()'s default threshold, same as REST callers
+# that do not pass one, so both share cache entries
+WS_MIN_CONFIDENCE = 60
+
+
+def _market_data_ttu(key, value, now):
+    """Expire market data after a quarter candle, between 1s and 30s"""
+    timeframe = key[2]
+    seconds = TIMEFRAME_MINUTES.get(timeframe, 1) * 60 / 4
+    return now + min(max(seconds, 1), MARKET_CACHE_MAX_TTL_SECONDS)
+
+
+_market_cache = TLRUCache(maxsize=256, ttu=_market_data_ttu)
+_inflight = {}
+
+
+async def cached_blocking(cache, key: tuple, func, *args):
+    """
+    Serve `func(*args)` from a TTL cache, computing it on the worker pool once
+    
+    Concurrent misses for the same key await a single in-flight computation.
+    None results and error predictions are not cached. Only touched from the
+    event loop thread, so no locking is needed.
+    """
+    if key in cache:
+        return cache[key]
+    
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(run_blocking(func, *args))
+        _inflight[key] = task
+        
+        def store(done):
+            _inflight.pop(key, None)
+            if done.cancelled() or done.exception() is not None:
+                return
+            result = done.result()
+            if result is not None and not (isinstance(result, dict) and 'error' in result):
+                cache[key] = result
+        
+        task.add_done_callback(store)
+    
+    # Shielded so one disconnecting waiter does not cancel the shared work
+    return await asyncio.shield(task)
+
+
+def build_market_data(coin: str, timeframe: str, limit: int, include_indicators: bool):
+    """OHLCV (plus indicators) as JSON-ready records, None if the fetch failed"""
+    df = get_collector().get_ohlcv(coin, timeframe, limit=limit)
+    
+    if df is None:
+        return None
+    
+    if include_indicators:
+        df = get_loader().add_technical_indicators(df)
+    
+    return frame_to_records(df)
 
 
 # Pydantic models for API
@@ -71,12 +203,42 @@ async def startup_event():
     logger.info("Starting MoltBot backend...")
     
     # Initialize global instances
-    market_collector = MarketDataCollector()
+    get_collector()
+    get_loader()
     prediction_engine = PredictionEngine()
     
+    # Prime the process-wide model cache so the first prediction is hot
+    await run_blocking(_warm_model_cache)
+    
+    # Load every Numba kernel from the on-disk cache (compiling any missing
+    # signature) now rather than on the first prediction
+    kernels = await run_blocking(build_kernels)
+    logger.info("Kernels loaded", signatures=kernels)
+    
     logger.info("MoltBot backend started successfully")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release the worker pool and database connections on shutdown"""
+    manager.close()
+    if prediction_engine is not None:
+        await run_blocking(prediction_engine.prediction_writer.close)
+    executor.shutdown(wait=False)
+    await async_engine.dispose()
+
+
+def _warm_model_cache():
+    """Load every coin/timeframe's models into the predictor cache"""
+    predictor = prediction_engine.ml_predictor
+    loaded = sum(
+        predictor.load_all_models(coin, timeframe)
+        for coin in settings.SUPPORTED_COINS
+        for timeframe in settings.TIMEFRAMES
+    )
+    logger.info("Model cache warmed", models=loaded)
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -147,8 +309,13 @@ async def get_config():
 # MARKET DATA ENDPOINTS
 # ----------------------------------------
 
-@app.get("/api/market-data/{coin}/{timeframe}")
-async def get_market_data(coin: str, timeframe: str, limit: int = 100, include_indicators: bool = True):
+@app.get("/api/market-data/{coin}/{timeframe}", response_class=ORJSONResponse)
+async def get_market_data(
+    coin: str,
+    timeframe: str,
+    limit: int = 100,
+    include_indicators: bool = True
+):
     """
     Get OHLCV market data for a coin
     
@@ -158,34 +325,26 @@ async def get_market_data(coin: str, timeframe: str, limit: int = 100, include_i
         limit: Number of candles (default 100)
         include_indicators: Whether to include technical indicators
     """
-    if coin not in settings.SUPPORTED_COINS:
+    if coin not in SUPPORTED_COIN_SET:
         raise HTTPException(status_code=400, detail=f"Unsupported coin: {coin}")
     
-    if timeframe not in settings.TIMEFRAMES:
+    if timeframe not in TIMEFRAME_SET:
         raise HTTPException(status_code=400, detail=f"Invalid timeframe: {timeframe}")
     
     try:
-        global market_collector
-        if not market_collector:
-            market_collector = MarketDataCollector()
-            
-        df = market_collector.get_ohlcv(coin, timeframe, limit=limit)
+        data = await cached_blocking(
+            _market_cache,
+            ('market', coin, timeframe, limit, include_indicators),
+            build_market_data,
+            coin,
+            timeframe,
+            limit,
+            include_indicators
+        )
         
-        if df is None:
+        if data is None:
             raise HTTPException(status_code=500, detail="Failed to fetch market data")
         
-        if include_indicators:
-            from data.historical_loader import HistoricalDataLoader
-            loader = HistoricalDataLoader()
-            df = loader.add_technical_indicators(df)
-        
-        # Convert DataFrame to list of dicts
-        data = df.to_dict('records')
-        
-        # Use prediction_engine's serialization helper
-        if prediction_engine:
-            data = prediction_engine._clean_for_serialization(data)
-        
         return {
             "coin": coin,
             "timeframe": timeframe,
@@ -199,13 +358,12 @@ async def get_market_data(coin: str, timeframe: str, limit: int = 100, include_i
 
 
 @app.get("/api/current-price/{coin}")
-async def get_current_price(coin: str):
+async def get_current_price(coin: str, collector: MarketDataCollector = Depends(get_collector)):
     """Get current price for a coin"""
-    if coin not in settings.SUPPORTED_COINS:
+    if coin not in SUPPORTED_COIN_SET:
         raise HTTPException(status_code=400, detail=f"Unsupported coin: {coin}")
     
     try:
-        collector = MarketDataCollector()
         price = collector.get_current_price(coin)
         
         if price is None:
@@ -226,7 +384,7 @@ async def get_current_price(coin: str):
 # PREDICTION ENDPOINTS
 # ----------------------------------------
 
-@app.post("/api/prediction")
+@app.post("/api/prediction", response_class=ORJSONResponse)
 async def create_prediction(request: PredictionRequest):
     """
     Generate prediction for a coin/timeframe
@@ -234,17 +392,21 @@ async def create_prediction(request: PredictionRequest):
     Args:
         request: Prediction request with coin, timeframe, min_confidence
     """
-    if request.coin not in settings.SUPPORTED_COINS:
+    if request.coin not in SUPPORTED_COIN_SET:
         raise HTTPException(status_code=400, detail=f"Unsupported coin: {request.coin}")
     
-    if request.timeframe not in settings.TIMEFRAMES:
+    if request.timeframe not in TIMEFRAME_SET:
         raise HTTPException(status_code=400, detail=f"Invalid timeframe: {request.timeframe}")
     
     try:
         if prediction_engine is None:
             raise HTTPException(status_code=500, detail="Prediction engine not initialized")
         
-        prediction = prediction_engine.predict(
+        # Off the event loop (and shared with WebSocket clients via the cache)
+        prediction = await cached_blocking(
+            _prediction_cache,
+            ('prediction', request.coin, request.timeframe, request.min_confidence),
+            prediction_engine.predict,
             request.coin,
             request.timeframe,
             request.min_confidence
@@ -255,14 +417,16 @@ async def create_prediction(request: PredictionRequest):
         if isinstance(prediction, dict):
              logger.info("Prediction keys", keys=list(prediction.keys()))
         
-        return prediction
+        # predict() output is already JSON-ready; returning the response
+        # directly skips FastAPI's jsonable_encoder pass over the payload
+        return ORJSONResponse(prediction)
     
     except Exception as e:
         logger.error("Error generating prediction", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/prediction/{coin}/{timeframe}")
+@app.get("/api/prediction/{coin}/{timeframe}", response_class=ORJSONResponse)
 async def get_prediction(coin: str, timeframe: str, min_confidence: int = 60):
     """Get prediction for a coin/timeframe (GET version)"""
     request = PredictionRequest(coin=coin, timeframe=timeframe, min_confidence=min_confidence)
@@ -274,10 +438,12 @@ async def get_prediction(coin: str, timeframe: str, min_confidence: int = 60):
 # ----------------------------------------
 
 @app.get("/api/settings")
-async def get_user_settings(db=Depends(get_db)):
+async def get_user_settings(db: AsyncSession = Depends(get_db)):
     """Get user settings"""
     try:
-        settings_obj = db.query(UserSettings).filter(UserSettings.user_id == "default").first()
+        settings_obj = await db.scalar(
+            select(UserSettings).where(UserSettings.user_id == "default").limit(1)
+        )
         
         if not settings_obj:
             # Create default settings
@@ -286,8 +452,8 @@ async def get_user_settings(db=Depends(get_db)):
                 **DEFAULT_USER_SETTINGS
             )
             db.add(settings_obj)
-            db.commit()
-            db.refresh(settings_obj)
+            await db.commit()
+            await db.refresh(settings_obj)
         
         return {
             "mode": settings_obj.mode,
@@ -304,10 +470,12 @@ async def get_user_settings(db=Depends(get_db)):
 
 
 @app.post("/api/settings")
-async def update_user_settings(update: UserSettingsUpdate, db=Depends(get_db)):
+async def update_user_settings(update: UserSettingsUpdate, db: AsyncSession = Depends(get_db)):
     """Update user settings"""
     try:
-        settings_obj = db.query(UserSettings).filter(UserSettings.user_id == "default").first()
+        settings_obj = await db.scalar(
+            select(UserSettings).where(UserSettings.user_id == "default").limit(1)
+        )
         
         if not settings_obj:
             settings_obj = UserSettings(user_id="default", **DEFAULT_USER_SETTINGS)
@@ -327,14 +495,13 @@ async def update_user_settings(update: UserSettingsUpdate, db=Depends(get_db)):
         if update.enabled_strategies:
             settings_obj.enabled_strategies = update.enabled_strategies
         
-        db.commit()
-        db.refresh(settings_obj)
+        await db.commit()
         
         return {"status": "success", "message": "Settings updated"}
     
     except Exception as e:
         logger.error("Error updating settings", error=str(e))
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -342,27 +509,34 @@ async def update_user_settings(update: UserSettingsUpdate, db=Depends(get_db)):
 # TRADE HISTORY ENDPOINTS
 # ----------------------------------------
 
-@app.get("/api/trade-history")
-async def get_trade_history(limit: int = 50, db=Depends(get_db)):
-    """Get trade history"""
+# Columns returned by /api/trade-history, in response order
+TRADE_HISTORY_COLUMNS = (
+    TradeHistory.id,
+    TradeHistory.timestamp,
+    TradeHistory.coin,
+    TradeHistory.signal,
+    TradeHistory.confidence,
+    TradeHistory.entry_price,
+    TradeHistory.target_price,
+    TradeHistory.status,
+    TradeHistory.profit_loss
+)
+
+
+@app.get("/api/trade-history", response_class=ORJSONResponse)
+async def get_trade_history(limit: int = 50, offset: int = 0, db: AsyncSession = Depends(get_db)):
+    """Get trade history, newest first (page with limit/offset)"""
     try:
-        trades = db.query(TradeHistory).order_by(
+        # Plain column tuples instead of hydrated ORM objects; orjson writes
+        # the datetimes as ISO strings
+        stmt = select(*TRADE_HISTORY_COLUMNS).order_by(
             TradeHistory.timestamp.desc()
-        ).limit(limit).all()
+        ).limit(limit).offset(offset)
+        rows = (await db.execute(stmt)).mappings().all()
         
-        history = [{
-            "id": t.id,
-            "timestamp": t.timestamp.isoformat(),
-            "coin": t.coin,
-            "signal": t.signal,
-            "confidence": t.confidence,
-            "entry_price": t.entry_price,
-            "target_price": t.target_price,
-            "status": t.status,
-            "profit_loss": t.profit_loss
-        } for t in trades]
+        history = [dict(row) for row in rows]
         
-        return {"trades": history, "count": len(history)}
+        return ORJSONResponse({"trades": history, "count": len(history)})
     
     except Exception as e:
         logger.error("Error fetching trade history", error=str(e))
@@ -376,7 +550,7 @@ async def get_trade_history(limit: int = 50, db=Depends(get_db)):
 @app.post("/api/train-models")
 async def train_models(coin: str, timeframe: str):
     """Train ML models for a coin/timeframe"""
-    if coin not in settings.SUPPORTED_COINS:
+    if coin not in SUPPORTED_COIN_SET:
         raise HTTPException(status_code=400, detail=f"Unsupported coin: {coin}")
     
     try:
@@ -386,6 +560,11 @@ async def train_models(coin: str, timeframe: str):
         if results is None:
             raise HTTPException(status_code=500, detail="Training failed")
         
+        # Stop serving results computed with the previous models
+        if prediction_engine is not None:
+            prediction_engine.clear_analysis_cache()
+        _prediction_cache.clear()
+        
         return {
             "status": "success",
             "coin": coin,
@@ -405,27 +584,165 @@ async def train_models(coin: str, timeframe: str):
 # WEBSOCKET FOR REAL-TIME UPDATES
 # ----------------------------------------
 
+# WebSocket clients are grouped by (coin, timeframe) topic; one shared ticker
+# builds each topic's update once and sends it to every subscriber
+WS_UPDATE_INTERVAL_SECONDS = 10
+WS_SEND_TIMEOUT_SECONDS = 5
+WS_DEFAULT_TOPIC = ('BTC', '1h')
+
+
+async def build_topic_payload(coin: str, timeframe: str) -> Optional[str]:
+    """Encode one full_update frame for a topic, None if there is nothing to send"""
+    logger.info("Executing WebSocket full update", coin=coin, timeframe=timeframe)
+    if not prediction_engine:
+        return None
+    
+    try:
+        # Prediction and Market Data run concurrently on the worker
+        # pool, or come from the caches REST callers already filled
+        prediction, market_data = await asyncio.gather(
+            cached_blocking(
+                _prediction_cache,
+                ('prediction', coin, timeframe, WS_MIN_CONFIDENCE),
+                prediction_engine.predict,
+                coin,
+                timeframe,
+                WS_MIN_CONFIDENCE
+            ),
+            cached_blocking(
+                _market_cache,
+                ('market', coin, timeframe, 100, True),
+                build_market_data,
+                coin,
+                timeframe,
+                100,
+                True
+            )
+        )
+        
+        if not market_data:
+            return None
+        
+        # predict() already returns a serialization-cleaned dict
+        combined_payload = {
+            "type": "full_update",
+            "coin": coin,
+            "timeframe": timeframe,
+            "prediction": prediction,
+            "market_data": market_data
+        }
+        # Force serialization of any remaining complex types (like Timestamps)
+        json_payload = orjson.dumps(
+            combined_payload,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+        # Text frame: the frontend JSON.parse()s event.data, which a binary
+        # frame would deliver as a Blob
+        return json_payload.decode()
+    
+    except Exception as e:
+        import traceback
+        logger.error("Error in WebSocket update", error=str(e), traceback=traceback.format_exc())
+        return None
+
+
 class ConnectionManager:
-    """Manages WebSocket connections"""
+    """Manages WebSocket connections and their topic subscriptions"""
     
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
+        self.subscriptions: Dict[Tuple[str, str], Set[WebSocket]] = {}
+        self.topics: Dict[WebSocket, Tuple[str, str]] = {}
+        self.ticker: Optional[asyncio.Task] = None
     
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
         logger.info("WebSocket connected", total=len(self.active_connections))
     
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        # Sets and dicts throughout, so a disconnect storm stays O(1) each
+        self._unsubscribe(websocket)
+        self.active_connections.discard(websocket)
         logger.info("WebSocket disconnected", total=len(self.active_connections))
     
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
+    async def subscribe(self, websocket: WebSocket, topic: Tuple[str, str]):
+        """Move a connection to a topic and send it the current update"""
+        if self.topics.get(websocket) != topic:
+            self._unsubscribe(websocket)
+            self.topics[websocket] = topic
+            self.subscriptions.setdefault(topic, set()).add(websocket)
+            
+            if self.ticker is None or self.ticker.done():
+                self.ticker = asyncio.create_task(self._tick())
+        
+        # Immediate update for this client only; usually a cache hit
+        payload = await build_topic_payload(*topic)
+        if payload is not None and self.topics.get(websocket) == topic:
             try:
-                await connection.send_json(message)
-            except:
-                pass
+                await self._send(websocket, payload)
+            except Exception as e:
+                self._drop(websocket, e)
+    
+    def _unsubscribe(self, websocket: WebSocket):
+        topic = self.topics.pop(websocket, None)
+        if topic is None:
+            return
+        
+        subscribers = self.subscriptions.get(topic)
+        if subscribers is not None:
+            subscribers.discard(websocket)
+            if not subscribers:
+                del self.subscriptions[topic]
+    
+    async def _tick(self):
+        """Every interval, publish all subscribed topics; exits once none remain"""
+        while self.subscriptions:
+            await asyncio.sleep(WS_UPDATE_INTERVAL_SECONDS)
+            await asyncio.gather(*(self._publish(topic) for topic in list(self.subscriptions)))
+    
+    async def _publish(self, topic: Tuple[str, str]):
+        """Build one payload for a topic and broadcast it"""
+        payload = await build_topic_payload(*topic)
+        if payload is not None and self.subscriptions.get(topic):
+            await self.broadcast(topic, payload)
+    
+    def close(self):
+        """Stop the ticker (application shutdown)"""
+        if self.ticker is not None:
+            self.ticker.cancel()
+    
+    async def broadcast(self, topic: Tuple[str, str], payload: str):
+        """Send one pre-encoded payload to every subscriber of a topic concurrently"""
+        subscribers = list(self.subscriptions.get(topic, ()))
+        results = await asyncio.gather(
+            *(self._send(ws, payload) for ws in subscribers),
+            return_exceptions=True
+        )
+        
+        # Prune sockets whose send failed or stalled
+        for websocket, result in zip(subscribers, results):
+            if isinstance(result, Exception):
+                self._drop(websocket, result)
+    
+    async def _send(self, websocket: WebSocket, payload: str):
+        # Bounded, so one stalled client cannot hold up the tick
+        await asyncio.wait_for(websocket.send_text(payload), WS_SEND_TIMEOUT_SECONDS)
+    
+    def _drop(self, websocket: WebSocket, error: Exception):
+        """Disconnect a socket that failed a send and close it in the background"""
+        logger.warning("Dropping WebSocket after failed send", error=repr(error))
+        self.disconnect(websocket)
+        asyncio.ensure_future(self._close(websocket))
+    
+    @staticmethod
+    async def _close(websocket: WebSocket):
+        try:
+            await asyncio.wait_for(websocket.close(), WS_SEND_TIMEOUT_SECONDS)
+        except Exception:
+            # Already gone; nothing left to release
+            pass
 
 
 manager = ConnectionManager()
@@ -436,92 +753,43 @@ async def websocket_market(websocket: WebSocket):
     """WebSocket endpoint for real-time market updates"""
     await manager.connect(websocket)
     
-    current_coin = 'BTC'
-    current_timeframe = '1h'
-    
-    # Task to listen for client messages
-    async def listen_for_messages():
-        nonlocal current_coin, current_timeframe
-        try:
-            while True:
-                data = await websocket.receive_json()
-                if 'coin' in data:
-                    current_coin = data['coin']
-                if 'timeframe' in data:
-                    current_timeframe = data['timeframe']
-                logger.info("WebSocket subscription updated", coin=current_coin, timeframe=current_timeframe)
-                # Send immediate update on change
-                await send_full_update()
-        except:
-            pass
-
-    async def send_full_update():
-        logger.info("Executing WebSocket full update", coin=current_coin, timeframe=current_timeframe)
-        if prediction_engine:
-            try:
-                # 1. Get Prediction (Run in thread to avoid blocking loop)
-                prediction = await asyncio.to_thread(prediction_engine.predict, current_coin, current_timeframe)
-                
-                # 2. Get Market Data (Run in thread to avoid blocking loop)
-                def fetch_data():
-                    global market_collector
-                    if not market_collector:
-                        market_collector = MarketDataCollector()
-                        
-                    df = market_collector.get_ohlcv(current_coin, current_timeframe, limit=100)
-                    if df is not None:
-                        from data.historical_loader import HistoricalDataLoader
-                        loader = HistoricalDataLoader()
-                        df = loader.add_technical_indicators(df)
-                        market_data = df.to_dict('records')
-                        
-                        # Clean for serialization
-                        if prediction_engine:
-                            market_data = prediction_engine._clean_for_serialization(market_data)
-                        return market_data
-                    return None
-
-                market_data = await asyncio.to_thread(fetch_data)
-                
-                if market_data:
-                    # Clean prediction for serialization
-                    if prediction_engine:
-                        prediction = prediction_engine._clean_for_serialization(prediction)
-                        
-                    combined_payload = {
-                        "type": "full_update",
-                        "coin": current_coin,
-                        "timeframe": current_timeframe,
-                        "prediction": prediction,
-                        "market_data": market_data
-                    }
-                    # Force serialization of any remaining complex types (like Timestamps)
-                    import json
-                    json_payload = json.dumps(combined_payload, default=str)
-                    await websocket.send_text(json_payload)
-            except Exception as e:
-                import traceback
-                logger.error("Error in WebSocket update", error=str(e), traceback=traceback.format_exc())
-
-    # Start listener task
-    listener_task = asyncio.create_task(listen_for_messages())
-    
     try:
-        # Initial update
-        await send_full_update()
+        # Initial subscription
+        coin, timeframe = WS_DEFAULT_TOPIC
+        await manager.subscribe(websocket, (coin, timeframe))
         
+        # Listen for subscription changes; periodic updates come from the
+        # manager's shared ticker
         while True:
-            # Send periodical update every 10 seconds
-            await asyncio.sleep(10)
-            await send_full_update()
+            data = await websocket.receive_json()
+            if not isinstance(data, dict):
+                data = {}
+            new_coin = data.get('coin', coin)
+            new_timeframe = data.get('timeframe', timeframe)
+            
+            # Reject unknown topics before they reach the shared ticker; the
+            # isinstance checks keep unhashable JSON values out of the sets
+            error = None
+            if not isinstance(new_coin, str) or new_coin not in SUPPORTED_COIN_SET:
+                error = f"Unsupported coin: {new_coin}"
+            elif not isinstance(new_timeframe, str) or new_timeframe not in TIMEFRAME_SET:
+                error = f"Invalid timeframe: {new_timeframe}"
+            if error is not None:
+                logger.warning("WebSocket subscription rejected", error=error)
+                await websocket.send_json({"type": "error", "detail": error})
+                continue
+            
+            coin, timeframe = new_coin, new_timeframe
+            logger.info("WebSocket subscription updated", coin=coin, timeframe=timeframe)
+            # Send immediate update on change
+            await manager.subscribe(websocket, (coin, timeframe))
             
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
+        pass
     except Exception as e:
         logger.error("WebSocket error", error=str(e))
-        manager.disconnect(websocket)
     finally:
-        listener_task.cancel()
+        manager.disconnect(websocket)
 
 
 # ----------------------------------------
@@ -529,12 +797,28 @@ async def websocket_market(websocket: WebSocket):
 # ----------------------------------------
 
 if __name__ == "__main__":
-    import os
+    import importlib.util
+    import uvicorn
     port = int(os.environ.get("PORT", 8000))
+    
+    # uvicorn[standard] ships the C event loop and HTTP parser; fall back to
+    # the pure-Python ones where they cannot be installed (e.g. Windows)
+    has_uvloop = importlib.util.find_spec("uvloop") is not None
+    has_httptools = importlib.util.find_spec("httptools") is not None
+    
+    # Each worker is a separate process with its own caches, models and
+    # WebSocket topics, so more than one is opt-in (WORKERS). reload is
+    # dev-only and runs a single process
+    workers = 1 if settings.DEBUG else max(1, settings.WORKERS)
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=port,
         reload=settings.DEBUG,
-        log_level="info"
+        workers=workers,
+        log_level="info",
+        loop="uvloop" if has_uvloop else "asyncio",
+        http="httptools" if has_httptools else "h11",
+        ws_per_message_deflate=True
     )
@@ -0,0 +1,67 @@
+"""
+Forest Inference Kernels
+Numba-compiled traversal of tree ensembles flattened into node arrays
+
+All trees share one set of node arrays; `roots` holds each tree's first node
+and child indices are absolute. Random forest splits compare the float32
+feature value against the float64 threshold (`<=` goes left) and class
+probabilities are summed tree by tree, exactly like sklearn's sequential
+predict_proba. Boosted trees follow XGBoost instead: float32 thresholds,
+`<` goes left, NaN takes the stored default branch, and leaf values are
+added in float32 onto the base margin one tree after another.
+"""
+import numpy as np
+from _njit import njit
+
+
+@njit(cache=True)
+def forest_proba_njit(X, roots, left, right, feature, threshold, leaf_proba):
+    """Mean class probabilities over all trees for each row of X"""
+    n_rows = X.shape[0]
+    n_trees = roots.shape[0]
+    n_classes = leaf_proba.shape[1]
+    out = np.zeros((n_rows, n_classes))
+
+    for i in range(n_rows):
+        for t in range(n_trees):
+            node = roots[t]
+            while left[node] != -1:
+                if X[i, feature[node]] <= threshold[node]:
+                    node = left[node]
+                else:
+                    node = right[node]
+
+            for k in range(n_classes):
+                out[i, k] += leaf_proba[node, k]
+
+        for k in range(n_classes):
+            out[i, k] /= n_trees
+
+    return out
+
+
+@njit(cache=True)
+def booster_margin_njit(X, roots, left, right, default_left, feature, threshold, base_margin):
+    """Raw (pre-sigmoid) margin of a binary gradient-boosted ensemble per row of X"""
+    n_rows = X.shape[0]
+    n_trees = roots.shape[0]
+    out = np.empty(n_rows, dtype=np.float32)
+    
+    for i in range(n_rows):
+        margin = base_margin
+        for t in range(n_trees):
+            node = roots[t]
+            while left[node] != -1:
+                value = X[i, feature[node]]
+                if np.isnan(value):
+                    go_left = default_left[node]
+                else:
+                    go_left = value < threshold[node]
+                node = left[node] if go_left else right[node]
+            
+            # Leaves keep their value in the threshold slot, as in XGBoost
+            margin += threshold[node]
+        
+        out[i] = margin
+    
+    return out
@@ -5,13 +5,383 @@ Loads trained models and makes predictions
 import pandas as pd
 import numpy as np
 import joblib
+import json
 import os
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from data.historical_loader import HistoricalDataLoader
+from ml._forest_njit import forest_proba_njit, booster_margin_njit
+import logging_config
 import structlog
 
 logger = structlog.get_logger()
 
+# sklearn, SciPy and XGBoost are imported where a model needs them: loading
+# a pickled model imports its library anyway, and importing this module
+# (e.g. for MODEL_NAMES) stays cheap
+if TYPE_CHECKING:
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import StandardScaler
+    from xgboost import XGBClassifier
+
+# Models served for every coin/timeframe
+MODEL_NAMES = ['logistic_regression', 'random_forest', 'xgboost']
+
+# Only the linear model is trained on standardized features; the tree
+# ensembles are split-based, hence scale-invariant, and fit on raw features
+SCALED_MODELS = frozenset({'logistic_regression'})
+
+# Below this many predictions a plain loop beats NumPy's array setup cost
+VECTORIZE_MIN_PREDICTIONS = 8
+
+
+class CompiledForest:
+    """
+    RandomForestClassifier flattened for the compiled traversal kernel
+    
+    sklearn walks its trees through joblib one Python call per tree; here all
+    nodes live in shared arrays and one kernel call scores every tree.
+    Probabilities are identical to the wrapped model's. Rows with NaNs go to
+    the wrapped model, whose missing-value routing the kernel does not copy.
+    """
+    
+    def __init__(self, model: 'RandomForestClassifier'):
+        self.model = model
+        self.classes_ = model.classes_
+        self.n_features_in_ = model.n_features_in_
+        
+        roots, left, right, feature, threshold, leaf_proba = [], [], [], [], [], []
+        offset = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left == -1
+            
+            roots.append(offset)
+            left.append(np.where(is_leaf, -1, tree.children_left + offset))
+            right.append(np.where(is_leaf, -1, tree.children_right + offset))
+            feature.append(tree.feature)
+            threshold.append(tree.threshold)
+            leaf_proba.append(self._leaf_proba(tree.value[:, 0, :model.n_classes_]))
+            offset += tree.node_count
+        
+        self.roots = np.asarray(roots, dtype=np.int64)
+        self.left = np.concatenate(left).astype(np.int64)
+        self.right = np.concatenate(right).astype(np.int64)
+        self.feature = np.concatenate(feature).astype(np.int64)
+        self.threshold = np.concatenate(threshold).astype(np.float64)
+        self.leaf_proba = np.ascontiguousarray(np.concatenate(leaf_proba), dtype=np.float64)
+    
+    @staticmethod
+    def _leaf_proba(value: np.ndarray) -> np.ndarray:
+        """Per-node class probabilities as sklearn's tree predict_proba gives them"""
+        totals = value.sum(axis=1)
+        if np.allclose(totals, 1.0):
+            # scikit-learn >= 1.4 already stores class fractions
+            return value
+        
+        # Older releases store counts and normalize at predict time
+        totals[totals == 0.0] = 1.0
+        return value / totals[:, None]
+    
+    @classmethod
+    def supports(cls, model: Any) -> bool:
+        """Single-output random forests are compiled; anything else is served as-is"""
+        from sklearn.ensemble import RandomForestClassifier
+        
+        return isinstance(model, RandomForestClassifier) and getattr(model, 'n_outputs_', 1) == 1
+    
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_ or np.isnan(X).any():
+            return self.model.predict_proba(X)
+        
+        return forest_proba_njit(
+            X, self.roots, self.left, self.right, self.feature, self.threshold, self.leaf_proba
+        )
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class CompiledLinear:
+    """
+    Binary LogisticRegression with its StandardScaler, served in plain NumPy
+    
+    Performs the same float64 operations as scaler.transform followed by
+    predict_proba (subtract mean, divide by scale, dot with the coefficients,
+    expit), without sklearn's per-call input validation on either object.
+    Inputs that are malformed or contain NaNs go through sklearn, so they
+    fail the way they always did.
+    """
+    
+    def __init__(self, model: 'LogisticRegression', scaler: Optional['StandardScaler']):
+        from scipy.special import expit
+        
+        self.model = model
+        self.scaler = scaler
+        self.classes_ = model.classes_
+        self.n_features_in_ = model.n_features_in_
+        
+        self.mean = scaler.mean_ if scaler is not None else None
+        self.scale = scaler.scale_ if scaler is not None else None
+        self.coef_T = model.coef_.T
+        self.intercept = model.intercept_
+        self._expit = expit
+    
+    @classmethod
+    def supports(cls, model: Any, scaler: Any) -> bool:
+        """Binary models with no scaler or a fitted mean/std scaler are compiled"""
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.preprocessing import StandardScaler
+        
+        if not isinstance(model, LogisticRegression) or len(getattr(model, 'classes_', ())) != 2:
+            return False
+        if scaler is None:
+            return True
+        return (
+            isinstance(scaler, StandardScaler)
+            and getattr(scaler, 'mean_', None) is not None
+            and getattr(scaler, 'scale_', None) is not None
+        )
+    
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_ or X.dtype != np.float64 or np.isnan(X).any():
+            if self.scaler is not None:
+                X = self.scaler.transform(X)
+            return self.model.predict_proba(X)
+        
+        if self.mean is not None:
+            X = X - self.mean
+            X /= self.scale
+        
+        prob = (X @ self.coef_T + self.intercept).reshape(-1)
+        prob = self._expit(prob, out=prob)
+        return np.stack([1 - prob, prob], axis=1)
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class CompiledBooster:
+    """
+    Binary XGBClassifier flattened for the compiled traversal kernel
+    
+    The booster's JSON dump is copied into shared node arrays (trees up to
+    best_iteration when early stopping picked one) and one kernel call adds
+    up the leaf margins. A self-check against predict_proba at build time
+    guards against dump-format changes between XGBoost releases; a model
+    that fails it is served as-is.
+    """
+    
+    # Probe rows scored by both paths when a booster is compiled
+    SELF_CHECK_ROWS = 64
+    
+    def __init__(self, model: 'XGBClassifier'):
+        from scipy.special import expit
+        
+        self.model = model
+        self.classes_ = model.classes_
+        self.n_features_in_ = model.n_features_in_
+        self._expit = expit
+        
+        booster = model.get_booster()
+        learner = json.loads(booster.save_raw('json'))['learner']
+        trees = learner['gradient_booster']['model']['trees']
+        
+        best_iteration = booster.attr('best_iteration')
+        if best_iteration is not None:
+            trees = trees[:int(best_iteration) + 1]
+        
+        roots, left, right, default_left, feature, threshold = [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            children_left = np.asarray(tree['left_children'], dtype=np.int64)
+            is_leaf = children_left == -1
+            
+            roots.append(offset)
+            left.append(np.where(is_leaf, -1, children_left + offset))
+            right.append(np.where(is_leaf, -1, np.asarray(tree['right_children'], dtype=np.int64) + offset))
+            default_left.append(np.asarray(tree['default_left'], dtype=np.bool_))
+            feature.append(np.asarray(tree['split_indices'], dtype=np.int64))
+            threshold.append(np.asarray(tree['split_conditions'], dtype=np.float32))
+            offset += len(children_left)
+        
+        self.roots = np.asarray(roots, dtype=np.int64)
+        self.left = np.concatenate(left)
+        self.right = np.concatenate(right)
+        self.default_left = np.concatenate(default_left)
+        self.feature = np.concatenate(feature)
+        self.threshold = np.concatenate(threshold)
+        
+        # base_score is stored as a probability ("[p]" on newer releases);
+        # the trees add onto its logit
+        base_score = np.float32(learner['learner_model_param']['base_score'].strip('[]'))
+        self.base_margin = np.float32(-np.log(np.float32(1.0) / base_score - np.float32(1.0)))
+        
+        self.verified = self._self_check()
+    
+    @classmethod
+    def supports(cls, model: Any) -> bool:
+        """Plain binary:logistic gbtree models without categorical splits are compiled"""
+        from xgboost import XGBClassifier
+        
+        if not isinstance(model, XGBClassifier) or getattr(model, 'n_classes_', 0) != 2:
+            return False
+        
+        try:
+            learner = json.loads(model.get_booster().save_raw('json'))['learner']
+            gbm = learner['gradient_booster']
+            trees = gbm['model']['trees']
+        except Exception:
+            return False
+        
+        missing = model.missing
+        return (
+            gbm.get('name') == 'gbtree'
+            and learner['objective']['name'] == 'binary:logistic'
+            and int(gbm['model']['gbtree_model_param'].get('num_parallel_tree', 1)) == 1
+            and (missing is None or np.isnan(missing))
+            and not any(any(tree.get('split_type', ())) for tree in trees)
+        )
+    
+    def _self_check(self) -> bool:
+        """Compare kernel and XGBoost probabilities on rows spanning the splits"""
+        is_split = self.left != -1
+        low = np.zeros(self.n_features_in_, dtype=np.float32)
+        high = np.ones(self.n_features_in_, dtype=np.float32)
+        for j in range(self.n_features_in_):
+            cuts = self.threshold[is_split & (self.feature == j)]
+            if len(cuts):
+                low[j], high[j] = cuts.min() - 1, cuts.max() + 1
+        
+        rng = np.random.default_rng(0)
+        X = rng.uniform(low, high, size=(self.SELF_CHECK_ROWS, self.n_features_in_)).astype(np.float32)
+        X[::8, ::3] = np.nan
+        
+        try:
+            return bool(np.allclose(self._predict_proba(X), self.model.predict_proba(X), rtol=0, atol=1e-6))
+        except Exception:
+            return False
+    
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        margin = booster_margin_njit(
+            X, self.roots, self.left, self.right, self.default_left,
+            self.feature, self.threshold, self.base_margin
+        )
+        prob = self._expit(margin)
+        return np.stack([1.0 - prob, prob], axis=1)
+    
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            return self.model.predict_proba(X)
+        
+        return self._predict_proba(X)
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def make_standard_scaler(mean: np.ndarray, scale: np.ndarray) -> 'StandardScaler':
+    """Fitted StandardScaler rebuilt from saved column means and scales"""
+    from sklearn.preprocessing import StandardScaler
+    
+    scaler = StandardScaler()
+    scaler.mean_ = np.asarray(mean, dtype=np.float64)
+    scaler.scale_ = np.asarray(scale, dtype=np.float64)
+    scaler.var_ = scaler.scale_ ** 2
+    scaler.n_features_in_ = len(scaler.mean_)
+    return scaler
+
+
+@lru_cache(maxsize=64)
+def _load_scaler(path: str) -> 'StandardScaler':
+    """Load a scaler saved as mean/scale arrays (.npz) or a pickle"""
+    if path.endswith('.npz'):
+        with np.load(path) as arrays:
+            return make_standard_scaler(arrays['mean'], arrays['scale'])
+    return _load_pickle(path)
+
+
+@lru_cache(maxsize=64)
+def _load_pickle(path: str) -> Any:
+    """Unpickle a model artifact once per process; generic files are shared"""
+    return joblib.load(path)
+
+
+@lru_cache(maxsize=64)
+def _load_estimator(path: str) -> Any:
+    """Load a model for serving, compiling tree ensembles for the kernels"""
+    model = _load_pickle(path)
+    if CompiledForest.supports(model):
+        return CompiledForest(model)
+    if CompiledBooster.supports(model):
+        compiled = CompiledBooster(model)
+        if compiled.verified:
+            return compiled
+        logger.warning("Booster self-check failed; serving it uncompiled", path=path)
+    return model
+
+
+@lru_cache(maxsize=1024)
+def _load_model_and_scaler(
+    model_dir: str,
+    model_name: str,
+    coin: Optional[str],
+    timeframe: Optional[str]
+) -> Tuple[Any, Any]:
+    """
+    Resolve and load a model and its scaler, falling back to generic artifacts
+    
+    Cached per (model_dir, model_name, coin, timeframe), so path resolution
+    and unpickling happen once per process. Load errors propagate and are not
+    cached.
+    
+    Returns:
+        (model, scaler) tuple; (None, None) if no model file exists
+    """
+    suffix = f"_{coin}_{timeframe}" if coin and timeframe else ""
+    
+    model_path = os.path.join(model_dir, f'{model_name}{suffix}.pkl')
+    
+    # Fallback to generic if specific not found
+    if not os.path.exists(model_path):
+        model_path = os.path.join(model_dir, f'{model_name}.pkl')
+    
+    if not os.path.exists(model_path):
+        return None, None
+    
+    if model_name not in SCALED_MODELS:
+        return _load_estimator(model_path), None
+    
+    # Load scaler if exists
+    scaler_name = 'scaler_lr' if model_name == 'logistic_regression' else f'scaler_{model_name}'
+    # Arrays (.npz, current trainer) win over pickled scalers (older runs)
+    candidates = [
+        os.path.join(model_dir, f'{scaler_name}{name_suffix}{ext}')
+        for name_suffix in ([suffix, ""] if suffix else [""])
+        for ext in ('.npz', '.pkl')
+    ]
+    scaler_path = next((path for path in candidates if os.path.exists(path)), None)
+    
+    scaler = _load_scaler(scaler_path) if scaler_path else None
+    model = _load_estimator(model_path)
+    
+    # The scaler is folded into the compiled linear model
+    if CompiledLinear.supports(model, scaler):
+        return CompiledLinear(model, scaler), None
+    return model, scaler
+
+
+def clear_model_cache():
+    """Drop cached models so freshly trained artifacts are picked up"""
+    _load_model_and_scaler.cache_clear()
+    _load_estimator.cache_clear()
+    _load_scaler.cache_clear()
+    _load_pickle.cache_clear()
+
 
 class MLModelPredictor:
     """Makes predictions using trained ML models"""
@@ -25,14 +395,17 @@ class MLModelPredictor:
         """
         self.model_dir = model_dir
         self.loader = HistoricalDataLoader()
-        self.models = {}
-        self.scalers = {}
+        
+        # Feature list is static; the usable subset only depends on which
+        # columns a frame has, so it is resolved once per column set
+        self.feature_cols = self.loader.get_feature_columns()
+        self._col_cache: Dict[frozenset, List[str]] = {}
         
         logger.info("MLModelPredictor initialized")
     
     def load_model(self, model_name: str, coin: str = None, timeframe: str = None) -> bool:
         """
-        Load a trained model
+        Load a trained model into the process-wide model cache
         
         Args:
             model_name: Name of model to load (e.g., 'logistic_regression')
@@ -42,52 +415,34 @@ class MLModelPredictor:
         Returns:
             True if successful
         """
-        try:
-            suffix = f"_{coin}_{timeframe}" if coin and timeframe else ""
-            key = f"{model_name}{suffix}"
-            
-            # Cache check
-            if key in self.models:
-                return True
-                
-            model_path = os.path.join(self.model_dir, f'{model_name}{suffix}.pkl')
-            
-            # Fallback to generic if specific not found
-            if not os.path.exists(model_path):
-                model_path = os.path.join(self.model_dir, f'{model_name}.pkl')
-            
-            if not os.path.exists(model_path):
-                logger.warning(f"Model not found: {model_name}{suffix}")
-                return False
-            
-            # Load and cache
-            self.models[key] = joblib.load(model_path)
-            
-            # Load scaler if exists
-            scaler_name = 'scaler_lr' if model_name == 'logistic_regression' else f'scaler_{model_name}'
-            scaler_path = os.path.join(self.model_dir, f'{scaler_name}{suffix}.pkl')
-            
-            if not os.path.exists(scaler_path):
-                scaler_path = os.path.join(self.model_dir, f'{scaler_name}.pkl')
-                
-            if os.path.exists(scaler_path):
-                self.scalers[key] = joblib.load(scaler_path)
-            
-            logger.info(f"Loaded model: {key}")
-            return True
+        return self._get_model(model_name, coin, timeframe)[0] is not None
+    
+    def _get_model(
+        self,
+        model_name: str,
+        coin: str = None,
+        timeframe: str = None
+    ) -> Tuple[Any, Any]:
+        """Cached (model, scaler) for a coin/timeframe, (None, None) if unavailable"""
+        suffix = f"_{coin}_{timeframe}" if coin and timeframe else ""
         
+        try:
+            model, scaler = _load_model_and_scaler(self.model_dir, model_name, coin, timeframe)
         except Exception as e:
             logger.error(f"Error loading model {model_name}{suffix}", error=str(e))
-            return False
+            return None, None
+        
+        if model is None:
+            logger.warning(f"Model not found: {model_name}{suffix}")
+        
+        return model, scaler
     
-    def load_all_models(self, coin: str = None, timeframe: str = None):
+    def load_all_models(self, coin: str = None, timeframe: str = None) -> int:
         """Load all available models for a specific coin/timeframe"""
-        model_names = ['logistic_regression', 'random_forest', 'xgboost']
+        loaded = sum(self.load_model(name, coin, timeframe) for name in MODEL_NAMES)
         
-        for name in model_names:
-            self.load_model(name, coin, timeframe)
-        
-        logger.info(f"Loaded {len(self.models)} models")
+        logger.debug(f"Loaded {loaded} models", coin=coin, timeframe=timeframe)
+        return loaded
     
     def prepare_features(self, df: pd.DataFrame) -> np.ndarray:
         """
@@ -99,64 +454,75 @@ class MLModelPredictor:
         Returns:
             Feature array
         """
-        feature_cols = self.loader.get_feature_columns()
-        available_cols = [col for col in feature_cols if col in df.columns]
+        key = frozenset(df.columns)
+        available_cols = self._col_cache.get(key)
+        if available_cols is None:
+            available_cols = [col for col in self.feature_cols if col in key]
+            self._col_cache[key] = available_cols
+        
+        # Get last row only (for real-time prediction); slicing the row
+        # before selecting columns copies N values instead of the history
+        return df.iloc[-1:][available_cols].to_numpy(dtype=np.float64)
+    
+    def _predict_row(self, model: Any, scaler: Any, features: np.ndarray) -> Tuple[int, float]:
+        """
+        (prediction, confidence %) for one feature row from a single model call
         
-        X = df[available_cols].values
+        The class is taken as the argmax of predict_proba (what predict()
+        does internally for these estimators), so each model is invoked once.
+        """
+        # Scale features if needed
+        if scaler is not None:
+            features = scaler.transform(features)
         
-        # Get last row only (for real-time prediction)
-        if len(X.shape) > 1:
-            X = X[-1:, :]
+        # Get probability if available
+        if hasattr(model, 'predict_proba'):
+            proba = model.predict_proba(features)[0]
+            best = int(np.argmax(proba))
+            prediction = model.classes_[best] if hasattr(model, 'classes_') else best  # 0 = DOWN, 1 = UP
+            confidence = proba[best] * 100  # Confidence in %
+        else:
+            prediction = model.predict(features)[0]
+            confidence = 60  # Default confidence
         
-        return X
+        return prediction, confidence
+    
+    def _prediction_result(self, model_key: str, prediction: int, confidence: float) -> Dict:
+        """Shape one model's raw output as a prediction dict"""
+        # Determine signal
+        signal = "BUY" if prediction == 1 else "SELL"
+        
+        return {
+            'model': model_key,
+            'signal': signal,
+            'confidence': round(confidence, 2),
+            'prediction': int(prediction)
+        }
     
     def predict_single_model(
         self,
         model_key: str,
-        features: np.ndarray
+        features: np.ndarray,
+        model: Any,
+        scaler: Any = None
     ) -> Optional[Dict]:
         """
         Make prediction with a single model
         
         Args:
-            model_key: Key of model in self.models
+            model_key: Model name with coin/timeframe suffix (for reporting)
             features: Feature array
+            model: Fitted model
+            scaler: Fitted scaler, if the model was trained on scaled features
             
         Returns:
             Prediction result
         """
-        if model_key not in self.models:
-            logger.warning(f"Model not loaded: {model_key}")
-            return None
-        
         try:
-            model = self.models[model_key]
-            
-            # Scale features if needed
-            if model_key in self.scalers:
-                features = self.scalers[model_key].transform(features)
-            
-            # Predict
-            prediction = model.predict(features)[0]  # 0 = DOWN, 1 = UP
-            
-            # Get probability if available
-            if hasattr(model, 'predict_proba'):
-                proba = model.predict_proba(features)[0]
-                confidence = max(proba) * 100  # Confidence in %
-            else:
-                confidence = 60  # Default confidence
+            result = self._prediction_result(model_key, *self._predict_row(model, scaler, features))
             
-            # Determine signal
-            signal = "BUY" if prediction == 1 else "SELL"
-            
-            result = {
-                'model': model_key,
-                'signal': signal,
-                'confidence': round(confidence, 2),
-                'prediction': int(prediction)
-            }
-            
-            logger.debug(f"Prediction from {model_key}", **result)
+            if logging_config.DEBUG_ENABLED:
+                logger.debug(f"Prediction from {model_key}", **result)
             return result
         
         except Exception as e:
@@ -175,22 +541,34 @@ class MLModelPredictor:
         Returns:
             Combined predictions
         """
-        # Load specific/generic models for this request
-        self.load_all_models(coin, timeframe)
-        
-        # Prepare features
+        # Prepare features. The tree ensembles (sklearn trees, XGBoost) cast
+        # input to float32 internally, so they get a float32 copy made once
+        # here; the scaled linear model keeps float64 for its scaler
         features = self.prepare_features(df)
+        features32 = features.astype(np.float32)
         
-        # Get predictions from models that match this coin/timeframe (or are generic)
-        predictions = []
+        # Run the specific (or generic fallback) models for this coin/timeframe
+        # back to back (cache hits after the first request); result dicts are
+        # only built once every model has produced its raw output
         suffix = f"_{coin}_{timeframe}" if coin and timeframe else ""
+        raw = []
         
-        for key in self.models.keys():
-            # Only use models that match the requested suffix or are generic
-            if key.endswith(suffix) or "_" not in key:
-                pred = self.predict_single_model(key, features)
-                if pred:
-                    predictions.append(pred)
+        for name in MODEL_NAMES:
+            model, scaler = self._get_model(name, coin, timeframe)
+            if model is None:
+                continue
+            
+            model_key = f"{name}{suffix}"
+            try:
+                model_features = features if name in SCALED_MODELS else features32
+                raw.append((model_key, self._predict_row(model, scaler, model_features)))
+            except Exception as e:
+                logger.error(f"Error predicting with {model_key}", error=str(e))
+        
+        predictions = [
+            self._prediction_result(model_key, prediction, confidence)
+            for model_key, (prediction, confidence) in raw
+        ]
         
         # Combine predictions
         combined = self._combine_predictions(predictions)
@@ -224,13 +602,30 @@ class MLModelPredictor:
                 'sell_count': 0
             }
         
-        # Count signals
-        buy_count = sum(1 for p in predictions if p['signal'] == 'BUY')
-        sell_count = sum(1 for p in predictions if p['signal'] == 'SELL')
+        # Count signals and average confidence
+        if len(predictions) >= VECTORIZE_MIN_PREDICTIONS:
+            signals = np.array([p['signal'] for p in predictions])
+            confidences = np.fromiter(
+                (p['confidence'] for p in predictions),
+                dtype=np.float64,
+                count=len(predictions)
+            )
+            buy_count = int(np.count_nonzero(signals == 'BUY'))
+            sell_count = int(np.count_nonzero(signals == 'SELL'))
+            total_confidence = float(confidences.sum())
+        else:
+            # One pass over the few dicts
+            buy_count = sell_count = 0
+            total_confidence = 0.0
+            for p in predictions:
+                if p['signal'] == 'BUY':
+                    buy_count += 1
+                elif p['signal'] == 'SELL':
+                    sell_count += 1
+                total_confidence += p['confidence']
         
         # Weighted average confidence
-        total_confidence = sum(p['confidence'] for p in predictions)
-        avg_confidence = total_confidence / len(predictions) if predictions else 0
+        avg_confidence = total_confidence / len(predictions)
         
         # Determine overall signal
         if buy_count > sell_count:
@@ -4,20 +4,98 @@ Trains machine learning models for price prediction
 """
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from xgboost import XGBClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import accuracy_score, classification_report
+import hashlib
 import joblib
+import json
 import os
-from typing import Dict, Tuple
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Tuple, Optional
 from datetime import datetime
 from data.historical_loader import HistoricalDataLoader
+from ml.model_predictor import MODEL_NAMES, clear_model_cache, make_standard_scaler
 import structlog
 
 logger = structlog.get_logger()
 
+# sklearn and XGBoost are imported inside the training methods, so the API
+# (which imports this module for /api/train-models) does not load them at
+# import time just in case a training request comes in
+
+# Boosting rounds without validation-loss improvement before XGBoost stops
+XGBOOST_EARLY_STOPPING_ROUNDS = 50
+
+# Tail of the (chronological) training window held out for early stopping,
+# so the test split stays untouched for the reported accuracy
+XGBOOST_VALIDATION_FRACTION = 0.1
+
+# Part of every dataset fingerprint; bump it when model hyperparameters or
+# feature engineering change so existing models no longer count as current
+TRAINING_VERSION = 1
+
+
+def dataset_fingerprint(*arrays: np.ndarray) -> str:
+    """Content hash (blake2b) of training arrays: shapes, dtypes and bytes"""
+    digest = hashlib.blake2b(str(TRAINING_VERSION).encode(), digest_size=16)
+    for array in arrays:
+        digest.update(f"{array.shape}{array.dtype.str}".encode())
+        digest.update(memoryview(np.ascontiguousarray(array)).cast('B'))
+    return digest.hexdigest()
+
+
+def _import_training_libraries():
+    """Import the sklearn/XGBoost training modules (no-op once loaded)"""
+    import sklearn.ensemble  # noqa: F401
+    import sklearn.linear_model  # noqa: F401
+    import sklearn.metrics  # noqa: F401
+    import xgboost  # noqa: F401
+
+
+@lru_cache(maxsize=1)
+def _xgboost_device() -> str:
+    """
+    'cuda' if this XGBoost build can train on a visible GPU, else 'cpu'
+    
+    XGBoost silently falls back to CPU when no GPU answers, so a one-round
+    probe fit is run and the device the booster actually used is read back.
+    """
+    import xgboost as xgb
+    from xgboost import XGBClassifier
+    
+    if not xgb.build_info().get('USE_CUDA'):
+        return 'cpu'
+    
+    try:
+        probe = XGBClassifier(n_estimators=1, tree_method='hist', device='cuda')
+        with warnings.catch_warnings(), xgb.config_context(verbosity=0):
+            warnings.simplefilter('ignore')
+            probe.fit(np.array([[0.0], [1.0]]), np.array([0, 1]))
+        config = json.loads(probe.get_booster().save_config())
+        device = config['learner']['generic_param'].get('device', 'cpu')
+        return 'cuda' if device.startswith('cuda') else 'cpu'
+    except Exception:
+        return 'cpu'
+
+
+def standardization_stats(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Column means and standard deviations (float64), as StandardScaler fits them
+    
+    Columns whose variance is within rounding error of zero get scale 1, so
+    constant features pass through unscaled instead of dividing by ~0.
+    """
+    n_samples = len(X)
+    mean = X.mean(axis=0, dtype=np.float64)
+    var = X.var(axis=0, dtype=np.float64)
+    
+    eps = np.finfo(np.float64).eps
+    constant = var <= n_samples * eps * var + (n_samples * mean * eps) ** 2
+    
+    scale = np.sqrt(var)
+    scale[constant] = 1.0
+    return mean, scale
+
 
 class MLModelTrainer:
     """Trains ML models for price prediction"""
@@ -31,7 +109,10 @@ class MLModelTrainer:
         """
         self.model_dir = model_dir
         self.loader = HistoricalDataLoader()
-        self.scaler = StandardScaler()
+        
+        # (coin, timeframe) -> (X_train, y_train, X_test, y_test), so repeated
+        # training runs on this trainer skip reloading and feature engineering
+        self._dataset_cache: Dict[Tuple[str, str], Tuple[np.ndarray, ...]] = {}
         
         # Create model directory
         os.makedirs(model_dir, exist_ok=True)
@@ -53,14 +134,16 @@ class MLModelTrainer:
         # Ensure all columns exist
         available_cols = [col for col in feature_cols if col in df.columns]
         
-        X = df[available_cols].values
-        y = df['target'].values if 'target' in df.columns else None
+        if 'target' not in df.columns:
+            return np.ascontiguousarray(df[available_cols].to_numpy(dtype=np.float32)), None
         
-        # Drop rows with NaN
-        if y is not None:
-            mask = ~np.isnan(X).any(axis=1) &  ~np.isnan(y)
-            X = X[mask]
-            y = y[mask]
+        # Drop rows with NaN in one pandas pass, then extract float32 features
+        # (the tree ensembles train in float32 anyway) and int8 labels.
+        # Pandas hands the block back column-major; the estimators want
+        # row-major and would each copy it, so it is reordered once here
+        sub = df[available_cols + ['target']].dropna()
+        X = np.ascontiguousarray(sub[available_cols].to_numpy(dtype=np.float32))
+        y = sub['target'].to_numpy(dtype=np.int8)
         
         return X, y
     
@@ -74,26 +157,36 @@ class MLModelTrainer:
         timeframe: str = "default"
     ) -> Dict:
         """Train Logistic Regression model"""
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.metrics import accuracy_score
+        
         try:
             logger.info("Training Logistic Regression...", coin=coin, timeframe=timeframe)
             
-            # Scale features
-            scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
-            X_test_scaled = scaler.transform(X_test)
+            # Standardize in float64 (lbfgs fits in float64 and inference
+            # feeds float64 rows): column stats straight off the float32 data,
+            # then one buffer standardized in place, refilled for the test rows
+            mean, scale = standardization_stats(X_train)
+            buffer = np.empty((max(len(X_train), len(X_test)), X_train.shape[1]))
+            
+            X_train_scaled = np.subtract(X_train, mean, out=buffer[:len(X_train)])
+            X_train_scaled /= scale
             
             # Train model
             model = LogisticRegression(max_iter=1000, random_state=42)
             model.fit(X_train_scaled, y_train)
             
             # Evaluate
+            X_test_scaled = np.subtract(X_test, mean, out=buffer[:len(X_test)])
+            X_test_scaled /= scale
             y_pred = model.predict(X_test_scaled)
             accuracy = accuracy_score(y_test, y_pred)
             
-            # Save model
+            # Save model (mean/scale as plain arrays rather than a pickled scaler)
             suffix = f"_{coin}_{timeframe}"
             joblib.dump(model, os.path.join(self.model_dir, f'logistic_regression{suffix}.pkl'))
-            joblib.dump(scaler, os.path.join(self.model_dir, f'scaler_lr{suffix}.pkl'))
+            np.savez(os.path.join(self.model_dir, f'scaler_lr{suffix}.npz'), mean=mean, scale=scale)
+            scaler = make_standard_scaler(mean, scale)
             
             logger.info("Logistic Regression trained", accuracy=accuracy)
             
@@ -115,9 +208,13 @@ class MLModelTrainer:
         X_test: np.ndarray,
         y_test: np.ndarray,
         coin: str = "default",
-        timeframe: str = "default"
+        timeframe: str = "default",
+        n_jobs: int = -1
     ) -> Dict:
-        """Train Random Forest model"""
+        """Train Random Forest model (n_jobs threads build the trees)"""
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.metrics import accuracy_score
+        
         try:
             logger.info("Training Random Forest...", coin=coin, timeframe=timeframe)
             
@@ -126,7 +223,7 @@ class MLModelTrainer:
                 n_estimators=100,
                 max_depth=10,
                 random_state=42,
-                n_jobs=-1
+                n_jobs=n_jobs
             )
             model.fit(X_train, y_train)
             
@@ -157,22 +254,43 @@ class MLModelTrainer:
         X_test: np.ndarray,
         y_test: np.ndarray,
         coin: str = "default",
-        timeframe: str = "default"
+        timeframe: str = "default",
+        n_jobs: Optional[int] = None
     ) -> Dict:
-        """Train XGBoost model"""
+        """Train XGBoost model (n_jobs CPU threads; None uses all cores)"""
+        from sklearn.metrics import accuracy_score
+        from xgboost import XGBClassifier
+        
         try:
-            logger.info("Training XGBoost...", coin=coin, timeframe=timeframe)
+            device = _xgboost_device()
+            logger.info("Training XGBoost...", coin=coin, timeframe=timeframe, device=device)
             
-            # Train model
+            # Hold out the newest training rows to decide when to stop boosting
+            # (too little data: train on everything for the full 100 rounds)
+            n_val = int(len(X_train) * XGBOOST_VALIDATION_FRACTION)
+            fit_kwargs = {}
+            if n_val > 0:
+                X_fit, y_fit = X_train[:-n_val], y_train[:-n_val]
+                fit_kwargs = {'eval_set': [(X_train[-n_val:], y_train[-n_val:])], 'verbose': False}
+            else:
+                X_fit, y_fit = X_train, y_train
+            
+            # Train model (histogram method; builds histograms on the GPU when present)
             model = XGBClassifier(
                 n_estimators=100,
                 max_depth=6,
                 learning_rate=0.1,
                 random_state=42,
-                use_label_encoder=False,
-                eval_metric='logloss'
+                eval_metric='logloss',
+                tree_method='hist',
+                device=device,
+                early_stopping_rounds=XGBOOST_EARLY_STOPPING_ROUNDS if n_val > 0 else None,
+                n_jobs=n_jobs if device == 'cpu' else None
             )
-            model.fit(X_train, y_train)
+            model.fit(X_fit, y_fit, **fit_kwargs)
+            
+            # Inference runs on CPU, whatever trained the model
+            model.set_params(device='cpu')
             
             # Evaluate
             y_pred = model.predict(X_test)
@@ -194,13 +312,94 @@ class MLModelTrainer:
             logger.error("Error training XGBoost", error=str(e))
             return None
     
-    def train_all_models(self, coin: str, timeframe: str) -> Dict:
+    def get_training_data(
+        self,
+        coin: str,
+        timeframe: str
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Load, engineer and split features once per coin/timeframe
+        
+        Args:
+            coin: Coin symbol
+            timeframe: Timeframe
+            
+        Returns:
+            Tuple of (X_train, y_train, X_test, y_test) or None if loading failed
+        """
+        key = (coin, timeframe)
+        if key in self._dataset_cache:
+            return self._dataset_cache[key]
+        
+        train_df, test_df = self.loader.prepare_ml_dataset(coin, timeframe)
+        
+        if train_df is None or test_df is None:
+            return None
+        
+        X_train, y_train = self.prepare_features(train_df)
+        X_test, y_test = self.prepare_features(test_df)
+        
+        self._dataset_cache[key] = (X_train, y_train, X_test, y_test)
+        return self._dataset_cache[key]
+    
+    def load_trained_models(self, coin: str, timeframe: str, fingerprint: str) -> Optional[Dict]:
+        """
+        Saved training results, if they were trained on the same dataset
+        
+        Args:
+            coin: Coin symbol
+            timeframe: Timeframe
+            fingerprint: dataset_fingerprint of the current training data
+            
+        Returns:
+            Results shaped like train_all_models', or None if retraining is needed
+        """
+        suffix = f"_{coin}_{timeframe}"
+        metadata_path = os.path.join(self.model_dir, f'metadata{suffix}.pkl')
+        
+        try:
+            if not os.path.exists(metadata_path):
+                return None
+            
+            metadata = joblib.load(metadata_path)
+            if metadata.get('fingerprint') != fingerprint or set(metadata.get('models', {})) != set(MODEL_NAMES):
+                return None
+            
+            model_paths = {name: os.path.join(self.model_dir, f'{name}{suffix}.pkl') for name in MODEL_NAMES}
+            scaler_path = os.path.join(self.model_dir, f'scaler_lr{suffix}.npz')
+            if not all(os.path.exists(path) for path in [*model_paths.values(), scaler_path]):
+                return None
+            
+            results = {
+                name: {
+                    'model_name': name,
+                    'accuracy': metadata['models'][name]['accuracy'],
+                    'model': joblib.load(path)
+                }
+                for name, path in model_paths.items()
+            }
+            
+            with np.load(scaler_path) as arrays:
+                results['logistic_regression']['scaler'] = make_standard_scaler(arrays['mean'], arrays['scale'])
+            
+            return results
+        
+        except Exception as e:
+            logger.error("Error loading trained models", coin=coin, timeframe=timeframe, error=str(e))
+            return None
+    
+    def train_all_models(self, coin: str, timeframe: str, force: bool = False) -> Dict:
         """
         Train all ML models for a coin/timeframe
         
+        Training is skipped when the saved models were fit on exactly the same
+        dataset (matching fingerprint in their metadata); they are returned
+        as-is instead.
+        
         Args:
             coin: Coin symbol
             timeframe: Timeframe
+            force: Retrain even if the dataset is unchanged
             
         Returns:
             Dictionary of training results
@@ -208,14 +407,13 @@ class MLModelTrainer:
         logger.info("Training all models", coin=coin, timeframe=timeframe)
         
         # Load and prepare data
-        train_df, test_df = self.loader.prepare_ml_dataset(coin, timeframe)
+        dataset = self.get_training_data(coin, timeframe)
         
-        if train_df is None or test_df is None:
+        if dataset is None:
             logger.error("Failed to prepare dataset")
             return None
         
-        X_train, y_train = self.prepare_features(train_df)
-        X_test, y_test = self.prepare_features(test_df)
+        X_train, y_train, X_test, y_test = dataset
         
         logger.info(
             "Dataset prepared",
@@ -224,20 +422,36 @@ class MLModelTrainer:
             features=X_train.shape[1]
         )
         
-        # Train models
-        results = {}
+        fingerprint = dataset_fingerprint(X_train, y_train, X_test, y_test)
+        if not force:
+            results = self.load_trained_models(coin, timeframe, fingerprint)
+            if results is not None:
+                logger.info("Dataset unchanged, reusing trained models", coin=coin, timeframe=timeframe)
+                return results
         
-        lr_result = self.train_logistic_regression(X_train, y_train, X_test, y_test, coin, timeframe)
-        if lr_result:
-            results['logistic_regression'] = lr_result
+        # Train the three models concurrently. Their fits run in C with the
+        # GIL released, so threads overlap them without pickling the trainer;
+        # the tree ensembles split the cores instead of each claiming all
+        data = (X_train, y_train, X_test, y_test, coin, timeframe)
+        jobs_per_model = max(1, (os.cpu_count() or 1) // 3)
         
-        rf_result = self.train_random_forest(X_train, y_train, X_test, y_test, coin, timeframe)
-        if rf_result:
-            results['random_forest'] = rf_result
+        # First imports racing in the worker threads can see half-initialized
+        # sklearn modules, so the training libraries are loaded up front
+        _import_training_libraries()
         
-        xgb_result = self.train_xgboost(X_train, y_train, X_test, y_test, coin, timeframe)
-        if xgb_result:
-            results['xgboost'] = xgb_result
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="model-train") as pool:
+            futures = {
+                'logistic_regression': pool.submit(self.train_logistic_regression, *data),
+                'random_forest': pool.submit(self.train_random_forest, *data, n_jobs=jobs_per_model),
+                'xgboost': pool.submit(self.train_xgboost, *data, n_jobs=jobs_per_model)
+            }
+            
+            # Collected in a fixed order so results/metadata keep their layout
+            results = {}
+            for name, future in futures.items():
+                result = future.result()
+                if result:
+                    results[name] = result
         
         # Save metadata
         metadata = {
@@ -246,6 +460,7 @@ class MLModelTrainer:
             'trained_at': datetime.now().isoformat(),
             'train_samples': len(X_train),
             'test_samples': len(X_test),
+            'fingerprint': fingerprint,
             'models': {
                 name: {'accuracy': res['accuracy']}
                 for name, res in results.items()
@@ -254,6 +469,9 @@ class MLModelTrainer:
         
         joblib.dump(metadata, os.path.join(self.model_dir, f'metadata_{coin}_{timeframe}.pkl'))
         
+        # Serve the new artifacts instead of the cached ones
+        clear_model_cache()
+        
         logger.info("All models trained", models=len(results))
         return results
 
@@ -2,7 +2,13 @@
 Database Models
 SQLAlchemy ORM models for data persistence
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, JSON, create_engine
+from sqlalchemy import (
+    Column, Integer, SmallInteger, String, Float, DateTime, Boolean, JSON, Index,
+    create_engine, event, inspect, text
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
@@ -10,13 +16,23 @@ from config import settings
 
 Base = declarative_base()
 
+# JSON documents are stored as binary JSONB on Postgres (no re-parse on read)
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+# 32-bit floats for bounded scores (confidences, 0-100 oscillators)
+Score = Float(precision=24)
+
 
 class MarketData(Base):
     """OHLCV market data"""
     __tablename__ = "market_data"
+    __table_args__ = (
+        # Range scans filter on coin + timeframe, then walk timestamps in order
+        Index('ix_md_coin_tf_ts', 'coin', 'timeframe', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    coin = Column(String, index=True, nullable=False)
+    coin = Column(String, nullable=False)
     timeframe = Column(String, nullable=False)
     timestamp = Column(DateTime, index=True, nullable=False)
     open = Column(Float, nullable=False)
@@ -30,9 +46,12 @@ class MarketData(Base):
 class HistoricalData(Base):
     """Historical OHLCV for ML training"""
     __tablename__ = "historical_data"
+    __table_args__ = (
+        Index('ix_hd_coin_tf_ts', 'coin', 'timeframe', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    coin = Column(String, index=True, nullable=False)
+    coin = Column(String, nullable=False)
     timeframe = Column(String, nullable=False)
     timestamp = Column(DateTime, index=True, nullable=False)
     open = Column(Float, nullable=False)
@@ -41,7 +60,7 @@ class HistoricalData(Base):
     close = Column(Float, nullable=False)
     volume = Column(Float, nullable=False)
     # Technical indicators (calculated)
-    rsi = Column(Float)
+    rsi = Column(Score)
     ema_fast = Column(Float)
     ema_slow = Column(Float)
     macd = Column(Float)
@@ -54,15 +73,18 @@ class HistoricalData(Base):
 class NewsSentiment(Base):
     """News and sentiment data"""
     __tablename__ = "news_sentiment"
+    __table_args__ = (
+        Index('ix_ns_coin_ts', 'coin', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    coin = Column(String, index=True, nullable=False)
+    coin = Column(String, nullable=False)
     timestamp = Column(DateTime, index=True, nullable=False)
     source = Column(String, nullable=False)  # cryptopanic, twitter, fear_greed
     title = Column(String)
     content = Column(String)
-    sentiment_score = Column(Float, nullable=False)  # -1 to 1
-    confidence = Column(Float, nullable=False)  # 0 to 100
+    sentiment_score = Column(Score, nullable=False)  # -1 to 1
+    confidence = Column(Score, nullable=False)  # 0 to 100
     url = Column(String)
 
 
@@ -75,9 +97,9 @@ class UserSettings(Base):
     mode = Column(String, default="prediction")  # prediction or auto_trade
     coin = Column(String, default="BTC")
     timeframe = Column(String, default="1h")
-    confidence_threshold = Column(Integer, default=60)
-    visible_sections = Column(JSON)  # {strategy: true, ml: true, ...}
-    enabled_strategies = Column(JSON)  # {rsi: true, ema: true, ...}
+    confidence_threshold = Column(SmallInteger, default=60)
+    visible_sections = Column(JSONDocument)  # {strategy: true, ml: true, ...}
+    enabled_strategies = Column(JSONDocument)  # {rsi: true, ema: true, ...}
     # Auto-trade settings
     api_key_encrypted = Column(String)
     max_trade_risk = Column(Float, default=2.0)
@@ -94,7 +116,7 @@ class TradeHistory(Base):
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
     coin = Column(String, nullable=False)
     signal = Column(String, nullable=False)  # BUY or SELL
-    confidence = Column(Float, nullable=False)
+    confidence = Column(Score, nullable=False)
     entry_price = Column(Float, nullable=False)
     target_price = Column(Float, nullable=False)
     stop_loss = Column(Float)
@@ -109,32 +131,57 @@ class TradeHistory(Base):
 class Prediction(Base):
     """Prediction history for analysis"""
     __tablename__ = "predictions"
+    __table_args__ = (
+        Index('ix_pred_coin_tf_ts', 'coin', 'timeframe', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
-    coin = Column(String, index=True, nullable=False)
+    coin = Column(String, nullable=False)
     timeframe = Column(String, nullable=False)
     current_price = Column(Float, nullable=False)
     
     # Strategy signals
     strategy_signal = Column(String)  # BUY/SELL/NEUTRAL
-    strategy_confidence = Column(Float)
-    strategy_details = Column(JSON)  # Individual strategy results
+    strategy_confidence = Column(Score)
+    strategy_details = Column(JSONDocument)  # Individual strategy results
     
     # ML predictions
     ml_signal = Column(String)
-    ml_confidence = Column(Float)
-    ml_details = Column(JSON)  # Individual model results
+    ml_confidence = Column(Score)
+    ml_details = Column(JSONDocument)  # Individual model results
     
     # News sentiment
     news_signal = Column(String)
-    news_confidence = Column(Float)
+    news_confidence = Column(Score)
     
     # Final prediction
     final_signal = Column(String, nullable=False)
-    final_confidence = Column(Float, nullable=False)
+    final_confidence = Column(Score, nullable=False)
     target_price = Column(Float)
     target_type = Column(String)  # HIGH or LOW
+    meets_threshold = Column(Boolean)
+    
+    # Per-strategy / per-model results copied out of the JSON details, so
+    # aggregate queries read typed columns instead of parsing every blob
+    rsi_signal = Column(String)
+    rsi_confidence = Column(Score)
+    ema_signal = Column(String)
+    ema_confidence = Column(Score)
+    macd_signal = Column(String)
+    macd_confidence = Column(Score)
+    bollinger_signal = Column(String)
+    bollinger_confidence = Column(Score)
+    volume_spike_signal = Column(String)
+    volume_spike_confidence = Column(Score)
+    support_resistance_signal = Column(String)
+    support_resistance_confidence = Column(Score)
+    lr_signal = Column(String)
+    lr_confidence = Column(Score)
+    rf_signal = Column(String)
+    rf_confidence = Column(Score)
+    xgb_signal = Column(String)
+    xgb_confidence = Column(Score)
     
     # Actual outcome (for validation)
     actual_high = Column(Float)
@@ -142,6 +189,16 @@ class Prediction(Base):
     outcome_verified_at = Column(DateTime)
 
 
+# "Actionable predictions in the last N hours" only scans qualifying rows
+# (filter with Prediction.meets_threshold.is_(True); SQLite matches the term)
+Index(
+    'ix_pred_actionable_ts',
+    Prediction.timestamp,
+    postgresql_where=Prediction.meets_threshold.is_(True),
+    sqlite_where=Prediction.meets_threshold.is_(True)
+)
+
+
 # Database setup
 engine = create_engine(
     settings.DATABASE_URL,
@@ -150,17 +207,160 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+IS_SQLITE = engine.dialect.name == "sqlite"
+
+# SQLite's DATETIME storage format, matched so raw inserts compare with ORM rows
+SQLITE_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+# Async drivers for the same database, used by the FastAPI endpoints so
+# queries are awaited instead of blocking the event loop
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def _async_engine_args(url):
+    """Async URL plus pool arguments for the configured database"""
+    async_url = url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+    
+    # In-memory SQLite is a single shared connection (StaticPool), not sizeable
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return async_url, {}
+    
+    return async_url, {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_pre_ping": True
+    }
+
+
+_async_url, _async_pool_args = _async_engine_args(make_url(settings.DATABASE_URL))
+async_engine = create_async_engine(_async_url, **_async_pool_args)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+if IS_SQLITE:
+    @event.listens_for(engine, "connect")
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """WAL lets readers run during bulk writes; NORMAL sync is safe under WAL"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
 
 def init_db():
-    """Initialize database tables"""
+    """Initialize database tables (and columns/indexes added to existing tables)"""
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    
+    # create_all skips tables that already exist, so their newer indexes too
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    
     print("Database initialized successfully")
 
 
-def get_db():
-    """Database session dependency"""
-    db = SessionLocal()
+def _add_missing_columns():
+    """ALTER existing tables to add nullable columns newer models declare"""
+    inspector = inspect(engine)
+    
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+
+# SQLite caps bound parameters per statement (999 on older builds)
+SQL_MAX_BIND_PARAMS = 999
+
+
+def append_dataframe(df, model, columns) -> int:
+    """
+    Append DataFrame rows to a model's table in a single transaction
+    
+    SQLite gets a raw DBAPI executemany over plain tuples, which reuses one
+    prepared statement and skips SQLAlchemy entirely; other databases use
+    multi-row INSERTs through DataFrame.to_sql.
+    
+    Args:
+        df: DataFrame holding the rows
+        model: ORM model whose table receives the rows
+        columns: Columns to persist (missing ones are written as NULL)
+        
+    Returns:
+        Number of rows written
+    """
+    frame = df.reindex(columns=columns)
+    
+    # to_sql bypasses ORM-side defaults, so stamp created_at ourselves
+    if 'created_at' in model.__table__.c and 'created_at' not in frame.columns:
+        frame['created_at'] = datetime.utcnow()
+    
+    if IS_SQLITE:
+        return _sqlite_executemany(frame, model.__tablename__)
+    
+    chunksize = max(1, SQL_MAX_BIND_PARAMS // len(frame.columns))
+    with engine.begin() as conn:
+        frame.to_sql(
+            model.__tablename__,
+            con=conn,
+            if_exists='append',
+            index=False,
+            method='multi',
+            chunksize=chunksize
+        )
+    return len(frame)
+
+
+def _sqlite_executemany(frame, table_name: str) -> int:
+    """Insert a prepared frame through the raw sqlite3 connection"""
+    frame = frame.copy()
+    for col in frame.columns:
+        if frame[col].dtype.kind == 'M':
+            frame[col] = frame[col].dt.strftime(SQLITE_DATETIME_FORMAT)
+    
+    # NaN binds as NULL in sqlite3, matching the ORM path
+    frame = frame.astype(object).where(frame.notna(), None)
+    rows = list(frame.itertuples(index=False, name=None))
+    
+    column_list = ", ".join(frame.columns)
+    placeholders = ", ".join("?" * len(frame.columns))
+    sql = f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders})"
+    
+    conn = engine.raw_connection()
     try:
-        yield db
+        cursor = conn.cursor()
+        cursor.executemany(sql, rows)
+        conn.commit()
+        cursor.close()
+    except Exception:
+        conn.rollback()
+        raise
     finally:
-        db.close()
+        conn.close()
+    return len(rows)
+
+
+async def get_db():
+    """Async database session dependency"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,40 +1,46 @@
 """
-Simple Shim for pandas_ta using ta library
-Allows code to run without numba dependency
+Simple Shim for pandas_ta on the compiled indicator kernels
+Same call signatures and column names as before, computed in single Numba passes
 """
 import pandas as pd
 import numpy as np
-import ta as ta_lib
+from data._indicators_njit import (
+    rsi_njit, ema_njit, sma_njit, macd_njit, bbands_njit, atr_njit
+)
+
+
+def _values(series: pd.Series) -> np.ndarray:
+    """Contiguous float64 view (or copy) of a Series for the kernels"""
+    return np.ascontiguousarray(series.to_numpy(dtype=np.float64))
+
 
 def rsi(close, length=14, **kwargs):
-    return ta_lib.momentum.rsi(close, window=length)
+    return pd.Series(rsi_njit(_values(close), int(length)), index=close.index, name="rsi")
 
 def ema(close, length=10, **kwargs):
-    return ta_lib.trend.ema_indicator(close, window=length)
+    return pd.Series(ema_njit(_values(close), int(length)), index=close.index, name=f"ema_{length}")
 
 def sma(close, length=10, **kwargs):
-    return ta_lib.trend.sma_indicator(close, window=length)
+    return pd.Series(sma_njit(_values(close), int(length)), index=close.index, name=f"sma_{length}")
 
 def macd(close, fast=12, slow=26, signal=9, **kwargs):
     # returns a DataFrame with MACD_12_26_9, MACDs_12_26_9, MACDh_12_26_9
-    m = ta_lib.trend.MACD(close, window_fast=fast, window_slow=slow, window_sign=signal)
-    df = pd.DataFrame()
-    col_macd = f"MACD_{fast}_{slow}_{signal}"
-    col_signal = f"MACDs_{fast}_{slow}_{signal}"
-    col_hist = f"MACDh_{fast}_{slow}_{signal}"
-    df[col_macd] = m.macd()
-    df[col_signal] = m.macd_signal()
-    df[col_hist] = m.macd_diff()
-    return df
+    line, signal_line, hist = macd_njit(_values(close), int(fast), int(slow), int(signal))
+    return pd.DataFrame({
+        f"MACD_{fast}_{slow}_{signal}": line,
+        f"MACDs_{fast}_{slow}_{signal}": signal_line,
+        f"MACDh_{fast}_{slow}_{signal}": hist
+    }, index=close.index)
 
 def bbands(close, length=20, std=2, **kwargs):
     # returns BBL_20_2.0, BBM_20_2.0, BBU_20_2.0
-    bb = ta_lib.volatility.BollingerBands(close, window=length, window_dev=std)
-    df = pd.DataFrame()
-    df[f"BBL_{length}_{std}.0"] = bb.bollinger_lband()
-    df[f"BBM_{length}_{std}.0"] = bb.bollinger_mavg()
-    df[f"BBU_{length}_{std}.0"] = bb.bollinger_hband()
-    return df
+    lower, middle, upper = bbands_njit(_values(close), int(length), float(std))
+    return pd.DataFrame({
+        f"BBL_{length}_{std}.0": lower,
+        f"BBM_{length}_{std}.0": middle,
+        f"BBU_{length}_{std}.0": upper
+    }, index=close.index)
 
 def atr(high, low, close, length=14, **kwargs):
-    return ta_lib.volatility.average_true_range(high, low, close, window=length)
+    values = atr_njit(_values(high), _values(low), _values(close), int(length))
+    return pd.Series(values, index=close.index, name="atr")
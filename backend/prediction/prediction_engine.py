@@ -2,21 +2,53 @@
 Prediction Engine
 Main orchestrator that combines all prediction modules
 """
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+import orjson
 import pandas as pd
-from typing import Dict
+from cachetools import TTLCache
+from typing import Dict, List, Optional
 from data.market_data_collector import MarketDataCollector
-from data.historical_loader import HistoricalDataLoader
+from data.historical_loader import HistoricalDataLoader, candle_window_key
 from data.news_sentiment_fetcher import NewsSentimentFetcher
 from strategies.strategy_manager import StrategyManager
 from ml.model_predictor import MLModelPredictor
 from prediction.probability_combiner import ProbabilityCombiner
 from prediction.target_price_calculator import TargetPriceCalculator
-from models import Prediction, SessionLocal
+from prediction.prediction_writer import PredictionWriter
 from datetime import datetime
+from _aio import run_sync
 import structlog
 
 logger = structlog.get_logger()
 
+# orjson options for prediction payloads: numpy natively, non-str dict keys
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Strategy and ML results depend only on the candle window, so predictions
+# polled while the last candle is unchanged reuse them
+ANALYSIS_CACHE_TTL_SECONDS = 60
+
+# Background threads for predict()'s candle-independent fetches
+PREDICT_IO_WORKERS = 4
+
+
+def _json_default(obj):
+    """Serialize the pandas/numpy values orjson does not handle natively"""
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, pd.Series):
+        return obj.to_dict()
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict('records')
+    if hasattr(obj, 'item') and callable(getattr(obj, 'item')):
+        return obj.item()
+    if pd.api.types.is_scalar(obj) and pd.isna(obj):
+        return None
+    return str(obj)
+
 
 class PredictionEngine:
     """Main prediction engine that orchestrates all components"""
@@ -35,6 +67,16 @@ class PredictionEngine:
         self.ml_predictor = MLModelPredictor()
         self.probability_combiner = ProbabilityCombiner()
         self.target_calculator = TargetPriceCalculator()
+        self.prediction_writer = PredictionWriter()
+        
+        # Overlaps predict()'s independent I/O (news, model loads) with the
+        # OHLCV fetch; shared by concurrent predict() calls on this engine
+        self._io_pool = ThreadPoolExecutor(max_workers=PREDICT_IO_WORKERS, thread_name_prefix="predict-io")
+        
+        # candle window key -> (strategy_result, ml_result); per engine, since
+        # the enabled strategies are part of the result
+        self._analysis_cache = TTLCache(maxsize=256, ttl=ANALYSIS_CACHE_TTL_SECONDS)
+        self._analysis_lock = threading.Lock()
         
         logger.info("PredictionEngine initialized")
     
@@ -58,6 +100,11 @@ class PredictionEngine:
         logger.info("Starting prediction", coin=coin, timeframe=timeframe)
         
         try:
+            # News (step 5) and the model files do not depend on the candles,
+            # so fetch/load them in the background while the OHLCV call runs
+            news_future = self._io_pool.submit(self.news_fetcher.get_aggregated_sentiment, coin, hours=24)
+            models_future = self._io_pool.submit(self.ml_predictor.load_all_models, coin, timeframe)
+            
             # 1. Get market data
             df = self.market_collector.get_ohlcv(coin, timeframe, limit=100)
             
@@ -65,129 +112,214 @@ class PredictionEngine:
                 logger.error("Failed to fetch market data")
                 return self._empty_prediction(coin, timeframe)
             
-            # 2. Add technical indicators
-            df = self.historical_loader.add_technical_indicators(df)
-            
-            current_price = df['close'].iloc[-1]
-            
-            # 3. Get strategy signals
-            strategy_result = self.strategy_manager.calculate_all(df)
+            # Models warmed above; predict_all loads anything the warm-up missed
+            self._await_io(models_future, "Error preloading models")
+            news_result = self._await_io(news_future, "Error fetching news sentiment")
             
-            # 4. Get ML predictions
-            ml_result = self.ml_predictor.predict_all(df, coin, timeframe)
-            
-            # 5. Get news sentiment
-            news_result = self.news_fetcher.get_aggregated_sentiment(coin, hours=24)
-            if news_result is None:
-                news_result = {'signal': 'NEUTRAL', 'confidence': 0}
-            
-            # 6. Combine all signals
-            combined = self.probability_combiner.combine(
-                strategy_result,
-                ml_result,
-                news_result
-            )
+            return self._build_prediction(coin, timeframe, df, news_result, min_confidence)
+        
+        except Exception as e:
+            logger.error("Error generating prediction", coin=coin, error=str(e))
+            import traceback
+            logger.error(traceback.format_exc())
+            return self._empty_prediction(coin, timeframe, error=str(e))
+    
+    def predict_batch(
+        self,
+        coins: List[str],
+        timeframe: str,
+        min_confidence: int = 60
+    ) -> Dict[str, Dict]:
+        """
+        Generate predictions for several coins of one timeframe
+        
+        Candles for every coin are fetched concurrently on one async exchange
+        while news sentiment for all of them comes from a single batched
+        request (get_aggregated_sentiment_batch); the per-coin analysis then
+        runs exactly as in predict().
+        
+        Args:
+            coins: Coin symbols
+            timeframe: Timeframe (15m, 1h, 4h, 1d)
+            min_confidence: Minimum confidence threshold
             
-            final_signal = combined['final_signal']
-            final_confidence = combined['final_confidence']
+        Returns:
+            Dictionary of coin -> complete prediction dictionary
+        """
+        logger.info("Starting batch prediction", coins=len(coins), timeframe=timeframe)
+        
+        news_future = self._io_pool.submit(self.news_fetcher.get_aggregated_sentiment_batch, coins, hours=24)
+        models_futures = [
+            self._io_pool.submit(self.ml_predictor.load_all_models, coin, timeframe)
+            for coin in coins
+        ]
+        
+        try:
+            frames = run_sync(self.market_collector.aget_ohlcv_many(coins, timeframe, limit=100))
+        except Exception as e:
+            logger.error("Error fetching batch market data", coins=len(coins), error=str(e))
+            frames = {}
+        
+        news_by_coin = self._await_io(news_future, "Error fetching news sentiment") or {}
+        for future in models_futures:
+            self._await_io(future, "Error preloading models")
+        
+        predictions = {}
+        for coin in coins:
+            df = frames.get(coin)
+            if df is None:
+                logger.error("Failed to fetch market data", coin=coin)
+                predictions[coin] = self._empty_prediction(coin, timeframe)
+                continue
             
-            # 7. Calculate target price
-            target_result = self.target_calculator.calculate_target(
-                df,
-                final_signal,
-                final_confidence,
-                min_confidence
-            )
+            try:
+                predictions[coin] = self._build_prediction(
+                    coin, timeframe, df, news_by_coin.get(coin), min_confidence
+                )
+            except Exception as e:
+                logger.error("Error generating prediction", coin=coin, error=str(e))
+                predictions[coin] = self._empty_prediction(coin, timeframe, error=str(e))
+        
+        return predictions
+    
+    def _build_prediction(
+        self,
+        coin: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        news_result: Optional[Dict],
+        min_confidence: int
+    ) -> Dict:
+        """Steps 2-11 of a prediction, from fetched candles and news sentiment"""
+        # 2. Add technical indicators
+        df = self.historical_loader.add_technical_indicators(df)
+        
+        current_price = df['close'].iloc[-1]
+        
+        # 3-4. Strategy signals and ML predictions
+        strategy_result, ml_result = self._analyze(df, coin, timeframe)
+        
+        # 5. News sentiment (fetched alongside the candles)
+        if news_result is None:
+            news_result = {'signal': 'NEUTRAL', 'confidence': 0}
+        
+        # 6. Combine all signals
+        combined = self.probability_combiner.combine(
+            strategy_result,
+            ml_result,
+            news_result
+        )
+        
+        final_signal = combined['final_signal']
+        final_confidence = combined['final_confidence']
+        
+        # 7. Calculate target price
+        target_result = self.target_calculator.calculate_target(
+            df,
+            final_signal,
+            final_confidence,
+            min_confidence
+        )
+        
+        # 8. Build complete prediction
+        prediction = {
+            'coin': coin,
+            'timeframe': timeframe,
+            'timestamp': datetime.now().isoformat(),
+            'current_price': round(current_price, 2),
             
-            # 8. Build complete prediction
-            prediction = {
-                'coin': coin,
-                'timeframe': timeframe,
-                'timestamp': datetime.now().isoformat(),
-                'current_price': round(current_price, 2),
-                
-                # Strategy results
-                'strategy': {
-                    'signal': strategy_result['signal'],
-                    'confidence': strategy_result['avg_confidence'],
-                    'details': strategy_result['strategies']
-                },
-                
-                # ML results
-                'ml': {
-                    'signal': ml_result['signal'],
-                    'confidence': ml_result['avg_confidence'],
-                    'details': ml_result['models']
-                },
-                
-                # News results
-                'news': {
-                    'signal': news_result['signal'],
-                    'confidence': news_result['confidence']
-                },
-                
-                # Final prediction
-                'final': {
-                    'signal': final_signal,
-                    'confidence': final_confidence,
-                    'target_price': target_result.get('target_price') if target_result else None,
-                    'target_type': target_result.get('target_type') if target_result else None,
-                    'meets_threshold': final_confidence >= min_confidence
-                },
-                
-                # Breakdown
-                'breakdown': combined['breakdown']
-            }
+            # Strategy results
+            'strategy': {
+                'signal': strategy_result['signal'],
+                'confidence': strategy_result['avg_confidence'],
+                'details': strategy_result['strategies']
+            },
             
-            # 10. Clean prediction for serialization
-            prediction = self._clean_for_serialization(prediction)
+            # ML results
+            'ml': {
+                'signal': ml_result['signal'],
+                'confidence': ml_result['avg_confidence'],
+                'details': ml_result['models']
+            },
             
-            # 11. Save prediction to database
-            self._save_prediction(prediction)
+            # News results
+            'news': {
+                'signal': news_result['signal'],
+                'confidence': news_result['confidence']
+            },
             
-            logger.info(
-                "Prediction complete",
-                coin=coin,
-                signal=final_signal,
-                confidence=final_confidence,
-                target=prediction['final'].get('target_price')
-            )
+            # Final prediction
+            'final': {
+                'signal': final_signal,
+                'confidence': final_confidence,
+                'target_price': target_result.get('target_price') if target_result else None,
+                'target_type': target_result.get('target_type') if target_result else None,
+                'meets_threshold': final_confidence >= min_confidence
+            },
             
-            return prediction
+            # Breakdown
+            'breakdown': combined['breakdown']
+        }
+        
+        # 10. Clean prediction for serialization
+        prediction = self._clean_for_serialization(prediction)
         
+        # 11. Save prediction to database
+        self._save_prediction(prediction)
+        
+        logger.info(
+            "Prediction complete",
+            coin=coin,
+            signal=final_signal,
+            confidence=final_confidence,
+            target=prediction['final'].get('target_price')
+        )
+        
+        return prediction
+    
+    def _await_io(self, future: Future, error_message: str):
+        """Result of a background fetch, or None if it raised"""
+        try:
+            return future.result()
         except Exception as e:
-            logger.error("Error generating prediction", coin=coin, error=str(e))
-            import traceback
-            logger.error(traceback.format_exc())
-            return self._empty_prediction(coin, timeframe, error=str(e))
+            logger.error(error_message, error=str(e))
+            return None
+    
+    def _analyze(self, df: pd.DataFrame, coin: str, timeframe: str):
+        """(strategy_result, ml_result) for a window, reused until its last candle changes"""
+        key = candle_window_key(df)
+        if key is not None:
+            with self._analysis_lock:
+                cached = self._analysis_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        result = (
+            self.strategy_manager.calculate_all(df),
+            self.ml_predictor.predict_all(df, coin, timeframe)
+        )
+        
+        if key is not None:
+            with self._analysis_lock:
+                self._analysis_cache[key] = result
+        return result
+    
+    def clear_analysis_cache(self):
+        """Forget cached strategy/ML results (e.g. after retraining models)"""
+        with self._analysis_lock:
+            self._analysis_cache.clear()
     
     def _clean_for_serialization(self, obj):
-        """Recursively convert numpy/pandas types to python types for JSON serialization"""
-        import numpy as np
+        """
+        Convert numpy/pandas types to python types for JSON serialization
         
-        if isinstance(obj, dict):
-            return {str(k): self._clean_for_serialization(v) for k, v in obj.items()}
-        elif isinstance(obj, (list, tuple, np.ndarray)):
-            return [self._clean_for_serialization(i) for i in obj]
-        elif isinstance(obj, pd.Series):
-            return self._clean_for_serialization(obj.to_dict())
-        elif isinstance(obj, pd.DataFrame):
-            return self._clean_for_serialization(obj.to_dict('records'))
-        elif hasattr(obj, 'item') and callable(getattr(obj, 'item')):
-            return obj.item()
-        type_str = str(type(obj))
-        if 'Timestamp' in type_str or 'datetime' in type_str:
-            return obj.isoformat() if hasattr(obj, 'isoformat') else str(obj)
-        elif 'numpy.int64' in type_str:
-            return int(obj)
-        elif 'numpy.float64' in type_str:
-            return float(obj)
-        import math
-        if isinstance(obj, (float, int)) and (math.isnan(obj) or math.isinf(obj)):
-            return None
-        elif not isinstance(obj, (dict, list, str, bool, int, float)) and pd.isna(obj):
-            return None
-        return obj
+        One orjson encode/decode round trip in C instead of a recursive Python
+        walk: numpy scalars/arrays and datetimes are handled natively, NaN/inf
+        become None, and _json_default covers the pandas leftovers.
+        """
+        return orjson.loads(
+            orjson.dumps(obj, default=_json_default, option=JSON_OPTIONS)
+        )
 
     def _empty_prediction(self, coin: str, timeframe: str, error: str = None) -> Dict:
         """Return empty prediction on error"""
@@ -207,42 +339,12 @@ class PredictionEngine:
         }
     
     def _save_prediction(self, prediction: Dict):
-        """Save prediction to database"""
+        """Save prediction to database (NEUTRAL ones are batched)"""
         try:
-            db = SessionLocal()
-            
-            pred_record = Prediction(
-                coin=prediction['coin'],
-                timeframe=prediction['timeframe'],
-                current_price=prediction['current_price'],
-                
-                strategy_signal=prediction['strategy']['signal'],
-                strategy_confidence=prediction['strategy']['confidence'],
-                strategy_details=prediction['strategy']['details'],
-                
-                ml_signal=prediction['ml']['signal'],
-                ml_confidence=prediction['ml']['confidence'],
-                ml_details=prediction['ml']['details'],
-                
-                news_signal=prediction['news']['signal'],
-                news_confidence=prediction['news']['confidence'],
-                
-                final_signal=prediction['final']['signal'],
-                final_confidence=prediction['final']['confidence'],
-                target_price=prediction['final']['target_price'],
-                target_type=prediction['final']['target_type']
-            )
-            
-            db.add(pred_record)
-            db.commit()
-            logger.info("Prediction saved to database")
+            self.prediction_writer.save(prediction)
         
         except Exception as e:
             logger.error("Error saving prediction", error=str(e))
-            db.rollback()
-        finally:
-            db.close()
-
 
 # Usage example
 if __name__ == "__main__":
@@ -0,0 +1,177 @@
+"""
+Prediction Writer
+Buffers prediction history rows and bulk-inserts them through SQLAlchemy Core
+"""
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List
+from models import Prediction, engine
+import structlog
+
+logger = structlog.get_logger()
+
+# Flush once this many rows are buffered...
+PREDICTION_BATCH_SIZE = 50
+
+# ...or this many seconds after the first buffered row, whichever comes first
+PREDICTION_FLUSH_INTERVAL_SECONDS = 5.0
+
+# Strategy names / model name prefixes -> typed column prefix in predictions
+STRATEGY_COLUMNS = {
+    'RSI': 'rsi',
+    'EMA Crossover': 'ema',
+    'MACD': 'macd',
+    'Bollinger Bands': 'bollinger',
+    'Volume Spike': 'volume_spike',
+    'Support/Resistance': 'support_resistance'
+}
+MODEL_COLUMNS = {
+    'logistic_regression': 'lr',
+    'random_forest': 'rf',
+    'xgboost': 'xgb'
+}
+
+# Every row carries every typed column (NULL when absent) so a batch binds
+# as one executemany
+DETAIL_COLUMNS = tuple(
+    f"{prefix}_{field}"
+    for prefix in (*STRATEGY_COLUMNS.values(), *MODEL_COLUMNS.values())
+    for field in ('signal', 'confidence')
+)
+
+
+def _results(details) -> List[Dict]:
+    """Result dicts of a details list (other shapes carry no typed fields)"""
+    if not isinstance(details, list):
+        return []
+    return [result for result in details if isinstance(result, dict)]
+
+
+def detail_columns(prediction: Dict) -> Dict:
+    """Per-strategy and per-model signal/confidence columns of a prediction"""
+    row = dict.fromkeys(DETAIL_COLUMNS)
+    
+    for result in _results(prediction['strategy']['details']):
+        prefix = STRATEGY_COLUMNS.get(result.get('strategy'))
+        if prefix:
+            row[f"{prefix}_signal"] = result.get('signal')
+            row[f"{prefix}_confidence"] = result.get('confidence')
+    
+    for result in _results(prediction['ml']['details']):
+        # Model keys carry a _{coin}_{timeframe} suffix for specific models
+        model = result.get('model') or ''
+        prefix = next((p for name, p in MODEL_COLUMNS.items() if model.startswith(name)), None)
+        if prefix:
+            row[f"{prefix}_signal"] = result.get('signal')
+            row[f"{prefix}_confidence"] = result.get('confidence')
+    
+    return row
+
+
+def prediction_row(prediction: Dict) -> Dict:
+    """Flatten a prediction payload into a predictions table row"""
+    return {
+        'timestamp': datetime.utcnow(),
+        'coin': prediction['coin'],
+        'timeframe': prediction['timeframe'],
+        'current_price': prediction['current_price'],
+        
+        'strategy_signal': prediction['strategy']['signal'],
+        'strategy_confidence': prediction['strategy']['confidence'],
+        'strategy_details': prediction['strategy']['details'],
+        
+        'ml_signal': prediction['ml']['signal'],
+        'ml_confidence': prediction['ml']['confidence'],
+        'ml_details': prediction['ml']['details'],
+        
+        'news_signal': prediction['news']['signal'],
+        'news_confidence': prediction['news']['confidence'],
+        
+        'final_signal': prediction['final']['signal'],
+        'final_confidence': prediction['final']['confidence'],
+        'target_price': prediction['final']['target_price'],
+        'target_type': prediction['final']['target_type'],
+        'meets_threshold': prediction['final'].get('meets_threshold'),
+        
+        **detail_columns(prediction)
+    }
+
+
+class PredictionWriter:
+    """
+    Batches prediction inserts off the request path
+    
+    NEUTRAL predictions are only history, so they wait in a buffer that a
+    background thread drains every PREDICTION_FLUSH_INTERVAL_SECONDS (or as
+    soon as PREDICTION_BATCH_SIZE rows pile up) in one executemany INSERT.
+    Actionable BUY/SELL predictions are written immediately, together with
+    anything still buffered so rows keep their order.
+    """
+    
+    def __init__(
+        self,
+        batch_size: int = PREDICTION_BATCH_SIZE,
+        flush_interval: float = PREDICTION_FLUSH_INTERVAL_SECONDS
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher = None
+    
+    def save(self, prediction: Dict):
+        """Queue (NEUTRAL) or immediately persist (BUY/SELL) a prediction"""
+        self._buffer.append(prediction_row(prediction))
+        
+        if prediction['final']['signal'] != 'NEUTRAL' or len(self._buffer) >= self.batch_size:
+            self.flush()
+        else:
+            self._ensure_flusher()
+    
+    def flush(self) -> int:
+        """Write every buffered row in a single transaction"""
+        with self._lock:
+            rows: List[Dict] = []
+            while self._buffer:
+                rows.append(self._buffer.popleft())
+            
+            if not rows:
+                return 0
+            
+            try:
+                with engine.begin() as conn:
+                    conn.execute(Prediction.__table__.insert(), rows)
+                logger.info("Predictions saved to database", rows=len(rows))
+                return len(rows)
+            
+            except Exception as e:
+                logger.error("Error saving predictions", rows=len(rows), error=str(e))
+                return 0
+    
+    def close(self):
+        """Stop the flusher thread and write what is left (application shutdown)"""
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            self._wakeup.set()
+            flusher.join(timeout=self.flush_interval)
+        self.flush()
+    
+    def _ensure_flusher(self):
+        """Start the background flusher on the first buffered row"""
+        if self._flusher is not None:
+            return
+        
+        with self._lock:
+            if self._flusher is None:
+                self._wakeup.clear()
+                self._flusher = threading.Thread(
+                    target=self._run, name="prediction-writer", daemon=True
+                )
+                self._flusher.start()
+    
+    def _run(self):
+        """Flush the buffer periodically until close() is called"""
+        while not self._wakeup.wait(self.flush_interval):
+            self.flush()
@@ -4,10 +4,18 @@ Combines signals from strategies, ML, and news into final prediction
 """
 from typing import Dict
 from config import settings
+import logging_config
 import structlog
 
 logger = structlog.get_logger()
 
+# Signals as numerical scores (-1 to 1): BUY = 1, SELL = -1, NEUTRAL = 0
+SIGNAL_SCORES = {'BUY': 1, 'SELL': -1, 'NEUTRAL': 0}
+
+# |final_score| above this is a BUY/SELL; indexed by the sign of the score + 1
+SIGNAL_THRESHOLD = 0.15
+FINAL_SIGNALS = ('SELL', 'NEUTRAL', 'BUY')
+
 
 class ProbabilityCombiner:
     """Combines signals from multiple sources with weighted scoring"""
@@ -36,6 +44,13 @@ class ProbabilityCombiner:
         self.ml_weight /= total_weight
         self.news_weight /= total_weight
         
+        # Breakdown labels only depend on the weights
+        self._weight_labels = {
+            'strategy': f"{self.strategy_weight:.0%}",
+            'ml': f"{self.ml_weight:.0%}",
+            'news': f"{self.news_weight:.0%}"
+        }
+        
         logger.info(
             "ProbabilityCombiner initialized",
             strategy_weight=f"{self.strategy_weight:.2%}",
@@ -71,12 +86,9 @@ class ProbabilityCombiner:
         news_confidence = news_result.get('confidence', 0)
         
         # Convert signals to numerical scores (-1 to 1)
-        # BUY = 1, SELL = -1, NEUTRAL = 0
-        signal_map = {'BUY': 1, 'SELL': -1, 'NEUTRAL': 0}
-        
-        strategy_score = signal_map.get(strategy_signal, 0)
-        ml_score = signal_map.get(ml_signal, 0)
-        news_score = signal_map.get(news_signal, 0)
+        strategy_score = SIGNAL_SCORES.get(strategy_signal, 0)
+        ml_score = SIGNAL_SCORES.get(ml_signal, 0)
+        news_score = SIGNAL_SCORES.get(news_signal, 0)
         
         # Weight the scores by confidence
         strategy_weighted = strategy_score * (strategy_confidence / 100)
@@ -97,25 +109,18 @@ class ProbabilityCombiner:
             news_confidence * self.news_weight
         )
         
-        # Determine final signal
-        if final_score > 0.15:  # Threshold for BUY
-            final_signal = 'BUY'
-        elif final_score < -0.15:  # Threshold for SELL
-            final_signal = 'SELL'
-        else:
-            final_signal = 'NEUTRAL'
-        
-        # Boost confidence if all sources agree
-        all_buy = (strategy_signal == 'BUY' and ml_signal == 'BUY' and news_signal == 'BUY')
-        all_sell = (strategy_signal == 'SELL' and ml_signal == 'SELL' and news_signal == 'SELL')
+        # Determine final signal (BUY above the threshold, SELL below -threshold)
+        final_signal = FINAL_SIGNALS[
+            1 + (final_score > SIGNAL_THRESHOLD) - (final_score < -SIGNAL_THRESHOLD)
+        ]
         
-        if all_buy or all_sell:
+        # Boost confidence if all sources agree (all BUY or all SELL)
+        if strategy_score != 0 and strategy_score == ml_score == news_score:
             final_confidence = min(100, final_confidence + 15)  # +15% for full agreement
             logger.info("All sources agree", signal=final_signal)
         
-        # Reduce confidence if sources strongly disagree
-        if (strategy_signal == 'BUY' and ml_signal == 'SELL') or \
-           (strategy_signal == 'SELL' and ml_signal == 'BUY'):
+        # Reduce confidence if sources strongly disagree (BUY against SELL)
+        if strategy_score * ml_score < 0:
             final_confidence = max(0, final_confidence - 20)  # -20% for disagreement
             logger.info("Strategy and ML disagree")
         
@@ -127,27 +132,28 @@ class ProbabilityCombiner:
                 'strategy': {
                     'signal': strategy_signal,
                     'confidence': strategy_confidence,
-                    'weight': f"{self.strategy_weight:.0%}"
+                    'weight': self._weight_labels['strategy']
                 },
                 'ml': {
                     'signal': ml_signal,
                     'confidence': ml_confidence,
-                    'weight': f"{self.ml_weight:.0%}"
+                    'weight': self._weight_labels['ml']
                 },
                 'news': {
                     'signal': news_signal,
                     'confidence': news_confidence,
-                    'weight': f"{self.news_weight:.0%}"
+                    'weight': self._weight_labels['news']
                 }
             }
         }
         
-        logger.info(
-            "Combined prediction",
-            signal=final_signal,
-            confidence=final_confidence,
-            score=final_score
-        )
+        if logging_config.DEBUG_ENABLED:
+            logger.debug(
+                "Combined prediction",
+                signal=final_signal,
+                confidence=final_confidence,
+                score=final_score
+            )
         
         return result
 
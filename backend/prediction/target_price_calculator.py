@@ -2,9 +2,10 @@
 Target Price Calculator
 Calculates predicted HIGH/LOW price based on volatility and confidence
 """
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
 from typing import Dict, Optional
+from data._indicators_njit import atr_last_njit
 import structlog
 
 logger = structlog.get_logger()
@@ -62,10 +63,15 @@ class TargetPriceCalculator:
                     'reason': 'Signal is NEUTRAL'
                 }
             
-            # Calculate ATR for volatility
-            atr = ta.atr(df['high'], df['low'], df['close'], length=self.atr_period)
-            current_atr = atr.iloc[-1]
-            current_price = df['close'].iloc[-1]
+            # Calculate ATR for volatility (only the latest value is needed)
+            close = np.ascontiguousarray(df['close'].to_numpy(dtype=np.float64))
+            current_atr = atr_last_njit(
+                np.ascontiguousarray(df['high'].to_numpy(dtype=np.float64)),
+                np.ascontiguousarray(df['low'].to_numpy(dtype=np.float64)),
+                close,
+                self.atr_period
+            )
+            current_price = close[-1]
             
             # Confidence factor (higher confidence = larger target)
             # Scale from 0.5x to 2.0x ATR based on confidence
@@ -8,6 +8,7 @@ from .bollinger_bands import BollingerBandsStrategy
 from .volume_spike import VolumeSpikeStrategy
 from .support_resistance import SupportResistanceStrategy
 from .strategy_manager import StrategyManager
+from .ohlcv import OHLCV
 
 __all__ = [
     'RSIStrategy',
@@ -16,5 +17,6 @@ __all__ = [
     'BollingerBandsStrategy',
     'VolumeSpikeStrategy',
     'SupportResistanceStrategy',
-    'StrategyManager'
+    'StrategyManager',
+    'OHLCV'
 ]
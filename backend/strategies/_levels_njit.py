@@ -0,0 +1,69 @@
+"""
+Support/Resistance Level Kernels
+Numba-compiled pivot detection and level clustering over raw float64 arrays
+
+The kernels reproduce SupportResistanceStrategy's former Python helpers: a
+pivot is strictly above (below) its two neighbours on each side, sorted
+levels join the previous cluster while their relative gap is within the
+threshold (NaN gaps split), and each cluster is averaged with a running
+sum, so levels match the np.mean results to rounding. Division follows numpy
+semantics (error_model='numpy'): zero prices give inf/nan gaps, not errors.
+"""
+import numpy as np
+from _njit import njit
+
+@njit(cache=True, nogil=True, error_model='numpy')
+def _pivots(values, above):
+    """Values strictly above (or below) their two neighbours on each side"""
+    n = values.shape[0]
+    out = np.empty(max(n - 4, 0))
+    count = 0
+
+    for i in range(2, n - 2):
+        x = values[i]
+        if above:
+            is_pivot = (x > values[i - 1] and x > values[i - 2] and
+                        x > values[i + 1] and x > values[i + 2])
+        else:
+            is_pivot = (x < values[i - 1] and x < values[i - 2] and
+                        x < values[i + 1] and x < values[i + 2])
+        if is_pivot:
+            out[count] = x
+            count += 1
+
+    return out[:count]
+
+
+@njit(cache=True, nogil=True, error_model='numpy')
+def _cluster(levels, threshold):
+    """Means of runs of sorted levels whose relative gaps are within threshold"""
+    n = levels.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+
+    levels = np.sort(levels)
+    count = 0
+    start = 0
+    total = levels[0]
+    for i in range(1, n):
+        prev = levels[i - 1]
+        if not ((levels[i] - prev) / prev <= threshold):
+            out[count] = total / (i - start)
+            count += 1
+            start = i
+            total = 0.0
+        total += levels[i]
+
+    out[count] = total / (n - start)
+    return out[:count + 1]
+
+
+@njit(cache=True, nogil=True, error_model='numpy')
+def support_resistance_levels_njit(high, low, threshold):
+    """
+    Clustered support and resistance levels of a lookback window
+
+    Returns (support_levels, resistance_levels), each sorted ascending.
+    """
+    return _cluster(_pivots(low, False), threshold), _cluster(_pivots(high, True), threshold)
@@ -3,9 +3,11 @@ Bollinger Bands Strategy
 Price position relative to Bollinger Bands
 """
 import pandas as pd
-import pandas_ta as ta
-from typing import Dict
+from typing import Dict, Union
 from config import settings
+from data._indicators_njit import bbands_last_njit
+from strategies.ohlcv import OHLCV, ohlcv_arrays
+import logging_config
 import structlog
 
 logger = structlog.get_logger()
@@ -27,28 +29,24 @@ class BollingerBandsStrategy:
         self.name = "Bollinger Bands"
         logger.info("Bollinger Bands Strategy initialized", period=self.period, std=self.std)
     
-    def calculate(self, df: pd.DataFrame) -> Dict:
+    def calculate(self, df: Union[pd.DataFrame, OHLCV]) -> Dict:
         """
         Calculate Bollinger Bands signal
         
         Args:
-            df: DataFrame with OHLCV data
+            df: DataFrame with OHLCV data (or OHLCV arrays shared by the manager)
             
         Returns:
             Dictionary with signal and confidence
         """
         try:
-            # Calculate Bollinger Bands
-            bbands = ta.bbands(df['close'], length=self.period, std=self.std)
+            # Calculate Bollinger Bands (only the latest window is needed)
+            close = ohlcv_arrays(df).close
+            current_lower, current_middle, current_upper = bbands_last_njit(
+                close, self.period, float(self.std)
+            )
             
-            upper = bbands[f'BBU_{self.period}_{self.std}.0']
-            middle = bbands[f'BBM_{self.period}_{self.std}.0']
-            lower = bbands[f'BBL_{self.period}_{self.std}.0']
-            
-            current_price = df['close'].iloc[-1]
-            current_upper = upper.iloc[-1]
-            current_middle = middle.iloc[-1]
-            current_lower = lower.iloc[-1]
+            current_price = close[-1]
             
             # Band width (for squeeze detection)
             band_width = ((current_upper - current_lower) / current_middle) * 100
@@ -92,7 +90,8 @@ class BollingerBandsStrategy:
                 'band_width': round(band_width, 2)
             }
             
-            logger.debug("Bollinger Bands calculated", **result)
+            if logging_config.DEBUG_ENABLED:
+                logger.debug("Bollinger Bands calculated", **result)
             return result
         
         except Exception as e:
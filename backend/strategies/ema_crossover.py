@@ -3,9 +3,11 @@ EMA Crossover Strategy
 Fast EMA vs Slow EMA crossover strategy
 """
 import pandas as pd
-import pandas_ta as ta
-from typing import Dict
+from typing import Dict, Union
 from config import settings
+from data._indicators_njit import ema_pair_last_two_njit
+from strategies.ohlcv import OHLCV, ohlcv_arrays
+import logging_config
 import structlog
 
 logger = structlog.get_logger()
@@ -27,27 +29,22 @@ class EMACrossoverStrategy:
         self.name = "EMA Crossover"
         logger.info("EMA Crossover Strategy initialized", fast=self.fast, slow=self.slow)
     
-    def calculate(self, df: pd.DataFrame) -> Dict:
+    def calculate(self, df: Union[pd.DataFrame, OHLCV]) -> Dict:
         """
         Calculate EMA crossover signal
         
         Args:
-            df: DataFrame with OHLCV data
+            df: DataFrame with OHLCV data (or OHLCV arrays shared by the manager)
             
         Returns:
             Dictionary with signal and confidence
         """
         try:
-            # Calculate EMAs
-            ema_fast = ta.ema(df['close'], length=self.fast)
-            ema_slow = ta.ema(df['close'], length=self.slow)
-            
-            current_fast = ema_fast.iloc[-1]
-            current_slow = ema_slow.iloc[-1]
-            
-            # Previous values for crossover detection
-            prev_fast = ema_fast.iloc[-2]
-            prev_slow = ema_slow.iloc[-2]
+            # Calculate EMAs, current and previous values for crossover detection
+            close = ohlcv_arrays(df).close
+            prev_fast, current_fast, prev_slow, current_slow = ema_pair_last_two_njit(
+                close, self.fast, self.slow
+            )
             
             # Calculate crossover strength (% difference)
             diff_percent = ((current_fast - current_slow) / current_slow) * 100
@@ -78,7 +75,8 @@ class EMACrossoverStrategy:
                 'death_cross': death_cross
             }
             
-            logger.debug("EMA Crossover calculated", **result)
+            if logging_config.DEBUG_ENABLED:
+                logger.debug("EMA Crossover calculated", **result)
             return result
         
         except Exception as e:
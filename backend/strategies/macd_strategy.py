@@ -3,9 +3,11 @@ MACD Strategy
 Moving Average Convergence Divergence strategy
 """
 import pandas as pd
-import pandas_ta as ta
-from typing import Dict
+from typing import Dict, Union
 from config import settings
+from data._indicators_njit import macd_last_two_njit
+from strategies.ohlcv import OHLCV, ohlcv_arrays
+import logging_config
 import structlog
 
 logger = structlog.get_logger()
@@ -29,36 +31,22 @@ class MACDStrategy:
         self.name = "MACD"
         logger.info("MACD Strategy initialized", fast=self.fast, slow=self.slow, signal=self.signal_period)
     
-    def calculate(self, df: pd.DataFrame) -> Dict:
+    def calculate(self, df: Union[pd.DataFrame, OHLCV]) -> Dict:
         """
         Calculate MACD signal
         
         Args:
-            df: DataFrame with OHLCV data
+            df: DataFrame with OHLCV data (or OHLCV arrays shared by the manager)
             
         Returns:
             Dictionary with signal and confidence
         """
         try:
-            # Calculate MACD
-            macd_result = ta.macd(
-                df['close'],
-                fast=self.fast,
-                slow=self.slow,
-                signal=self.signal_period
-            )
-            
-            macd_line = macd_result[f'MACD_{self.fast}_{self.slow}_{self.signal_period}']
-            signal_line = macd_result[f'MACDs_{self.fast}_{self.slow}_{self.signal_period}']
-            histogram = macd_result[f'MACDh_{self.fast}_{self.slow}_{self.signal_period}']
-            
-            current_macd = macd_line.iloc[-1]
-            current_signal = signal_line.iloc[-1]
-            current_hist = histogram.iloc[-1]
-            
-            # Previous values for crossover
-            prev_macd = macd_line.iloc[-2]
-            prev_signal = signal_line.iloc[-2]
+            # Calculate MACD, with the previous values for crossover
+            close = ohlcv_arrays(df).close
+            (
+                prev_macd, prev_signal, current_macd, current_signal, current_hist
+            ) = macd_last_two_njit(close, self.fast, self.slow, self.signal_period)
             
             # Detect crossover
             bullish_cross = prev_macd <= prev_signal and current_macd > current_signal
@@ -89,7 +77,8 @@ class MACDStrategy:
                 'bearish_cross': bearish_cross
             }
             
-            logger.debug("MACD calculated", **result)
+            if logging_config.DEBUG_ENABLED:
+                logger.debug("MACD calculated", **result)
             return result
         
         except Exception as e:
@@ -0,0 +1,63 @@
+"""
+OHLCV Arrays
+Column arrays of one candle window, converted once and shared by every strategy
+"""
+from typing import Dict, Union
+import numpy as np
+import pandas as pd
+
+
+class OHLCV:
+    """
+    Contiguous float64 close/high/low/volume arrays of a candle window
+    
+    Columns are converted from the DataFrame on first access and kept, so
+    the StrategyManager pays for each conversion once per window instead of
+    once per strategy.
+    """
+    
+    __slots__ = ('_df', '_columns')
+    
+    def __init__(self, df: pd.DataFrame):
+        """
+        Initialize OHLCV arrays
+        
+        Args:
+            df: DataFrame with OHLCV data
+        """
+        self._df = df
+        self._columns: Dict[str, np.ndarray] = {}
+    
+    def __len__(self) -> int:
+        return len(self._df)
+    
+    def _column(self, name: str) -> np.ndarray:
+        """float64 array of one column, converted on first use"""
+        values = self._columns.get(name)
+        if values is None:
+            values = np.ascontiguousarray(self._df[name].to_numpy(dtype=np.float64))
+            self._columns[name] = values
+        return values
+    
+    @property
+    def close(self) -> np.ndarray:
+        return self._column('close')
+    
+    @property
+    def high(self) -> np.ndarray:
+        return self._column('high')
+    
+    @property
+    def low(self) -> np.ndarray:
+        return self._column('low')
+    
+    @property
+    def volume(self) -> np.ndarray:
+        return self._column('volume')
+
+
+def ohlcv_arrays(data: Union[pd.DataFrame, OHLCV]) -> OHLCV:
+    """Shared arrays for a strategy input (DataFrame or already-built OHLCV)"""
+    if isinstance(data, OHLCV):
+        return data
+    return OHLCV(data)
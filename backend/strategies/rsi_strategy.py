@@ -3,9 +3,11 @@ RSI Strategy
 Relative Strength Index trading strategy
 """
 import pandas as pd
-import pandas_ta as ta
-from typing import Dict
+from typing import Dict, Union
 from config import settings
+from data._indicators_njit import rsi_last_njit
+from strategies.ohlcv import OHLCV, ohlcv_arrays
+import logging_config
 import structlog
 
 logger = structlog.get_logger()
@@ -34,20 +36,20 @@ class RSIStrategy:
         self.name = "RSI"
         logger.info("RSI Strategy initialized", period=self.period)
     
-    def calculate(self, df: pd.DataFrame) -> Dict:
+    def calculate(self, df: Union[pd.DataFrame, OHLCV]) -> Dict:
         """
         Calculate RSI signal
         
         Args:
-            df: DataFrame with OHLCV data
+            df: DataFrame with OHLCV data (or OHLCV arrays shared by the manager)
             
         Returns:
             Dictionary with signal and confidence
         """
         try:
-            # Calculate RSI
-            rsi = ta.rsi(df['close'], length=self.period)
-            current_rsi = rsi.iloc[-1]
+            # Calculate RSI (only the latest value is needed)
+            close = ohlcv_arrays(df).close
+            current_rsi = rsi_last_njit(close, self.period)
             
             # Determine signal
             if current_rsi <= self.oversold:
@@ -73,7 +75,8 @@ class RSIStrategy:
                 'oversold': self.oversold
             }
             
-            logger.debug("RSI calculated", **result)
+            if logging_config.DEBUG_ENABLED:
+                logger.debug("RSI calculated", **result)
             return result
         
         except Exception as e:
@@ -10,6 +10,7 @@ from strategies.macd_strategy import MACDStrategy
 from strategies.bollinger_bands import BollingerBandsStrategy
 from strategies.volume_spike import VolumeSpikeStrategy
 from strategies.support_resistance import SupportResistanceStrategy
+from strategies.ohlcv import OHLCV
 import structlog
 
 logger = structlog.get_logger()
@@ -55,11 +56,14 @@ class StrategyManager:
         """
         results = []
         
+        # Column arrays are converted once and shared by every strategy
+        bars = OHLCV(df)
+        
         # Calculate each enabled strategy
         for name, strategy in self.strategies.items():
             if self.enabled_strategies.get(name, True):
                 try:
-                    result = strategy.calculate(df)
+                    result = strategy.calculate(bars)
                     results.append(result)
                 except Exception as e:
                     logger.error(f"Error in strategy {name}", error=str(e))
@@ -96,13 +100,20 @@ class StrategyManager:
                 'neutral_count': 0
             }
         
-        # Count signals
-        buy_count = sum(1 for r in results if r['signal'] == 'BUY')
-        sell_count = sum(1 for r in results if r['signal'] == 'SELL')
-        neutral_count = sum(1 for r in results if r['signal'] == 'NEUTRAL')
+        # Count signals and total confidence in one pass over the results
+        counts = {'BUY': 0, 'SELL': 0, 'NEUTRAL': 0}
+        total_confidence = 0
+        for r in results:
+            signal = r['signal']
+            if signal in counts:
+                counts[signal] += 1
+            total_confidence += r['confidence']
+        
+        buy_count = counts['BUY']
+        sell_count = counts['SELL']
+        neutral_count = counts['NEUTRAL']
         
         # Weighted average confidence
-        total_confidence = sum(r['confidence'] for r in results)
         avg_confidence = total_confidence / len(results) if results else 0
         
         # Determine overall signal
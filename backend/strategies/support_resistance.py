@@ -2,9 +2,12 @@
 Support & Resistance Strategy
 Dynamic support and resistance level detection
 """
-import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+import pandas as pd
+from typing import Dict, Union
+from strategies.ohlcv import OHLCV, ohlcv_arrays
+from strategies._levels_njit import support_resistance_levels_njit
+import logging_config
 import structlog
 
 logger = structlog.get_logger()
@@ -26,102 +29,43 @@ class SupportResistanceStrategy:
         self.name = "Support/Resistance"
         logger.info("S/R Strategy initialized", lookback=self.lookback)
     
-    def _find_pivots(self, df: pd.DataFrame) -> Tuple[List[float], List[float]]:
-        """
-        Find pivot highs and lows
-        
-        Returns:
-            Tuple of (support_levels, resistance_levels)
-        """
-        highs = []
-        lows = []
-        
-        # Look for local highs and lows
-        for i in range(2, len(df) - 2):
-            # Pivot high (resistance)
-            if (df['high'].iloc[i] > df['high'].iloc[i-1] and 
-                df['high'].iloc[i] > df['high'].iloc[i-2] and
-                df['high'].iloc[i] > df['high'].iloc[i+1] and 
-                df['high'].iloc[i] > df['high'].iloc[i+2]):
-                highs.append(df['high'].iloc[i])
-            
-            # Pivot low (support)
-            if (df['low'].iloc[i] < df['low'].iloc[i-1] and 
-                df['low'].iloc[i] < df['low'].iloc[i-2] and
-                df['low'].iloc[i] < df['low'].iloc[i+1] and 
-                df['low'].iloc[i] < df['low'].iloc[i+2]):
-                lows.append(df['low'].iloc[i])
-        
-        return lows, highs
-    
-    def _cluster_levels(self, levels: List[float]) -> List[float]:
-        """
-        Cluster nearby price levels
-        
-        Args:
-            levels: List of price levels
-            
-        Returns:
-            List of clustered levels
-        """
-        if not levels:
-            return []
-        
-        levels = sorted(levels)
-        clustered = []
-        current_cluster = [levels[0]]
-        
-        for level in levels[1:]:
-            # If within threshold, add to current cluster
-            if (level - current_cluster[-1]) / current_cluster[-1] <= self.threshold:
-                current_cluster.append(level)
-            else:
-                # Save cluster average and start new cluster
-                clustered.append(np.mean(current_cluster))
-                current_cluster = [level]
-        
-        # Add last cluster
-        if current_cluster:
-            clustered.append(np.mean(current_cluster))
-        
-        return clustered
-    
-    def calculate(self, df: pd.DataFrame) -> Dict:
+    def calculate(self, df: Union[pd.DataFrame, OHLCV]) -> Dict:
         """
         Calculate S/R signal
         
         Args:
-            df: DataFrame with OHLCV data
+            df: DataFrame with OHLCV data (or OHLCV arrays shared by the manager)
             
         Returns:
             Dictionary with signal and confidence
         """
         try:
             # Use last N candles
-            df_lookback = df.tail(self.lookback).copy().reset_index(drop=True)
+            bars = ohlcv_arrays(df)
+            start = max(len(bars) - self.lookback, 0)
+            high = bars.high[start:]
+            low = bars.low[start:]
             
-            # Find pivots
-            support_levels, resistance_levels = self._find_pivots(df_lookback)
+            # Find pivots and cluster them into levels
+            support_levels, resistance_levels = support_resistance_levels_njit(
+                high, low, float(self.threshold)
+            )
             
-            # Cluster levels
-            support_levels = self._cluster_levels(support_levels)
-            resistance_levels = self._cluster_levels(resistance_levels)
+            current_price = bars.close[-1]
             
-            current_price = df['close'].iloc[-1]
-            
-            # Find nearest support and resistance
+            # Find nearest support and resistance: the levels are sorted, so these
+            # are the last support below and the first resistance above the price
             nearest_support = None
             nearest_resistance = None
             
-            for level in support_levels:
-                if level < current_price:
-                    if nearest_support is None or level > nearest_support:
-                        nearest_support = level
-            
-            for level in resistance_levels:
-                if level > current_price:
-                    if nearest_resistance is None or level < nearest_resistance:
-                        nearest_resistance = level
+            if not np.isnan(current_price):
+                below = support_levels.searchsorted(current_price, 'left')
+                if below > 0:
+                    nearest_support = support_levels[below - 1]
+                
+                above = resistance_levels.searchsorted(current_price, 'right')
+                if above < resistance_levels.shape[0]:
+                    nearest_resistance = resistance_levels[above]
             
             # Calculate distances
             support_distance = None
@@ -172,7 +116,8 @@ class SupportResistanceStrategy:
                 'num_resistance_levels': len(resistance_levels)
             }
             
-            logger.debug("S/R calculated", **result)
+            if logging_config.DEBUG_ENABLED:
+                logger.debug("S/R calculated", **result)
             return result
         
         except Exception as e:
@@ -3,9 +3,11 @@ Volume Spike Strategy
 Detects unusual volume spikes combined with price direction
 """
 import pandas as pd
-import pandas_ta as ta
-from typing import Dict
+from typing import Dict, Union
 from config import settings
+from data._indicators_njit import sma_last_njit
+from strategies.ohlcv import OHLCV, ohlcv_arrays
+import logging_config
 import structlog
 
 logger = structlog.get_logger()
@@ -27,26 +29,28 @@ class VolumeSpikeStrategy:
         self.name = "Volume Spike"
         logger.info("Volume Spike Strategy initialized", multiplier=self.multiplier)
     
-    def calculate(self, df: pd.DataFrame) -> Dict:
+    def calculate(self, df: Union[pd.DataFrame, OHLCV]) -> Dict:
         """
         Calculate volume spike signal
         
         Args:
-            df: DataFrame with OHLCV data
+            df: DataFrame with OHLCV data (or OHLCV arrays shared by the manager)
             
         Returns:
             Dictionary with signal and confidence
         """
         try:
-            # Calculate volume SMA
-            volume_sma = ta.sma(df['volume'], length=self.period)
+            bars = ohlcv_arrays(df)
+            volume = bars.volume
+            close = bars.close
             
-            current_volume = df['volume'].iloc[-1]
-            avg_volume = volume_sma.iloc[-1]
+            # Calculate volume SMA (only the latest value is needed)
+            current_volume = volume[-1]
+            avg_volume = sma_last_njit(volume, self.period)
             
             # Price change
-            current_close = df['close'].iloc[-1]
-            prev_close = df['close'].iloc[-2]
+            current_close = close[-1]
+            prev_close = close[-2]
             price_change_pct = ((current_close - prev_close) / prev_close) * 100
             
             # Volume spike ratio
@@ -89,7 +93,8 @@ class VolumeSpikeStrategy:
                 'is_spike': is_spike
             }
             
-            logger.debug("Volume Spike calculated", **result)
+            if logging_config.DEBUG_ENABLED:
+                logger.debug("Volume Spike calculated", **result)
             return result
         
         except Exception as e:
@@ -6,11 +6,14 @@ import json
 
 BASE_URL = "http://127.0.0.1:8000"
 
+# One keep-alive connection for every endpoint checked
+SESSION = requests.Session()
+
 def test_endpoint(endpoint):
     url = f"{BASE_URL}{endpoint}"
     print(f"Testing {url}...")
     try:
-        response = requests.get(url, timeout=10)
+        response = SESSION.get(url, timeout=10)
         print(f"Status Code: {response.status_code}")
         if response.status_code == 200:
             data = response.json()
@@ -0,0 +1,13 @@
+"""
+Test Configuration
+Puts the backend package root on sys.path and points the database at a temp file
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'moltbot_test.db')}"
+)
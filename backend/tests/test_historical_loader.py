@@ -0,0 +1,45 @@
+"""
+Historical Loader Tests
+Indicator computation on fresh and DB-shaped OHLCV frames
+"""
+import numpy as np
+import pandas as pd
+from data.historical_loader import HistoricalDataLoader
+
+# Indicator columns historical_data rows come back with (NULL until computed)
+DB_INDICATOR_COLUMNS = [
+    'rsi', 'ema_fast', 'ema_slow', 'macd', 'macd_signal',
+    'bollinger_upper', 'bollinger_lower', 'atr'
+]
+
+
+def _ohlcv(rows: int = 100) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(rows).cumsum()
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=rows, freq='h'),
+        'open': close,
+        'high': close + 1.0,
+        'low': close - 1.0,
+        'close': close,
+        'volume': 10.0 + rng.random(rows)
+    })
+
+
+def _loader() -> HistoricalDataLoader:
+    # The market collector is not needed to compute indicators
+    return HistoricalDataLoader.__new__(HistoricalDataLoader)
+
+
+def test_indicators_on_db_shaped_frame_replace_null_columns():
+    fresh = _loader()._compute_indicators(_ohlcv())[0]
+    
+    db_frame = _ohlcv()
+    for column in DB_INDICATOR_COLUMNS:
+        db_frame[column] = np.nan
+    result, ok = _loader()._compute_indicators(db_frame)
+    
+    assert ok
+    assert not result.columns.duplicated().any()
+    assert len(result) == len(fresh) > 0
+    pd.testing.assert_frame_equal(result[fresh.columns], fresh)
@@ -0,0 +1,66 @@
+"""
+Support/Resistance Kernel Tests
+Numba levels against the strategy's former Python pivot and cluster helpers
+"""
+import numpy as np
+import pytest
+from strategies._levels_njit import support_resistance_levels_njit
+
+
+def _find_pivots(high, low):
+    """Former SupportResistanceStrategy._find_pivots over plain arrays"""
+    highs = []
+    lows = []
+    
+    for i in range(2, len(high) - 2):
+        if (high[i] > high[i-1] and high[i] > high[i-2] and
+                high[i] > high[i+1] and high[i] > high[i+2]):
+            highs.append(high[i])
+        
+        if (low[i] < low[i-1] and low[i] < low[i-2] and
+                low[i] < low[i+1] and low[i] < low[i+2]):
+            lows.append(low[i])
+    
+    return lows, highs
+
+
+def _cluster_levels(levels, threshold):
+    """Former SupportResistanceStrategy._cluster_levels"""
+    if not levels:
+        return []
+    
+    levels = sorted(levels)
+    clustered = []
+    current_cluster = [levels[0]]
+    
+    for level in levels[1:]:
+        if (level - current_cluster[-1]) / current_cluster[-1] <= threshold:
+            current_cluster.append(level)
+        else:
+            clustered.append(np.mean(current_cluster))
+            current_cluster = [level]
+    
+    clustered.append(np.mean(current_cluster))
+    return clustered
+
+
+def _window(rows, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(rows).cumsum()
+    high = close + rng.random(rows)
+    low = close - rng.random(rows)
+    return high, low
+
+
+@pytest.mark.parametrize('rows', [0, 4, 5, 50, 500])
+@pytest.mark.parametrize('threshold', [0.0, 0.02, 0.5])
+def test_levels_match_python_helpers(rows, threshold):
+    for seed in range(5):
+        high, low = _window(rows, seed)
+        expected_lows, expected_highs = _find_pivots(high, low)
+        
+        support, resistance = support_resistance_levels_njit(high, low, threshold)
+        
+        np.testing.assert_allclose(support, _cluster_levels(expected_lows, threshold), rtol=1e-12)
+        np.testing.assert_allclose(resistance, _cluster_levels(expected_highs, threshold), rtol=1e-12)
+